@@ -0,0 +1,135 @@
+"""
+almanac.py — Day-by-day panchang for a year at a place, streamed.
+
+iter_almanac yields one record per day: sunrise and sunset, weekday,
+thithi, nakshatra, yogam and karanam with their end times (panchang.py),
+the Tamil date, the Saka date and the Kali year.  Records are made lazily,
+one day at a time, and each day carries over the elements running at its
+sunrise from the day before, so only the later ends are searched for.
+
+write_jsonl and write_csv stream the records to a file.
+
+  python almanac.py --year 2024 --lat 13.08 --lat-dirn N \\
+      --long 80.27 --long-dirn E --tz-hours 5 --tz-minutes 30 --format csv
+"""
+
+import argparse
+import csv
+import datetime as dt
+import json
+import sys
+
+import birth_input as bi
+import functions as fn
+import panchang as pc
+from constants import SAKA_MONTH, TAMIL_MONTH, TAMIL_YEAR, WDAYS
+
+ELEMENT_NAMES = ("thithi", "nakshatra", "yogam", "karanam")
+
+CSV_FIELDS = [
+    "date", "weekday", "sunrise", "sunset", "paksham",
+    "thithi", "nakshatra", "yogam", "karanam",
+    "tamil_day", "tamil_month", "tamil_year",
+    "saka_day", "saka_month", "saka_year", "kali_year",
+]
+
+
+def _fmt_time(when):
+    return when.isoformat(sep=" ", timespec="seconds")
+
+
+def get_day_record(day_panchang, input_params):
+    """
+    Return the almanac record (dict) of a day, given its panchang and the
+    input params with in_datetime at noon of the day
+    """
+    in_datetime = input_params["in_datetime"]
+    tamil_day, tamil_month, tamil_year = fn.calc_tamil_date(input_params)
+    saka_day, saka_month, saka_year = fn.calc_saka_date(in_datetime)
+
+    record = dict()
+    record["date"] = in_datetime.date().isoformat()
+    record["weekday"] = WDAYS[(in_datetime.weekday() + 1) % 7]
+    record["sunrise"] = _fmt_time(day_panchang["sunrise"])
+    record["sunset"] = _fmt_time(day_panchang["sunset"])
+    record["paksham"] = day_panchang["paksham"]
+    for element in ELEMENT_NAMES:
+        record[element] = [
+            {
+                "name": entry["name"],
+                "end": _fmt_time(entry["end"]),
+            }
+            for entry in day_panchang[element]
+        ]
+    record["tamil_day"] = tamil_day
+    record["tamil_month"] = TAMIL_MONTH[tamil_month]
+    record["tamil_year"] = TAMIL_YEAR[tamil_year % 60]
+    record["saka_day"] = saka_day
+    record["saka_month"] = SAKA_MONTH[saka_month]
+    record["saka_year"] = saka_year
+    record["kali_year"] = fn.get_kali_year(saka_year)
+    return record
+
+
+def iter_almanac(input_params, year):
+    """
+    Yield the almanac record (see get_day_record) of each day of the year at
+    the place of input_params (its in_datetime is not read)
+    """
+    day = dt.date(year, 1, 1)
+    previous = None
+    while day.year == year:
+        day_params = dict(input_params)
+        day_params["in_datetime"] = dt.datetime(day.year, day.month, day.day, 12)
+        day_panchang = pc.get_panchang(day_params, previous=previous)
+        yield get_day_record(day_panchang, day_params)
+        previous = day_panchang
+        day += dt.timedelta(days=1)
+
+
+def write_jsonl(records, out):
+    """
+    Write the records to a text file, one JSON object per line
+    """
+    for record in records:
+        out.write(json.dumps(record, ensure_ascii=False))
+        out.write("\n")
+
+
+def write_csv(records, out):
+    """
+    Write the records to a text file as CSV.  Each element column lists the
+    elements of the day with their ends, e.g. "Dasami until 2024-01-20 19:41:05"
+    """
+    writer = csv.DictWriter(out, fieldnames=CSV_FIELDS)
+    writer.writeheader()
+    for record in records:
+        row = dict(record)
+        for element in ELEMENT_NAMES:
+            row[element] = "; ".join(
+                f"{entry['name']} until {entry['end']}" for entry in record[element]
+            )
+        writer.writerow(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Daily panchang for a year")
+    parser.add_argument("--year", type=int, required=True)
+    bi.add_place_arguments(parser)
+    parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+    parser.add_argument("--output", default="-", help="file to write (- for stdout)")
+    args = parser.parse_args()
+
+    input_params = bi.get_birth_input(parser, args, dt.datetime(args.year, 1, 1))
+
+    records = iter_almanac(input_params, args.year)
+    write = write_csv if args.format == "csv" else write_jsonl
+    if args.output == "-":
+        write(records, sys.stdout)
+    else:
+        with open(args.output, "w", encoding="utf-8", newline="") as out:
+            write(records, out)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,6 @@ Run with:
 
 import datetime as dt
 import os
-import re
 import sys
 
 import streamlit as st
@@ -18,23 +17,10 @@ import streamlit.components.v1 as components
 
 # ── Computation modules ──────────────────────────────────────────────────────
 sys.path.insert(0, os.path.dirname(__file__))
-import constants as cn  # noqa: E402
-import functions as fn  # noqa: E402
-import shadbala as sb  # noqa: E402
-from constants import (  # noqa: E402
-    DASA_LORDS,
-    DASA_YEARS,
-    GRAHA_NAMES,
-    KARANAM,
-    NAKSHATRA,
-    RASI_NAMES,
-    SAKA_MONTH,
-    TAMIL_MONTH,
-    TAMIL_YEAR,
-    THITHI,
-    WDAYS,
-    YOGAM,
-)
+import birth_input as bi  # noqa: E402
+import chart  # noqa: E402
+import sensitivity  # noqa: E402
+import velocity  # noqa: E402
 from html_report import generate_single_page_html  # noqa: E402
 from pdf_report import generate_pdf  # noqa: E402
 from themes import THEME_NAMES, build_streamlit_css, get_theme  # noqa: E402
@@ -113,53 +99,6 @@ TIMEZONES = {
 # ── Helpers ──────────────────────────────────────────────────────────────────
 
 
-def _nakshatra_pada(degs):
-    nak = min(int(degs / (360.0 / 27)), 26)
-    rem = degs - nak * (360.0 / 27)
-    pada = int(rem / (360.0 / 108)) + 1
-    return nak, pada
-
-
-def _dasa_balance(moon_degs):
-    """Return (lord_name, Y, M, D) for the Vimsottari dasa balance at birth."""
-    nak_width = 360.0 / 27
-    nak_idx = min(int(moon_degs / nak_width), 26)
-    frac_remaining = 1.0 - (moon_degs - nak_idx * nak_width) / nak_width
-    lord_idx = nak_idx % 9
-    bal_years = frac_remaining * DASA_YEARS[lord_idx]
-    y = int(bal_years)
-    m = int((bal_years - y) * 12)
-    d = round(((bal_years - y) * 12 - m) * 30)
-    return DASA_LORDS[lord_idx], y, m, d
-
-
-def _full_dasa_table(moon_degs, birth_dt):
-    """Build full 120-year Vimsottari Dasa/Bukti table starting from birth."""
-    nak_width = 360.0 / 27
-    nak_idx = min(int(moon_degs / nak_width), 26)
-    frac_remaining = 1.0 - (moon_degs - nak_idx * nak_width) / nak_width
-    lord_idx = nak_idx % 9
-    current = birth_dt + dt.timedelta(
-        days=frac_remaining * DASA_YEARS[lord_idx] * 365.25
-    )
-    table = []
-    for d in range(9):
-        di = (lord_idx + d) % 9
-        buktis = []
-        for b in range(9):
-            bi = (di + b) % 9
-            current += dt.timedelta(
-                days=DASA_YEARS[di] * DASA_YEARS[bi] / 120.0 * 365.25
-            )
-            buktis.append((DASA_LORDS[bi], current.strftime("%Y-%m-%d")))
-        table.append({"dasa": DASA_LORDS[di], "buktis": buktis})
-    return table
-
-
-def _dt_to_hrs(d):
-    return d.hour + d.minute / 60.0 + d.second / 3600.0
-
-
 def _ramc_hms(r):
     h = int(r / 15)
     m = int((r / 15 - h) * 60)
@@ -172,163 +111,8 @@ def _ramc_hms(r):
 
 def compute(input_params):
     """Run all calculations; return a single structured result dict."""
-    sun_params = fn.get_sun_params(input_params)
-    moon_params = fn.get_moon_params(input_params, sun_params)
-    lagn_params = fn.get_lagn_params(input_params, sun_params)
-    seven = fn.get_seven_planets(sun_params, moon_params)
-
-    planet_names_order = [
-        "LAGN", "SUN", "MOON", "MARS", "MERCURY", "JUPITER",
-        "VENUS", "SATURN", "URANUS", "NEPTUNE", "RAHU", "KETU",
-    ]
-
-    planet_degs = []
-    for nm in planet_names_order:
-        if nm == "LAGN":
-            planet_degs.append(lagn_params["lagn"])
-        elif nm == "SUN":
-            planet_degs.append(sun_params["true_long"])
-        elif nm == "MOON":
-            planet_degs.append(moon_params["moon"])
-        elif nm == "RAHU":
-            planet_degs.append(moon_params["rahu"])
-        elif nm == "KETU":
-            planet_degs.append(moon_params["ketu"])
-        else:
-            planet_degs.append(seven[nm]["true_long"])
-
-    # Velocity, latitude, retrograde
-    planet_velocity = [None] * 12
-    planet_latitude = [None] * 12
-    planet_retrograde = [False] * 12
-
-    planet_velocity[1] = abs(sun_params.get("hvel", 1.0))
-    planet_latitude[1] = 0.0
-    planet_velocity[2] = 13.18
-    planet_latitude[2] = 0.0
-
-    for _idx, _nm in zip(
-        [3, 4, 5, 6, 7, 8, 9],
-        ["MARS", "MERCURY", "JUPITER", "VENUS", "SATURN", "URANUS", "NEPTUNE"],
-    ):
-        _gvel = seven[_nm].get("gvel", 0.0)
-        planet_velocity[_idx] = abs(_gvel)
-        planet_latitude[_idx] = seven[_nm].get("lat", 0.0)
-        planet_retrograde[_idx] = _gvel < 0
-
-    ashta = sb.compute_ashtavarga(planet_degs)
-
-    prec_degs = sun_params["prec"]
-    ramc_degs = lagn_params["ramc"]
-    lagn_degs = lagn_params["lagn"]
-    lat_degs = input_params["lat_degs"]
-    lat_dirn = input_params["lat_dirn"]
-    south_hemi = bool(re.match(r"s|(south)", lat_dirn, re.IGNORECASE))
-
-    nirayana_dhasa = fn.get_culm_point(ramc_degs, lat_degs, prec_degs, south_hemi)
-    house_positions = fn.get_house_positions(
-        lagn_degs, nirayana_dhasa, lat_degs, ramc_degs, prec_degs, south_hemi
-    )
-
-    bhava_positions, bhava1, bhava2 = fn.get_bhava_positions(
-        house_positions, planet_degs
-    )
-    navamsa_positions = fn.get_navamsa_positions(planet_degs)
-    rasi_positions = fn.get_rasi_positions(planet_degs)
-
-    tamil_day, tamil_month, tamil_year = fn.calc_tamil_date(input_params)
-    saka_day, saka_month, saka_year = fn.calc_saka_date(input_params["in_datetime"])
-    kali_year = fn.get_kali_year(saka_year)
-
-    yogam, karanam, thithi = fn.get_yogam_karanam_thithi(
-        sun_params["true_long"], moon_params["moon"]
-    )
-
-    birth_day = (input_params["in_datetime"].weekday() + 1) % 7
-
-    kali_dina = int(sun_params["d_epoch"]) + cn.kali_day
-
-    p7_degs = [planet_degs[i] for i in [1, 2, 3, 4, 5, 6, 7]]
-    all_signs = [int(d // 30) for d in planet_degs]
-    all_deg_in = [d % 30 for d in planet_degs]
-    all_min_in = [int((d % 30 - int(d % 30)) * 60) for d in planet_degs]
-    all_navamsa = [int(n) for n in navamsa_positions]
-
-    helio_5 = [
-        seven["MARS"]["helio_long"], seven["MERCURY"]["helio_long"],
-        seven["JUPITER"]["helio_long"], seven["VENUS"]["helio_long"],
-        seven["SATURN"]["helio_long"],
-    ]
-
-    local_hrs = _dt_to_hrs(sun_params["local_time"])
-    sunrise_hrs = _dt_to_hrs(sun_params["rise"])
-    sunset_hrs = _dt_to_hrs(sun_params["set"])
-
-    shad = sb.compute_shadbala(
-        p7_degs, all_signs, all_deg_in, all_min_in, all_navamsa,
-        helio_5, house_positions, bhava1, bhava2,
-        local_hrs, sunrise_hrs, sunset_hrs,
-        kali_dina, birth_day, prec_degs,
-    )
-
-    bhava_bala = sb.compute_bhava_bala(
-        shad["total"], p7_degs, house_positions, bhava1, bhava2
-    )
-
-    mutual = sb.compute_mutual_disp(all_signs, all_navamsa)
-
-    # Paksham / Thithi display
-    paksha = "Krishna" if thithi >= 15 else "Shukla"
-    thithi_idx = (thithi - 15) if thithi >= 15 else thithi
-    if thithi_idx == 14:
-        thithi_idx = 15
-
-    moon_degs = planet_degs[2]
-    janma_nak_idx, janma_pada = _nakshatra_pada(moon_degs)
-    dasa_lord, dasa_y, dasa_m, dasa_d = _dasa_balance(moon_degs)
-
-    return {
-        "input": input_params,
-        "planet_degs": planet_degs,
-        "navamsa_positions": navamsa_positions,
-        "rasi_positions": rasi_positions,
-        "house_positions": house_positions,
-        "bhava_positions": bhava_positions,
-        "sun_params": sun_params,
-        "moon_params": moon_params,
-        "planet_velocity": planet_velocity,
-        "planet_latitude": planet_latitude,
-        "planet_retrograde": planet_retrograde,
-        "sidereal_time": ramc_degs,
-        "ayanamsa": prec_degs,
-        "ashtavarga": ashta,
-        "calendar": {
-            "paksham": f"{paksha} Paksham",
-            "thithi": THITHI[thithi_idx],
-            "yogam": YOGAM[yogam],
-            "karanam": KARANAM[karanam],
-            "tamil_day": tamil_day,
-            "tamil_month": TAMIL_MONTH[tamil_month],
-            "tamil_year": TAMIL_YEAR[tamil_year % 60],
-            "saka_day": saka_day,
-            "saka_month": SAKA_MONTH[saka_month],
-            "saka_year": saka_year,
-            "kali_year": kali_year,
-            "weekday": WDAYS[birth_day],
-            "sunrise": sun_params["rise"],
-            "sunset": sun_params["set"],
-            "janma_nakshatra": NAKSHATRA[janma_nak_idx],
-            "janma_pada": janma_pada,
-            "dasa_lord": dasa_lord,
-            "dasa_y": dasa_y,
-            "dasa_m": dasa_m,
-            "dasa_d": dasa_d,
-            "dasa_table": _full_dasa_table(moon_degs, input_params["in_datetime"]),
-        },
-        "shad": shad,
-        "bhava_bala": bhava_bala,
-        "mutual": mutual,
-    }
+    moment = chart.compute_moment(input_params)
+    return chart.compute_place(moment, input_params)
 
 
 # ── Main Streamlit App ───────────────────────────────────────────────────────
@@ -463,7 +247,7 @@ def main():
     if calculate:
         with st.spinner("Computing horoscope\u2026"):
             try:
-                st.session_state.result = compute(input_params)
+                st.session_state.result = compute(bi.make_birth_input(input_params))
             except Exception as e:
                 st.error(f"Calculation error: {e}")
                 st.stop()
@@ -511,6 +295,78 @@ def main():
 
     components.html(single_html, height=1000, scrolling=False)
 
+    # ── Birth-time sensitivity ──
+    # The boundaries come from the crossing solver, so the report is cheap
+    # enough to redo on every change of the window
+    with st.expander("Birth-time sensitivity"):
+        window = st.slider(
+            "Birth time uncertainty (\u00b1 minutes)",
+            min_value=5, max_value=120, value=sensitivity.DEFAULT_MINUTES, step=5,
+        )
+        report = sensitivity.find_changes(result["input"], window)
+
+        if report["changes"]:
+            st.table([
+                {
+                    "Time": f"{change['datetime']:%H:%M:%S}",
+                    "Minutes": f"{change['minutes']:+.1f}",
+                    "Changes": ", ".join(
+                        f"{label}: {before} \u2192 {after}"
+                        for label, before, after in change["items"]
+                    ),
+                }
+                for change in report["changes"]
+            ])
+        else:
+            st.info(f"Nothing in the chart changes within \u00b1{window} minutes.")
+
+        chart_labels = []
+        birth_index = 0
+        for idx, entry in enumerate(report["charts"]):
+            label = (
+                f"{entry['start']:%H:%M:%S} \u2013 {entry['end']:%H:%M:%S}  "
+                f"({entry['start_minutes']:+.1f} to {entry['end_minutes']:+.1f} min)"
+            )
+            if entry["birth"]:
+                label += "  \u2014 birth time"
+                birth_index = idx
+            chart_labels.append(label)
+        st.table([
+            dict([("Birth time", label)] + sensitivity.get_state_items(entry["state"])[:5])
+            for label, entry in zip(chart_labels, report["charts"])
+        ])
+
+        choice = st.selectbox(
+            "Alternative chart",
+            options=range(len(chart_labels)),
+            index=birth_index,
+            format_func=chart_labels.__getitem__,
+        )
+        if choice != birth_index:
+            alt_entry = report["charts"][choice]
+            alt_result = compute(
+                sensitivity.get_alternative_input(result["input"], alt_entry)
+            )
+            components.html(
+                generate_single_page_html(alt_result, theme_name),
+                height=1000, scrolling=False,
+            )
+
+    # ── Daily motion ──
+    # Speeds of what the longitudes themselves do; the chart tables keep the
+    # velocities of the reference program
+    with st.expander("Daily motion"):
+        motion = velocity.get_chart_velocities(result["input"])
+        st.table([
+            {
+                "Body": name.title(),
+                "Longitude": f"{entry['long']:.4f}",
+                "Speed (°/day)": f"{entry['speed']:+.6f}",
+                "Acceleration (°/day²)": f"{entry['accel']:+.6f}",
+            }
+            for name, entry in motion.items()
+        ])
+
     # ── Footer ──
     st.markdown(
         f'<hr style="margin-top:2rem;border-color:{theme["table_border"]};">'
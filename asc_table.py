@@ -0,0 +1,344 @@
+"""
+asc_table.py — Precomputed ascendant table over sayana RAMC and latitude.
+
+The sayana lagna of get_ascendant depends only on the RAMC and the
+latitude (the obliquity, cn.omega_rads, is a constant; the precession is
+subtracted afterwards, and the southern hemisphere turns both by 180
+degrees).  The table holds it on a grid (0.1 by 0.1 degrees by default),
+as the offset of the lagna from the RAMC, interpolated bilinearly.  Each
+cell keeps the four coefficients of its interpolation side by side, so a
+lookup is one gather of a cell and a few multiplications.
+
+Every cell of the grid is checked when the table is built: the
+interpolation error is measured at its centre and the middles of its
+edges, and a cell whose error exceeds
+the tolerance (near RAMC 90 and 270, where the ascendant turns fastest and
+the formula flips quadrant, and at high latitudes) is marked for the exact
+function (its coefficients are NaN).  A lookup therefore stays within
+the tolerance everywhere, and the exact function also serves latitudes
+beyond the grid.  On the default grid a million lookups take about 0.11 s
+against 0.21 s for the exact function, some 1.8 times faster, 4 % of
+them falling back, and the table takes 78 MB (four float64 coefficients
+and a flag for each of its 3600 x 660 cells).  A coarser grid is smaller
+but sends more lookups to the exact function: at 0.25 degrees it takes
+13 MB, 22 % of the lookups fall back and the gain is about 1.35 times
+(see validate_table).
+
+The table is built on first use (a few seconds), or read from the
+ephemeris store (ephem_store.py) when it has a current one.
+
+  python asc_table.py                 # build and print the validation report
+"""
+
+import argparse
+import hashlib
+import struct
+import time
+
+import numpy as np
+
+import batch as bt
+import constants as cn
+import ephem_store as es
+
+# Bump whenever get_ascendant changes in a way omega_rads does not capture,
+# or the cells are checked differently
+TABLE_VERSION = 3
+
+DEFAULT_STEP_DEGS = 0.1
+DEFAULT_MAX_LAT_DEGS = 66.0
+DEFAULT_TOL_DEGS = 1.0 / 3600.0  # One second of arc
+
+# Points (fractions of a cell) at which the interpolation error is measured,
+# and the margin on it for the peak between them.  The error of the
+# bilinear interpolation peaks at the centre of a cell or, where the
+# curvatures along the RAMC and the latitude have opposite signs, at the
+# middle of an edge, where the interpolation is linear along the edge
+_CHECK_FRACTIONS = (0.0, 0.5, 1.0)
+_CHECK_MARGIN = 1.5
+# RAMC rows of the grid checked at a time (bounds the memory used)
+_CHUNK_ROWS = 256
+# Runs of the lookups timed by validate_table
+_TIMING_RUNS = 3
+
+_table = None
+
+
+def model_checksum(step_degs, max_lat_degs, tol_degs):
+    """
+    Return the checksum (32 bytes) of what the table is built from
+    """
+    packed = struct.pack(
+        "<Idddd", TABLE_VERSION, cn.omega_rads, step_degs, max_lat_degs, tol_degs
+    )
+    return hashlib.sha256(packed).digest()
+
+
+def _get_offset(ramc_degs, lat_degs):
+    """
+    Return the exact sayana lagna less the RAMC, wrapped to +-180 degrees
+    """
+    lagn_degs = bt.get_ascendant(ramc_degs, lat_degs, 0.0, False)
+    return np.mod(lagn_degs - ramc_degs + 180.0, cn.full_circle) - 180.0
+
+
+def _wrap_degs(degs):
+    """
+    Return the degrees mod 360, as np.mod but in a fraction of its time
+    """
+    return degs - cn.full_circle * np.floor(degs / cn.full_circle)
+
+
+def _get_cell_coeffs(offsets):
+    """
+    Return the coefficients (c0, c1, c2, c3) of the bilinear interpolation
+    c0 + c1 u + (c2 + c3 u) v of each cell, given the offsets at the nodes
+    """
+    corner = offsets[:-1, :-1]
+    ramc_diff = offsets[1:, :-1] - corner
+    lat_diff = offsets[:-1, 1:] - corner
+    cross_diff = offsets[1:, 1:] - offsets[:-1, 1:] - ramc_diff
+    return np.stack([corner, ramc_diff, lat_diff, cross_diff], axis=-1)
+
+
+def _interpolate(cell_coeffs, u, v):
+    """
+    Return the offsets interpolated within cells (coefficients as
+    _get_cell_coeffs) at the fractions (u, v) of the cell
+    """
+    return (
+        cell_coeffs[..., 0]
+        + cell_coeffs[..., 1] * u
+        + (cell_coeffs[..., 2] + cell_coeffs[..., 3] * u) * v
+    )
+
+
+def build_table(
+    step_degs=DEFAULT_STEP_DEGS,
+    max_lat_degs=DEFAULT_MAX_LAT_DEGS,
+    tol_degs=DEFAULT_TOL_DEGS,
+):
+    """
+    Return the ascendant table (dict): the grid, the interpolation
+    coefficients of its cells (NaN in those needing the exact function),
+    the cells needing the exact function, and the greatest error found in
+    the others
+    """
+    ramc_count = int(round(cn.full_circle / step_degs))
+    lat_count = int(np.ceil(max_lat_degs / step_degs))
+    ramc_nodes = np.arange(ramc_count + 1) * step_degs
+    lat_nodes = np.arange(lat_count + 1) * step_degs
+    offsets = _get_offset(ramc_nodes[:, None], lat_nodes[None, :])
+    coeffs = _get_cell_coeffs(offsets)
+
+    cell_errors = np.zeros((ramc_count, lat_count))
+    j = np.arange(lat_count)[None, :]
+    for start in range(0, ramc_count, _CHUNK_ROWS):
+        i = np.arange(start, min(start + _CHUNK_ROWS, ramc_count))[:, None]
+        for u in _CHECK_FRACTIONS:
+            for v in _CHECK_FRACTIONS:
+                exact = _get_offset((i + u) * step_degs, (j + v) * step_degs)
+                error = np.abs(_interpolate(coeffs[i[:, 0]], u, v) - exact)
+                # An offset wrapping within the cell shows as a huge error
+                error = np.minimum(error, cn.full_circle - error)
+                rows = slice(start, start + len(i))
+                cell_errors[rows] = np.maximum(cell_errors[rows], error)
+    cell_errors *= _CHECK_MARGIN
+    exact_cells = cell_errors > tol_degs
+    coeffs[exact_cells] = np.nan
+
+    table = dict()
+    table["version"] = TABLE_VERSION
+    table["step_degs"] = step_degs
+    table["max_lat_degs"] = float(lat_nodes[-1])
+    table["tol_degs"] = tol_degs
+    table["checksum"] = model_checksum(step_degs, float(lat_nodes[-1]), tol_degs)
+    table["coeffs"] = coeffs
+    table["exact_cells"] = exact_cells
+    table["max_error_degs"] = float(np.max(cell_errors[~exact_cells], initial=0.0))
+    return table
+
+
+def get_store_tables(table):
+    """
+    Return the ascendant table as store tables (see ephem_store.write_store)
+    """
+    meta = {
+        "kind": "asc_table",
+        "version": table["version"],
+        "step_degs": table["step_degs"],
+        "max_lat_degs": table["max_lat_degs"],
+        "tol_degs": table["tol_degs"],
+        "max_error_degs": table["max_error_degs"],
+        "checksum": table["checksum"].hex(),
+    }
+    return {
+        "asc_table/coeffs": (table["coeffs"], meta),
+        "asc_table/exact_cells": (table["exact_cells"], meta),
+    }
+
+
+def get_stored_table(store=None):
+    """
+    Return the ascendant table from the ephemeris store, its arrays views
+    into the mapped file; None if the store has no current table
+    """
+    stored_coeffs = es.get_table("asc_table/coeffs", store)
+    stored_cells = es.get_table("asc_table/exact_cells", store)
+    if stored_coeffs is None or stored_cells is None:
+        return None
+    coeffs, meta = stored_coeffs
+    if meta["version"] != TABLE_VERSION:
+        return None
+    checksum = bytes.fromhex(meta["checksum"])
+    if checksum != model_checksum(meta["step_degs"], meta["max_lat_degs"], meta["tol_degs"]):
+        return None
+    return {
+        "version": meta["version"],
+        "step_degs": meta["step_degs"],
+        "max_lat_degs": meta["max_lat_degs"],
+        "tol_degs": meta["tol_degs"],
+        "checksum": checksum,
+        "coeffs": coeffs,
+        "exact_cells": stored_cells[0],
+        "max_error_degs": meta["max_error_degs"],
+    }
+
+
+def get_asc_table():
+    """
+    Return the ascendant table, from the ephemeris store or built on first
+    use
+    """
+    global _table
+    if _table is None:
+        table = get_stored_table()
+        if table is None:
+            table = build_table()
+        _table = table
+    return _table
+
+
+def get_sayana_lagna(ramc_degs, lat_degs, table=None):
+    """
+    Return the sayana lagna (degrees) for the RAMC and (northern) latitude,
+    arrays or numbers, from the table; get_ascendant where the table does
+    not hold it within the tolerance
+    """
+    if table is None:
+        table = get_asc_table()
+    step_degs = table["step_degs"]
+    coeffs = table["coeffs"]
+    ramc_count, lat_count = coeffs.shape[:2]
+
+    ramc_degs, lat_degs = np.broadcast_arrays(
+        np.asarray(ramc_degs, dtype=float), np.asarray(lat_degs, dtype=float)
+    )
+    shape = ramc_degs.shape
+    ramc_degs = _wrap_degs(ramc_degs.reshape(-1))
+    lat_degs = lat_degs.reshape(-1)
+    x = ramc_degs / step_degs
+    y = lat_degs / step_degs
+    i = np.minimum(x.astype(np.intp), ramc_count - 1)
+    j = np.clip(y.astype(np.intp), 0, lat_count - 1)
+
+    # One gather of the (contiguous) coefficients of each cell, rather than
+    # of four nodes on two rows of the grid
+    cell_coeffs = np.take(coeffs.reshape(-1, 4), i * lat_count + j, axis=0)
+    lagn_degs = _wrap_degs(ramc_degs + _interpolate(cell_coeffs, x - i, y - j))
+
+    outside = (lat_degs < 0.0) | (lat_degs > table["max_lat_degs"])
+    exact = outside | np.isnan(lagn_degs)
+    if np.any(exact):
+        lagn_degs[exact] = bt.get_ascendant(ramc_degs[exact], lat_degs[exact], 0.0, False)
+    return lagn_degs.reshape(shape)[()]
+
+
+def get_ascendant(ramc_degs, latitude_degs, precsn_birth_degs, south_hemi, table=None):
+    """
+    Return Nirayana Lagnam in degrees, as batch.get_ascendant, from the table
+    """
+    sayana_lagn = get_sayana_lagna(ramc_degs, latitude_degs, table)
+    # The southern turn and the precession taken off together, in one wrap
+    return _wrap_degs(sayana_lagn + np.multiply(south_hemi, 180.0) - precsn_birth_degs)
+
+
+def validate_table(table=None, count=1_000_000, seed=0):
+    """
+    Return the validation report (dict) of the table: the interpolation
+    error (degrees) at random RAMCs and latitudes over the grid, the share of
+    lookups falling back to the exact function, and the time (seconds) of
+    the lookups and of the exact function for them, and the size (bytes)
+    of the table
+    """
+    if table is None:
+        table = get_asc_table()
+    rng = np.random.default_rng(seed)
+    ramc_degs = rng.uniform(0.0, cn.full_circle, count)
+    lat_degs = rng.uniform(0.0, table["max_lat_degs"], count)
+
+    # Best of a few runs each, so the first touch of the table and of the
+    # arrays is not timed
+    exact_secs = table_secs = float("inf")
+    for _ in range(_TIMING_RUNS):
+        start = time.perf_counter()
+        exact_degs = bt.get_ascendant(ramc_degs, lat_degs, 0.0, False)
+        exact_secs = min(exact_secs, time.perf_counter() - start)
+        start = time.perf_counter()
+        table_degs = get_sayana_lagna(ramc_degs, lat_degs, table)
+        table_secs = min(table_secs, time.perf_counter() - start)
+
+    error = np.abs(np.mod(table_degs - exact_degs + 180.0, cn.full_circle) - 180.0)
+    step_degs = table["step_degs"]
+    cells = table["exact_cells"]
+    i = np.minimum((ramc_degs / step_degs).astype(np.intp), cells.shape[0] - 1)
+    j = np.minimum((lat_degs / step_degs).astype(np.intp), cells.shape[1] - 1)
+
+    report = dict()
+    report["samples"] = count
+    report["tol_degs"] = table["tol_degs"]
+    report["cell_max_error_degs"] = table["max_error_degs"]
+    report["exact_cell_share"] = float(np.mean(cells))
+    report["fallback_share"] = float(np.mean(cells[i, j]))
+    report["max_error_degs"] = float(np.max(error))
+    report["p999_error_degs"] = float(np.quantile(error, 0.999))
+    report["mean_error_degs"] = float(np.mean(error))
+    report["exact_secs"] = exact_secs
+    report["table_secs"] = table_secs
+    report["table_bytes"] = table["coeffs"].nbytes + cells.nbytes
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and validate the ascendant table")
+    parser.add_argument("--step", type=float, default=DEFAULT_STEP_DEGS, help="grid step degrees")
+    parser.add_argument("--max-lat", type=float, default=DEFAULT_MAX_LAT_DEGS)
+    parser.add_argument("--tol", type=float, default=DEFAULT_TOL_DEGS * 3600.0,
+                        help="error bound, seconds of arc")
+    parser.add_argument("--samples", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    table = build_table(args.step, args.max_lat, args.tol / 3600.0)
+    build_secs = time.perf_counter() - start
+    report = validate_table(table, args.samples)
+
+    ramc_count, lat_count = table["exact_cells"].shape
+    print(f"Grid {ramc_count} x {lat_count} cells of {args.step} degrees, built in {build_secs:.1f} s")
+    print(f"Table size: {report['table_bytes'] / 1e6:.1f} MB")
+    print(f"Cells using the exact function: {100 * report['exact_cell_share']:.3f} %")
+    print(f"Error bound of the other cells: {report['cell_max_error_degs'] * 3600:.4f}\"")
+    print(f"Random lookups: {report['samples']}, {100 * report['fallback_share']:.3f} % exact")
+    print(
+        f"  error max {report['max_error_degs'] * 3600:.4f}\"  "
+        f"99.9% {report['p999_error_degs'] * 3600:.4f}\"  "
+        f"mean {report['mean_error_degs'] * 3600:.4f}\""
+    )
+    print(
+        f"  time: table {report['table_secs']:.3f} s, "
+        f"exact {report['exact_secs']:.3f} s"
+    )
+
+
+if __name__ == "__main__":
+    main()
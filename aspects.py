@@ -0,0 +1,139 @@
+"""
+aspects.py — When two bodies conjoin, or one aspects the other.
+
+A conjunction is the instant the two longitudes are equal.  A planet
+aspects the houses counted from itself that get full strength in the
+aspect table of shadbala.py: the 7th for all, and also the 4th and 8th
+for Mars, the 5th and 9th for Jupiter, the 3rd and 10th for Saturn.  The
+aspect to a house h is exact when the aspected body is (h - 1) * 30
+degrees ahead of the aspector.
+
+The events are the crossings of the difference angle (aspected less
+aspector, events.make_pair_angle) with each of these targets.  The solver
+scans the difference with steps no longer than the time the two bodies
+need, at the sum of their greatest motions, to close the distance left, so
+a long range costs a few evaluations per event rather than a fine
+sampling.  The aspected body may be a fixed longitude, such as a natal
+position.
+
+  python aspects.py --start-date 1900-01-01 --end-date 2100-01-01 \\
+      --lat 13.08 --long 80.27 --aspector JUPITER --aspected SATURN --houses 1
+  python aspects.py --start-date 2024-01-01 --end-date 2026-01-01 \\
+      --lat 13.08 --long 80.27 --aspector MARS --aspected 123.4
+"""
+
+import argparse
+import datetime as dt
+
+import birth_input as bi
+import constants as cn
+import events as ev
+import functions as fn
+import shadbala as sb
+
+# Planet order of shadbala.py
+SHADBALA_PLANETS = ["SUN", "MOON", "MARS", "MERCURY", "JUPITER", "VENUS", "SATURN"]
+
+ASPECT_BODIES = SHADBALA_PLANETS + ["RAHU", "URANUS", "NEPTUNE"]
+
+_HOUSE_DEGS = cn.full_circle / 12.0
+
+
+def get_aspect_houses(aspector):
+    """
+    Return the houses (counted from the aspector as 1) it aspects fully
+    """
+    if aspector in SHADBALA_PLANETS:
+        return sb.full_aspect_houses(SHADBALA_PLANETS.index(aspector))
+    return [7]
+
+
+def find_aspects(input_params, aspector, aspected, start_days, end_days,
+                 houses=None, tol_days=ev.DEFAULT_TOL_DAYS):
+    """
+    Return the list of instants within the window (IST days) the aspector
+    is in conjunction with (house 1) or aspects (houses of
+    get_aspect_houses by default) the aspected body, a body name or a fixed
+    longitude, at the place of input_params; in time order.  Each event is
+    a crossing (see events.find_crossing) with the house and the angle
+    (degrees) of the aspect; a direction of +1 means the aspected body is
+    drawing ahead of the aspector.
+    """
+    if houses is None:
+        houses = [1] + get_aspect_houses(aspector)
+    angle = ev.make_pair_angle(aspected, aspector, input_params)
+
+    events = []
+    for house in houses:
+        aspect_degs = (house - 1) * _HOUSE_DEGS
+        for crossing in ev.find_crossings(angle, aspect_degs, start_days, end_days, tol_days):
+            crossing["house"] = house
+            crossing["aspect_degs"] = aspect_degs
+            events.append(crossing)
+    events.sort(key=lambda event: event["ist_days"])
+    return events
+
+
+def find_conjunctions(input_params, first, second, start_days, end_days,
+                      tol_days=ev.DEFAULT_TOL_DAYS):
+    """
+    Return the list of conjunctions of the two bodies within the window (see
+    find_aspects)
+    """
+    return find_aspects(input_params, first, second, start_days, end_days, [1], tol_days)
+
+
+def _get_body(text):
+    """
+    Return the body name, or the fixed longitude (degrees) given as a number
+    """
+    if text.upper() in ASPECT_BODIES:
+        return text.upper()
+    try:
+        return float(text) % cn.full_circle
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not a body or a longitude: {text}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Conjunctions and aspects")
+    parser.add_argument("--start-date", required=True, help="YYYY-MM-DD")
+    parser.add_argument("--end-date", required=True, help="YYYY-MM-DD")
+    bi.add_place_arguments(parser)
+    parser.add_argument("--aspector", required=True, type=str.upper, choices=ASPECT_BODIES)
+    parser.add_argument(
+        "--aspected", required=True, type=_get_body,
+        help="body, or a fixed longitude in degrees (e.g. a natal position)",
+    )
+    parser.add_argument(
+        "--houses", nargs="+", type=int, choices=range(1, 13),
+        help="houses from the aspector (1 for conjunction); default all full aspects",
+    )
+    args = parser.parse_args()
+
+    start_date = dt.datetime.fromisoformat(args.start_date)
+    input_params = bi.get_birth_input(parser, args, start_date)
+    ist_offset_days = fn.get_ist_offset_days(
+        input_params["diff_from_gst_in_sec"], fn.get_west(input_params)
+    )
+    start_days = fn.get_days_from_epoch(start_date)
+    end_days = fn.get_days_from_epoch(dt.datetime.fromisoformat(args.end_date))
+
+    events = find_aspects(
+        input_params, args.aspector, args.aspected,
+        start_days + ist_offset_days, end_days + ist_offset_days, args.houses,
+    )
+    aspected = args.aspected
+    if not isinstance(aspected, str):
+        aspected = f"{aspected:.4f}"
+    for event in events:
+        what = "conjunct" if event["house"] == 1 else f"aspects ({event['house']}th)"
+        motion = "" if event["direction"] > 0 else " (aspector gaining)"
+        print(
+            f"{event['datetime']:%Y-%m-%d %H:%M:%S}  {args.aspector} {what} "
+            f"{aspected}{motion}"
+        )
+
+
+if __name__ == "__main__":
+    main()
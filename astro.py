@@ -26,6 +26,7 @@ import datetime as dt
 import os
 import sys
 
+import birth_input as bi
 import constants as cn
 import functions as fn
 import shadbala as sb
@@ -52,7 +53,7 @@ from constants import (
 
 
 def read_data_file(path="data.txt"):
-    """Read data.txt and return input_params dict."""
+    """Read data.txt and return its input params (a birth_input.BirthInput)."""
     if not os.path.exists(path):
         print(f"Error: {path} not found.")
         sys.exit(1)
@@ -95,7 +96,11 @@ def read_data_file(path="data.txt"):
         "long_degs": long_degs,
         "long_dirn": long_dir,
     }
-    return params
+    try:
+        return bi.make_birth_input(params)
+    except ValueError as err:
+        print(f"Error: {path}: {err}")
+        sys.exit(1)
 
 
 # ---------------------------------------------------------------------------
@@ -174,10 +179,7 @@ def run():
     ramc_degs = lagn_params["ramc"]
     lagn_degs = lagn_params["lagn"]
     lat_degs = input_params["lat_degs"]
-    lat_dirn = input_params["lat_dirn"]
-    import re
-
-    south_hemi = bool(re.match(r"s|(south)", lat_dirn, re.IGNORECASE))
+    south_hemi = fn.get_south(input_params)
 
     nirayana_dhasa = fn.get_culm_point(ramc_degs, lat_degs, prec_degs, south_hemi)
     house_positions = fn.get_house_positions(
@@ -190,7 +192,9 @@ def run():
     navamsa_positions = fn.get_navamsa_positions(planet_degs)
 
     # Calendar data
-    tamil_day, tamil_month, tamil_year = fn.calc_tamil_date(input_params)
+    tamil_day, tamil_month, tamil_year = fn.calc_tamil_date(
+        input_params, time_params=sun_params["time"]
+    )
     saka_day, saka_month, saka_year = fn.calc_saka_date(input_params["in_datetime"])
     kali_year = fn.get_kali_year(saka_year)
 
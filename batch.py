@@ -0,0 +1,1228 @@
+"""
+batch.py — NumPy-vectorised counterparts of the ephemeris in functions.py.
+
+Every function here mirrors the scalar function of the same name in
+functions.py, but works on NumPy arrays holding one element per chart.
+Branches in the scalar code (quadrant fix-ups, E/W and N/S handling) are
+expressed as boolean masks, so a whole batch is computed with NumPy ufuncs.
+
+Inputs are "columnar input params": a dict with the same keys as the scalar
+input_params, where each value is an array (or a scalar, broadcast to all
+charts).  stack_input_params() builds one from a list of input_params dicts
+(or BirthInputs); it adds the directions as the boolean columns "west" and
+"south", which get_input_arrays takes in place of the letters.
+
+Results follow the scalar dicts key for key, with arrays as values.  Times
+are float days since constants.epoch_sun_rise, as in the float time core;
+"ist_time", "local_time", "rise" and "set" are datetime64[us] arrays.
+"""
+
+import numpy as np
+
+import constants as cn
+import functions as fn
+
+_INPUT_KEYS = [
+    "in_datetime",
+    "diff_from_gst_in_sec",
+    "lat_degs",
+    "lat_dirn",
+    "long_degs",
+    "long_dirn",
+]
+
+_epoch_sun_rise = np.datetime64(cn.epoch_sun_rise, "us")
+_one_day = np.timedelta64(1, "D").astype("timedelta64[us]")
+
+
+# ---------------------------------------------------------------------------
+# Inputs and the float time core
+# ---------------------------------------------------------------------------
+
+
+def stack_input_params(input_params_list):
+    """
+    Return columnar input params, given a list of input_params dicts; the
+    datetimes already as datetime64[us], which every stage would otherwise
+    convert again, one object at a time
+    """
+    input_cols = {
+        key: np.array([params[key] for params in input_params_list])
+        for key in _INPUT_KEYS
+    }
+    input_cols["in_datetime"] = input_cols["in_datetime"].astype("datetime64[us]")
+    input_cols["west"] = np.array([fn.get_west(params) for params in input_params_list])
+    input_cols["south"] = np.array([fn.get_south(params) for params in input_params_list])
+    return input_cols
+
+
+def _dirn_mask(dirn, letter):
+    """
+    Return a boolean mask: True where dirn starts with letter (any case).
+    Mirrors re.match(r"w|(west)", dirn, re.IGNORECASE) for letter "w".
+    """
+    # Only the first letter counts: cutting to it is far cheaper than
+    # np.char.lower, which goes string by string
+    first = np.asarray(dirn, dtype=str).astype("U1")
+    return (first == letter.lower()) | (first == letter.upper())
+
+
+def get_input_arrays(input_cols):
+    """
+    Return the columnar input params broadcast to a common shape, with the
+    direction strings turned into masks ("west", "south", "lat_n", "lat_s");
+    "west" and "south" are taken as they are if input_cols has them
+    """
+    in_datetime = np.asarray(input_cols["in_datetime"], dtype="datetime64[us]")
+    arrays = np.broadcast_arrays(
+        in_datetime,
+        np.asarray(input_cols["diff_from_gst_in_sec"], dtype=float),
+        np.asarray(input_cols["lat_degs"], dtype=float),
+        np.asarray(input_cols["long_degs"], dtype=float),
+        np.asarray(input_cols["lat_dirn"], dtype=str),
+        np.asarray(input_cols["long_dirn"], dtype=str),
+    )
+    in_datetime, diff_sec, lat_degs, long_degs, lat_dirn, long_dirn = arrays
+    if "west" in input_cols:
+        west = np.broadcast_to(np.asarray(input_cols["west"], dtype=bool), lat_degs.shape)
+        south = np.broadcast_to(np.asarray(input_cols["south"], dtype=bool), lat_degs.shape)
+    else:
+        west = _dirn_mask(long_dirn, "w")
+        south = _dirn_mask(lat_dirn, "s")
+
+    cols = dict()
+    cols["in_datetime"] = in_datetime
+    cols["diff_from_gst_in_sec"] = diff_sec
+    cols["lat_degs"] = lat_degs
+    cols["long_degs"] = long_degs
+    cols["west"] = west
+    cols["south"] = south
+    # get_sun_rise_set compares the latitude direction exactly, not by regex
+    cols["lat_n"] = lat_dirn == "N"
+    cols["lat_s"] = lat_dirn == "S"
+    return cols
+
+
+def get_days_from_epoch(in_datetime):
+    """
+    Return the days (fractional) since Epoch Sun Rise, given datetime64s
+    """
+    in_datetime = np.asarray(in_datetime, dtype="datetime64[us]")
+    return (in_datetime - _epoch_sun_rise) / _one_day
+
+
+def get_datetime_from_days(epoch_days):
+    """
+    Return datetime64[us] values, given the days since Epoch Sun Rise
+    """
+    micro_secs = np.rint(np.asarray(epoch_days) * (cn.seconds_in_day * 1e6))
+    return _epoch_sun_rise + micro_secs.astype(np.int64).astype("timedelta64[us]")
+
+
+def get_years_elapsed(ist_days, base_in_days=0.0):
+    """
+    Return time elapsed in years (fractional), since a given base date
+    """
+    days_elapsed = ist_days + cn.epoch_sun_rise_in_days + base_in_days
+    return days_elapsed / cn.solar_days_in_year
+
+
+def get_time_params(cols):
+    """
+    Return the float time core (dict of arrays); see functions.get_time_params
+    """
+    civil_days = get_days_from_epoch(cols["in_datetime"].astype("datetime64[s]"))
+
+    diff_sec = np.where(
+        cols["west"], -cols["diff_from_gst_in_sec"], cols["diff_from_gst_in_sec"]
+    )
+    ist_offset_days = (cn.ist_offset_in_sec - diff_sec) / cn.seconds_in_day
+
+    local_offset_days = get_local_offset_days(cols["long_degs"], cols["west"])
+
+    return make_time_params(civil_days, ist_offset_days, local_offset_days)
+
+
+def get_local_offset_days(long_degs, west):
+    """
+    Return the offsets (days) that convert IST to local time, kept to the
+    whole second; see functions.get_local_offset_days
+    """
+    local_longitude = np.where(west, -long_degs, long_degs)
+    diff_longitude = cn.IST_longitude - local_longitude
+    diff_time_in_sec = diff_longitude * cn.deg_angle_to_time_sec
+    return np.floor(-np.round(diff_time_in_sec, 6)) / cn.seconds_in_day
+
+
+def make_time_params(civil_days, ist_offset_days, local_offset_days):
+    """
+    Return the float time core (dict of arrays) for the given civil days
+    """
+    ist_days = civil_days + ist_offset_days
+    local_days = ist_days + local_offset_days
+
+    time_params = dict()
+    time_params["civil_days"] = civil_days
+    time_params["ist_days"] = ist_days
+    time_params["local_days"] = local_days
+    time_params["y_epoch"] = get_years_elapsed(ist_days)
+    time_params["ist_offset_days"] = ist_offset_days
+    time_params["local_offset_days"] = local_offset_days
+    return time_params
+
+
+def get_midnight_days(civil_days):
+    """
+    Return the days since Epoch Sun Rise at 00:00 hours of the given days
+    """
+    esr_days = cn.epoch_sun_rise_in_days
+    return np.floor(civil_days + esr_days) - esr_days
+
+
+# ---------------------------------------------------------------------------
+# Solar engine
+# ---------------------------------------------------------------------------
+
+
+def find_diff_degs(deg1, deg2):
+    """
+    Return the difference in degrees; Mod to 360; always positive.
+    """
+    return np.mod(deg1 - deg2, cn.full_circle)
+
+
+def get_precession_degs(years_elapsed):
+    """
+    Return the current precession in degrees
+    """
+    precession_movement = (
+        cn.precession_per_year_in_sec * years_elapsed
+    ) / cn.seconds_in_degree
+    return cn.precession_at_epoch + precession_movement
+
+
+def get_apse_position_degs(apse_at_epoch, apse_motion, years_elapsed):
+    """
+    Return the current apse position in degrees
+    """
+    apse_movement_degs = (apse_motion * years_elapsed) / cn.seconds_in_degree
+    return np.mod(apse_at_epoch + apse_movement_degs, cn.full_circle)
+
+
+def get_sun_moment(ist_days, years_elapsed):
+    """
+    Return the precession and the apse position of the Sun (degrees), from
+    their values at the start of the calendar day, as functions.get_sun_moment
+    does with its per-day cache: near the poles the hour angle magnifies a
+    difference in the last bit
+    """
+    esr_days = cn.epoch_sun_rise_in_days
+    day_num = np.floor(ist_days + esr_days)
+    day_years = get_years_elapsed(day_num - esr_days)
+    years_in_day = years_elapsed - day_years
+
+    precession_degs = get_precession_degs(day_years) + (
+        cn.precession_per_year_in_sec * years_in_day
+    ) / cn.seconds_in_degree
+    day_apse_degs = (
+        cn.apse_position_at_epoch
+        + (cn.apse_movement_per_year_in_sec * day_years) / cn.seconds_in_degree
+    )
+    apse_position_degs = np.mod(
+        day_apse_degs
+        + (cn.apse_movement_per_year_in_sec * years_in_day) / cn.seconds_in_degree,
+        cn.full_circle,
+    )
+    return precession_degs, apse_position_degs
+
+
+def get_mean_longitude(epoch_days, rev_days, mple, rahu=False):
+    """
+    Return the mean longitude of the planet
+    """
+    num_revolutions = epoch_days / rev_days
+    angle_movement = num_revolutions * cn.full_circle
+    if rahu:
+        return find_diff_degs(mple, angle_movement)
+    return np.mod(mple + angle_movement, cn.full_circle)
+
+
+def get_equation_of_centre(e, mean_anomaly_degs):
+    """
+    Return the equation of center (mandaphalam) in seconds
+    """
+    ma = mean_anomaly_degs * cn.rads_per_degree
+
+    mandaphalam_secs = (
+        cn.arcsec_in_radian
+        * (
+            e * np.sin(ma) / 2.0 * (4.0 - 5.0 * e * np.cos(ma))
+            + e**3 / 12.0 * (13.0 * np.sin(3.0 * ma) - 3.0 * np.sin(ma))
+        )
+        + 0.5
+    )
+
+    # If Mean Anomaly is above 180 degrees, mandaphalam has to be negative
+    return np.where(
+        mean_anomaly_degs > 180.0, -np.abs(mandaphalam_secs), mandaphalam_secs
+    )
+
+
+def get_true_longitude(mean_longitude_degs, mandaphalam_secs):
+    """
+    Return the true longitude in degrees
+    """
+    mandaphalam_degs = mandaphalam_secs / 3600.0
+    return np.mod(mean_longitude_degs + mandaphalam_degs, cn.full_circle)
+
+
+def get_helio_centric_vel(mean_anomaly_degs):
+    """
+    Return the heliocentric velocity (deg) of the sun
+    """
+    ma = mean_anomaly_degs * cn.rads_per_degree
+    e = cn.earth_eccentricity
+    n = 59 * 60.0 + 8.0
+
+    helio_vel_secs = (
+        n
+        * (
+            1.0
+            - 2.0 * e * np.cos(ma)
+            + 2.5 * e * e * np.cos(2.0 * ma)
+            - e * e * e * (13.0 * np.cos(3.0 * ma) - np.cos(ma)) / 4.0
+        )
+        + 0.5
+    )
+    return helio_vel_secs / cn.seconds_in_degree
+
+
+def get_radius_vector(apse_position_degs, tlpd, e, lsma):
+    """
+    Return the radius vector
+    """
+    theta_rads = find_diff_degs(apse_position_degs, tlpd) * cn.rads_per_degree
+    return lsma * (1.0 - e * e) / (1.0 - e * np.cos(theta_rads))
+
+
+def get_hour_angle(latitude_degs, trop_long_sun_degs):
+    """
+    Return the hour angle in degrees, given latitude and tropical longitude of
+    sun in degrees
+    """
+    tlsr = trop_long_sun_degs * cn.rads_per_degree
+    omega = cn.omega_rads
+    lat_rads = latitude_degs * cn.rads_per_degree
+
+    # The products are in the order of functions.get_hour_angle: near the
+    # poles the arccos magnifies a difference in the last bit
+    sin_omega = np.sin(omega)
+    sin_tlsr = np.sin(tlsr)
+    cos_decl = np.sqrt(1.0 - sin_omega * sin_omega * sin_tlsr * sin_tlsr)
+    with np.errstate(divide="ignore"):
+        ltfi_rads = np.arctan(np.abs(cos_decl / (sin_omega * sin_tlsr)))
+
+    # Capped at ltfi_rads, where the ratio is exactly +/-1 (see
+    # functions.get_hour_angle)
+    cos_hour_angle = np.where(
+        lat_rads > ltfi_rads,
+        -np.copysign(1.0, sin_omega * sin_tlsr),
+        (-1.0 * np.tan(lat_rads) * sin_omega * sin_tlsr) / cos_decl,
+    )
+    hour_angle_rads = np.arccos(np.clip(cos_hour_angle, -1.0, 1.0))
+    return hour_angle_rads * cn.degs_per_radian
+
+
+def get_pranam(trop_long_sun_degs):
+    """
+    Return the pranam in degrees
+    """
+    tlsr = trop_long_sun_degs * cn.rads_per_degree
+    omega = cn.omega_rads
+
+    pranam_rads = np.abs(
+        np.arctan(
+            (2.0 * np.tan(tlsr) * np.sin(omega / 2.0) * np.sin(omega / 2.0))
+            / (1.0 + np.tan(tlsr) * np.tan(tlsr) * np.cos(omega))
+        )
+    )
+
+    # Pranam is Negative if TropLong of Sun is between 0-90 and 180-270 degrees
+    negative = ((0 <= tlsr) & (tlsr < 0.5 * np.pi)) | (
+        (np.pi <= tlsr) & (tlsr < 1.5 * np.pi)
+    )
+    return np.where(negative, -pranam_rads, pranam_rads) * cn.degs_per_radian
+
+
+def get_sun_rise_set(
+    trop_long_sun_degs, mandaphalam_secs, charam_degs, pranam_degs, lat_n, lat_s
+):
+    """
+    Return the sun rise and sun set, in seconds from 00:00 hours
+    """
+    tlsd = trop_long_sun_degs
+    mp_degs = mandaphalam_secs / cn.seconds_in_degree
+
+    net_degs = pranam_degs + mp_degs
+    app_noon_sec = net_degs * cn.deg_angle_to_time_sec
+    app_noon_sec += 15 * cn.ghatikas_to_sec_conv_factor
+    app_noon_sec = app_noon_sec + 6 * 3600
+
+    flip = (lat_n & (tlsd > 180)) | (lat_s & (tlsd <= 180))
+    charam_degs = np.where(flip, -charam_degs, charam_degs)
+
+    halfday_sec = charam_degs * cn.deg_angle_to_time_sec
+    halfday_sec += 15 * cn.ghatikas_to_sec_conv_factor
+
+    return app_noon_sec - halfday_sec, app_noon_sec + halfday_sec
+
+
+def get_net_correction(charam_degs, mandaphalam_secs, pranam_degs, longitude_degs):
+    """
+    Return the net correction in minutes
+    Input: longitude_degs signed (negative for West)
+    """
+    mandaphalam_degs = mandaphalam_secs / cn.seconds_in_degree
+    cha_man_pra = np.mod(charam_degs + mandaphalam_degs + pranam_degs, cn.full_circle)
+    # Raw subtraction (not modulo), as in functions.get_net_correction
+    net_corr_degs = cha_man_pra - longitude_degs
+    return net_corr_degs * cn.minutes_in_degree
+
+
+def sun_corrected_long(true_long_sun_degs, net_corr_min, helio_vel_degs):
+    """
+    Return the corrected longitude of sun
+    """
+    net_corr_day = net_corr_min / cn.min_angle_in_one_day
+    return np.mod(true_long_sun_degs + net_corr_day * helio_vel_degs, cn.full_circle)
+
+
+def get_sun_core(cols, time_params):
+    """
+    Return dictionary of sun parameters (arrays) for the float time core.
+    Mirrors functions.get_sun_core.
+    """
+    signed_long_degs = np.where(cols["west"], -cols["long_degs"], cols["long_degs"])
+
+    years_since_epoch = time_params["y_epoch"]
+    precession_degs, apse_posn_sun_degs = get_sun_moment(
+        time_params["ist_days"], years_since_epoch
+    )
+
+    epoch_days = time_params["local_days"]
+    mean_long_sun_degs = get_mean_longitude(
+        epoch_days, cn.sidereal_days_in_year, cn.mean_sun_long_at_epoch
+    )
+    mean_anom_sun_degs = find_diff_degs(apse_posn_sun_degs, mean_long_sun_degs)
+    mandaphalam_secs = get_equation_of_centre(cn.earth_eccentricity, mean_anom_sun_degs)
+
+    true_long_sun_degs = get_true_longitude(mean_long_sun_degs, mandaphalam_secs)
+    trop_long_sun_degs = np.mod(true_long_sun_degs + precession_degs, cn.full_circle)
+
+    helio_vel_degs = get_helio_centric_vel(mean_anom_sun_degs)
+    radius_vect_sun = get_radius_vector(
+        apse_posn_sun_degs, trop_long_sun_degs, cn.earth_eccentricity, cn.earth_lsma
+    )
+
+    hour_angle_degs = get_hour_angle(cols["lat_degs"], trop_long_sun_degs)
+    charam_degs = np.abs(90 - hour_angle_degs)
+    pranam_degs = get_pranam(trop_long_sun_degs)
+
+    net_corr_min = get_net_correction(
+        charam_degs, mandaphalam_secs, pranam_degs, signed_long_degs
+    )
+    true_long_sun_degs = sun_corrected_long(
+        true_long_sun_degs, net_corr_min, helio_vel_degs
+    )
+
+    sunrise_sec, sunset_sec = get_sun_rise_set(
+        trop_long_sun_degs,
+        mandaphalam_secs,
+        charam_degs,
+        pranam_degs,
+        cols["lat_n"],
+        cols["lat_s"],
+    )
+    midnight_days = get_midnight_days(time_params["civil_days"])
+
+    sun_params = dict()
+    sun_params["time"] = time_params
+    sun_params["y_epoch"] = years_since_epoch
+    sun_params["prec"] = precession_degs
+    sun_params["d_epoch"] = epoch_days
+    sun_params["mean_long"] = mean_long_sun_degs
+    sun_params["true_long"] = true_long_sun_degs
+    sun_params["trop_long"] = trop_long_sun_degs
+    sun_params["apse"] = apse_posn_sun_degs
+    sun_params["anom"] = mean_anom_sun_degs
+    sun_params["eqnc"] = mandaphalam_secs
+    sun_params["hvel"] = helio_vel_degs
+    sun_params["rad"] = radius_vect_sun
+    sun_params["ha"] = hour_angle_degs
+    sun_params["charam"] = charam_degs
+    sun_params["pranam"] = pranam_degs
+    sun_params["net_corr"] = net_corr_min
+    sun_params["rise_secs"] = sunrise_sec
+    sun_params["set_secs"] = sunset_sec
+    sun_params["rise_days"] = midnight_days + sunrise_sec / cn.seconds_in_day
+    sun_params["set_days"] = midnight_days + sunset_sec / cn.seconds_in_day
+
+    return sun_params
+
+
+def get_sun_params(input_cols):
+    """
+    Return dictionary of sun parameters (arrays) for columnar input params.
+    Mirrors functions.get_sun_params: IST, local time, sunrise and sunset are
+    datetime64[us] arrays.
+    """
+    cols = get_input_arrays(input_cols)
+    time_params = get_time_params(cols)
+    sun_params = get_sun_core(cols, time_params)
+
+    base_date = get_datetime_from_days(get_midnight_days(time_params["civil_days"]))
+    # As fn.get_clock_datetimes: from the civil time and the offsets
+    civil_time = cols["in_datetime"].astype("datetime64[s]").astype("datetime64[us]")
+    ist_offset = _secs_to_timedelta(time_params["ist_offset_days"] * cn.seconds_in_day)
+    local_offset = _secs_to_timedelta(time_params["local_offset_days"] * cn.seconds_in_day)
+    sun_params["ist_time"] = civil_time + ist_offset
+    sun_params["local_time"] = sun_params["ist_time"] + local_offset
+    sun_params["rise"] = base_date + _secs_to_timedelta(sun_params["rise_secs"])
+    sun_params["set"] = base_date + _secs_to_timedelta(sun_params["set_secs"])
+
+    return sun_params
+
+
+def _secs_to_timedelta(secs):
+    """
+    Return timedelta64[us] values, given seconds (rounded to microseconds)
+    """
+    micro_secs = np.rint(np.asarray(secs) * 1e6)
+    return micro_secs.astype(np.int64).astype("timedelta64[us]")
+
+
+# ---------------------------------------------------------------------------
+# Lunar engine
+# ---------------------------------------------------------------------------
+
+
+def add_correction(degree, nc, motion):
+    cor = (motion * nc) / 21600.0
+    return np.mod(degree + cor / 60.0, cn.full_circle)
+
+
+def get_moon_annual_variation(mandaphalam_secs):
+    """
+    Return Moon Annual Variation in minutes
+    """
+    mandaphalam_mins = mandaphalam_secs / cn.seconds_in_minute
+    return -1.0 * mandaphalam_mins / 16.0
+
+
+def get_evection(mean_long_moon_degs, mean_long_sun_degs, mean_moon_apse_degs):
+    """
+    Return Moon Evection in minutes
+    """
+    moon_and_apse = np.mod(mean_long_moon_degs + mean_moon_apse_degs, cn.full_circle)
+    double_sun = np.mod(mean_long_sun_degs + mean_long_sun_degs, cn.full_circle)
+
+    theta_degs = find_diff_degs(moon_and_apse, double_sun)
+    theta_rads = theta_degs * cn.rads_per_degree
+
+    with np.errstate(divide="ignore"):
+        angle_degs = (
+            np.arctan(-4467.0 / (60.0 * np.sin(theta_rads))) * cn.degs_per_radian
+        )
+    angle_degs = np.where(theta_degs < 180.0, angle_degs + 180.0, angle_degs)
+    angle_rads = angle_degs * cn.rads_per_degree
+
+    return (4467.0 * np.cos(angle_rads + theta_rads)) / 60.0
+
+
+def get_variation(mean_long_moon_degs, mean_long_sun_degs):
+    """
+    Return Moon Variation in minutes
+    """
+    theta_degs = find_diff_degs(mean_long_moon_degs, mean_long_sun_degs)
+    theta_rads = theta_degs * cn.rads_per_degree
+    moon_cv_rads = cn.moon_cv_rads
+    tpluscvby2 = (theta_rads + moon_cv_rads) / 2.0
+    tminuscvby2 = (theta_rads - moon_cv_rads) / 2.0
+
+    return (
+        -8580.0
+        * np.sin(theta_rads)
+        * np.sin(tpluscvby2)
+        * np.sin(tminuscvby2)
+        / 60.0
+    )
+
+
+def get_near_value(a1, a2):
+    """
+    Return a2 moved to the quadrant of a1; masked form of
+    functions.get_near_value
+    """
+    n1 = np.floor_divide(a1, 90.0)
+    # C-style truncation toward zero, as in the scalar version
+    n2 = np.trunc(a2 / 90.0)
+
+    negative = a2 < 0
+    beyond = a1 > -a2
+    first_quad = (a1 > 0) & (a1 < 90) & (np.abs(a2) < 90)
+
+    neg_value = np.where(
+        beyond,
+        a2 + ((n1 + 1) - n2) * 90.0,
+        np.where(first_quad, a2 + 180, a2 + ((n2 + 1) - n1) * 90.0),
+    )
+    pos_value = np.where(a1 > a2, a2 + (n1 - n2) * 90.0, a2 - (n2 - n1) * 90.0)
+    return np.where(negative, neg_value, pos_value)
+
+
+def get_ecliptic_moon(true_moon_degs, rahu_degs):
+    nodal_dist_degs = find_diff_degs(true_moon_degs, rahu_degs)
+    nodal_dist_rads = nodal_dist_degs * cn.rads_per_degree
+
+    theta_rads = 5.1467 * cn.rads_per_degree
+    other_node_rads = np.arctan(np.cos(theta_rads) * np.tan(nodal_dist_rads))
+    other_node_degs = other_node_rads * cn.degs_per_radian
+
+    nodal_corr_degs = get_near_value(nodal_dist_degs, other_node_degs)
+
+    eclp_moon_degs = np.mod(nodal_corr_degs + rahu_degs, cn.full_circle)
+
+    true_moon_quad = np.floor_divide(true_moon_degs, 90.0)
+    eclp_moon_quad = np.floor_divide(eclp_moon_degs, 90.0)
+
+    # Where the quadrants differ, move into the quadrant of the true moon;
+    # a zero shift leaves the others unchanged.
+    quad_diff_degs = (true_moon_quad - eclp_moon_quad) * 90.0
+    return np.where(
+        true_moon_quad != eclp_moon_quad,
+        np.mod(eclp_moon_degs + quad_diff_degs, cn.full_circle),
+        eclp_moon_degs,
+    )
+
+
+def get_moon_final_correction(mean_sun, mean_moon, sun_apse, moon_apse, rahu):
+    """
+    Return final correction of moon in degrees
+    """
+    d2rad = cn.rads_per_degree
+    a = find_diff_degs(mean_moon, mean_sun) * d2rad
+    b = find_diff_degs(sun_apse, mean_sun) * d2rad
+    c = find_diff_degs(moon_apse, mean_moon) * d2rad
+    d = find_diff_degs(mean_sun, moon_apse) * d2rad
+    e = find_diff_degs(mean_moon, rahu) * d2rad
+    f = find_diff_degs(mean_sun, rahu) * d2rad
+
+    corr_secs = (
+        -155.0 * np.sin(2.0 * a + b)
+        + 198.0 * np.sin(a + b - d)
+        + 112.0 * np.sin(b - c)
+        + 73.0 * np.sin(b + c)
+        + 85.0 * np.sin(c + 2.0 * e)
+        - 81.0 * np.sin(2.0 * f)
+    )
+    return corr_secs / cn.seconds_in_degree
+
+
+def get_moon_params(sun_params):
+    """
+    Return dictionary with positions of Moon, Apse, Rahu and Ketu (arrays)
+    in degrees, given the batch sun parameters.
+    Mirrors functions.get_moon_params; the net correction is the sun's.
+    """
+    mean_sun_degs = sun_params["mean_long"]
+    epoch_days = sun_params["d_epoch"]
+    mandaphalam_secs = sun_params["eqnc"]
+    sun_apse_degs = sun_params["apse"]
+    net_corr_mins = sun_params["net_corr"]
+
+    mean_moon_degs = get_mean_longitude(
+        epoch_days, cn.moon_rev_days, cn.mean_moon_long_at_epoch
+    )
+    mean_apse_degs = get_mean_longitude(
+        epoch_days, cn.moon_apse_revolution_days, cn.moon_apse_at_epoch
+    )
+    mean_rahu_degs = get_mean_longitude(
+        epoch_days, cn.moon_rahu_revolution_days, cn.moon_rahu_at_epoch, rahu=True
+    )
+    mean_ketu_degs = np.mod(mean_rahu_degs + 180, cn.full_circle)
+
+    mean_moon_corr_degs = add_correction(mean_moon_degs, net_corr_mins, cn.moon_motion)
+    mean_apse_corr_degs = add_correction(mean_apse_degs, net_corr_mins, cn.apse_motion)
+    mean_sun_corr_degs = add_correction(mean_sun_degs, net_corr_mins, cn.sun_motion)
+
+    annual_var_mins = get_moon_annual_variation(mandaphalam_secs)
+    evection_mins = get_evection(
+        mean_moon_corr_degs, mean_sun_corr_degs, mean_apse_corr_degs
+    )
+    var_mins = get_variation(mean_moon_corr_degs, mean_sun_corr_degs)
+    second_corr_mins = annual_var_mins + evection_mins + var_mins
+    second_corr_degs = second_corr_mins / cn.minutes_in_degree
+
+    mean_long_moon_degs = np.mod(
+        mean_moon_corr_degs + second_corr_degs, cn.full_circle
+    )
+    mean_anomaly_degs = find_diff_degs(mean_apse_corr_degs, mean_long_moon_degs)
+    eqn_secs = get_equation_of_centre(cn.moon_eccentricity, mean_anomaly_degs)
+    true_moon_degs = get_true_longitude(mean_long_moon_degs, eqn_secs)
+
+    ecli_moon_degs = get_ecliptic_moon(true_moon_degs, mean_rahu_degs)
+    final_corr_degs = get_moon_final_correction(
+        mean_sun_corr_degs,
+        mean_long_moon_degs,
+        sun_apse_degs,
+        mean_apse_corr_degs,
+        mean_rahu_degs,
+    )
+    true_long_moon_degs = np.mod(ecli_moon_degs + final_corr_degs, cn.full_circle)
+
+    moon_params = dict()
+    moon_params["apse"] = mean_apse_degs
+    moon_params["moon"] = true_long_moon_degs
+    moon_params["rahu"] = mean_rahu_degs
+    moon_params["ketu"] = mean_ketu_degs
+
+    return moon_params
+
+
+# ---------------------------------------------------------------------------
+# Planets, on a (planet x chart) grid
+# ---------------------------------------------------------------------------
+
+PLANET_NAMES = list(cn.planet_dict.keys())
+
+# Per-planet constants, packed into arrays of shape (7,) in PLANET_NAMES order
+planet_consts = {
+    attr: np.array([getattr(cn.planet_dict[name], attr) for name in PLANET_NAMES])
+    for attr in [
+        "length_semi_major_axis",
+        "eccentricity",
+        "rev_days",
+        "apse_motion",
+        "node_motion",
+        "nc",
+        "mean_long_at_epoch",
+        "mean_apse_at_epoch",
+        "mean_node_at_epoch",
+        "orbit_inclination_degs",
+    ]
+}
+planet_consts["inferior"] = np.isin(PLANET_NAMES, ["MERCURY", "VENUS"])
+
+_JUPITER = PLANET_NAMES.index("JUPITER")
+_SATURN = PLANET_NAMES.index("SATURN")
+
+
+def get_helio_velocity(net_corr_mins, ma_degs, e):
+    """
+    Return the heliocentric velocity in degrees
+    """
+    ma = ma_degs * cn.rads_per_degree
+    vel_mins = net_corr_mins * (
+        1.0
+        - 2.0 * e * np.cos(ma)
+        + 5.0 * e * e * np.cos(2.0 * ma) / 2.0
+        - (e * e * e / 4.0) * (13.0 * np.cos(3.0 * ma) - np.cos(ma))
+    )
+    return vel_mins / 60.0
+
+
+def get_node_position_degs(epoch_node_degs, node_vel, years_elapsed):
+    """
+    Return the current node position of a planet in degrees
+    """
+    node_motion_secs = np.abs((node_vel * years_elapsed) + 0.5)
+    node_motion_degs = node_motion_secs / 3600.0
+    return find_diff_degs(epoch_node_degs, node_motion_degs)
+
+
+def get_longitude_along_ecliptic(cur_node_degs, tlpd, inclination_rads):
+    angle_node_planet_degs = find_diff_degs(tlpd, cur_node_degs)
+    anp_rads = angle_node_planet_degs * cn.rads_per_degree
+    dis_rads = np.arctan(np.cos(inclination_rads) * np.tan(anp_rads))
+    dis_degs = dis_rads * cn.degs_per_radian
+    dis_degs = get_near_value(angle_node_planet_degs, dis_degs)
+    long_along_ecliptic_degs = np.mod(cur_node_degs + dis_degs, cn.full_circle)
+    return angle_node_planet_degs, long_along_ecliptic_degs
+
+
+def get_geo_longitude(
+    true_long_planet_degs,
+    hvel_degs,
+    inc_rads,
+    node_planet_rads,
+    rad_vec,
+    inferior,
+    rad_vec_sun,
+    true_long_sun_degs,
+    hvel_sun_degs,
+):
+    """
+    Return geocentric velocity, longitude and latitude (arrays); inferior is
+    a boolean mask selecting the inferior-planet branch
+    """
+    pm_rads = np.arcsin(np.sin(inc_rads) * np.sin(node_planet_rads))
+    sm = rad_vec * np.cos(pm_rads)
+    se = rad_vec_sun  # Earth with respect to Sun
+    gama_se_degs = np.mod(true_long_sun_degs + 180, cn.full_circle)
+    gama_sm_degs = true_long_planet_degs
+
+    angle_mse_degs = find_diff_degs(gama_sm_degs, gama_se_degs)
+    angle_mse_rads = angle_mse_degs * cn.rads_per_degree
+    em = np.sqrt(sm * sm + se * se - 2.0 * sm * se * np.cos(angle_mse_rads))
+    # Crop the sine value within the limits of -1 and 1
+    sine_value = np.clip((se / em) * np.sin(angle_mse_rads), -1, 1)
+    angle_sme_degs = np.arcsin(sine_value) * cn.degs_per_radian
+
+    # Superior Planet (Outside earth orbit)
+    superior_degs = np.where(
+        angle_sme_degs > 90.0, find_diff_degs(180, angle_sme_degs), angle_sme_degs
+    )
+
+    # Inferior Planet; the arcsin argument is only meaningful on these rows
+    tangle_mse_degs = np.where(
+        angle_mse_degs > 180.0, find_diff_degs(360, angle_mse_degs), angle_mse_degs
+    )
+    tangle_mse_rads = tangle_mse_degs * cn.rads_per_degree
+    with np.errstate(invalid="ignore"):
+        angle_mes_rads = np.arcsin(sm * np.sin(tangle_mse_rads) / em)
+    angle_mes_degs = angle_mes_rads * cn.degs_per_radian
+    tangle_mse_degs = (
+        np.abs(tangle_mse_degs) + np.abs(angle_sme_degs) + np.abs(angle_mes_degs)
+    )
+    inferior_degs = np.where(
+        np.abs(tangle_mse_degs - 180) > 2,
+        np.where(
+            angle_sme_degs > 0,
+            find_diff_degs(180, angle_sme_degs),
+            find_diff_degs(-180, angle_sme_degs),
+        ),
+        angle_sme_degs,
+    )
+
+    angle_sme_degs = np.where(inferior, inferior_degs, superior_degs)
+    angle_sme_rads = angle_sme_degs * cn.rads_per_degree
+    true_long_planet_degs = np.mod(true_long_planet_degs + angle_sme_degs, cn.full_circle)
+
+    sine_value = np.sin(inc_rads) * np.sin(node_planet_rads)
+    planet_lat_rads = np.arctan((rad_vec / em) * np.sin(sine_value))
+    planet_lat_degs = planet_lat_rads * cn.degs_per_radian
+
+    vel_diff_degs = hvel_degs - hvel_sun_degs  # raw difference (can be negative)
+    geo_vel_adder = (
+        (
+            (se / em) * (np.cos(angle_mse_rads) / np.cos(angle_sme_rads))
+            - (sm * se / (em * em * em))
+            * ((np.sin(angle_mse_rads)) ** 2)
+            / np.cos(angle_sme_rads)
+        )
+        * vel_diff_degs
+        * (1 / 1.1)
+    )
+    geo_vel_degs = hvel_degs + geo_vel_adder  # can be negative for retrograde
+    return geo_vel_degs, true_long_planet_degs, planet_lat_degs
+
+
+def jupiter_adjustment(ist_days):
+    """
+    Return the correction (degrees) to the mean longitude of Jupiter
+    """
+    t = get_years_elapsed(ist_days, cn.jupiter_base_in_days)
+    h = 18.129 * (t - 241.75) - (41 + (11 / 60.0))
+    sj = 0.4074926
+
+    t_rad = t * cn.rads_per_degree
+    h_rad = h * cn.rads_per_degree
+
+    adj_min = (
+        20.8 * np.sin(t_rad * sj)
+        - 1.3783 * np.sin(h_rad)
+        + 3.4050 * np.sin(2.0 * h_rad)
+        + 0.2830 * np.sin(3.0 * h_rad)
+    )
+    return adj_min / 60.0
+
+
+def saturn_adjustment(ist_days):
+    """
+    Return the correction (degrees) to the mean longitude of Saturn
+    """
+    t = get_years_elapsed(ist_days, cn.saturn_base_in_days)
+    x1 = 168.48 - 5.8945 * t
+    x2 = 243.15 - 11.794 * t
+    sj = 0.4074926
+
+    x1_rad = x1 * cn.rads_per_degree
+    x2_rad = x2 * cn.rads_per_degree
+    sj_rad = sj * cn.rads_per_degree
+
+    adj_min = (
+        -48.7 * np.sin(t * sj_rad) + 7.0 * np.sin(x1_rad) + 10.85 * np.sin(x2_rad)
+    )
+    return adj_min / 60.0
+
+
+def get_planet_grid(sun_params, names=PLANET_NAMES):
+    """
+    Return dictionary of planet parameters, each an array of shape
+    (planets,) + chart shape, rows in the order of names (by default all
+    seven, in PLANET_NAMES order).
+    Mirrors functions.get_planet_params for the planets at once.
+    """
+    time_params = sun_params["time"]
+    ist_days = time_params["ist_days"]
+    years_elapsed = time_params["y_epoch"]
+    epoch_days = time_params["local_days"]
+    sun_net_corr = sun_params["net_corr"]
+
+    # Planet constants as a column, broadcast against the chart axes
+    rows = [PLANET_NAMES.index(name) for name in names]
+    column = (len(rows),) + (1,) * np.ndim(epoch_days)
+    pc = {key: value[rows].reshape(column) for key, value in planet_consts.items()}
+    eccentricity = pc["eccentricity"]
+    daily_motion = pc["nc"]
+
+    mean_long_degs = get_mean_longitude(
+        epoch_days, pc["rev_days"], pc["mean_long_at_epoch"]
+    )
+    if _JUPITER in rows:
+        mean_long_degs[rows.index(_JUPITER)] += jupiter_adjustment(ist_days)
+    if _SATURN in rows:
+        mean_long_degs[rows.index(_SATURN)] += saturn_adjustment(ist_days)
+    mean_long_degs = add_correction(mean_long_degs, daily_motion, sun_net_corr)
+
+    apse_position_degs = get_apse_position_degs(
+        pc["mean_apse_at_epoch"], pc["apse_motion"], years_elapsed
+    )
+    mean_anomaly_degs = find_diff_degs(apse_position_degs, mean_long_degs)
+    mandaphalam_secs = get_equation_of_centre(eccentricity, mean_anomaly_degs)
+    true_long_degs = get_true_longitude(mean_long_degs, mandaphalam_secs)
+    hvel_degs = get_helio_velocity(daily_motion, mean_anomaly_degs, eccentricity)
+    radius_vec = get_radius_vector(
+        apse_position_degs, true_long_degs, eccentricity, pc["length_semi_major_axis"]
+    )
+    inc_rads = pc["orbit_inclination_degs"] * cn.rads_per_degree
+    cur_node_degs = get_node_position_degs(
+        pc["mean_node_at_epoch"], pc["node_motion"], years_elapsed
+    )
+    planet_node_degs, true_long_degs = get_longitude_along_ecliptic(
+        cur_node_degs, true_long_degs, inc_rads
+    )
+    planet_node_rads = planet_node_degs * cn.rads_per_degree
+    helio_long_degs = true_long_degs  # save before geocentric conversion
+
+    geo_vel_degs, true_long_degs, planet_lat_degs = get_geo_longitude(
+        true_long_degs,
+        hvel_degs,
+        inc_rads,
+        planet_node_rads,
+        radius_vec,
+        pc["inferior"],
+        sun_params["rad"],
+        sun_params["true_long"],
+        sun_params["hvel"],
+    )
+
+    shape = np.shape(true_long_degs)
+    planet_grid = dict()
+    planet_grid["mean_long"] = mean_long_degs
+    planet_grid["apse"] = np.broadcast_to(apse_position_degs, shape)
+    planet_grid["anom"] = mean_anomaly_degs
+    planet_grid["mand"] = mandaphalam_secs
+    planet_grid["hvel"] = hvel_degs
+    planet_grid["rad"] = radius_vec
+    planet_grid["node"] = planet_node_degs
+    planet_grid["gvel"] = geo_vel_degs
+    planet_grid["helio_long"] = helio_long_degs
+    planet_grid["true_long"] = true_long_degs
+    planet_grid["lat"] = planet_lat_degs
+
+    return planet_grid
+
+
+def get_seven_planets(sun_params, moon_params=None):
+    """
+    Return dictionary (by planet name) of planet parameters (arrays), as in
+    functions.get_seven_planets; each entry is a row of get_planet_grid
+    """
+    planet_grid = get_planet_grid(sun_params)
+
+    seven_planets = dict()
+    for idx, name in enumerate(PLANET_NAMES):
+        planet_params = {key: value[idx] for key, value in planet_grid.items()}
+        planet_params["name"] = name
+        seven_planets[name] = planet_params
+
+    return seven_planets
+
+
+# ---------------------------------------------------------------------------
+# Lagna and house cusps
+# ---------------------------------------------------------------------------
+
+
+def get_local_time_correction(local_days):
+    """
+    Return Local Time Correction in degrees
+    Input: Local Time (days since Epoch Sun Rise)
+    """
+    day_fraction = np.mod(local_days + cn.epoch_sun_rise_in_days, 1.0)
+    time_diff_sec = np.round((day_fraction - 0.5) * cn.seconds_in_day, 3)
+
+    t1_time_seconds = np.abs(np.floor(time_diff_sec))
+    # 1 second adjustment for every 6 minute movement
+    t1_adj_seconds = np.floor_divide(t1_time_seconds, 360.0)
+    t1_total_seconds = t1_time_seconds + t1_adj_seconds
+
+    lt_corr_degs = (t1_total_seconds / cn.seconds_in_day) * cn.full_circle
+    return np.where(time_diff_sec <= 0, -lt_corr_degs, lt_corr_degs)
+
+
+def get_ramc(mean_long_sun_degs, precsn_birth_degs, lt_corr_degs, south_hemi):
+    """
+    Return RAMC in degrees; south_hemi is a boolean mask
+    """
+    # As in functions.get_ramc, the longitude enters only through lt_corr_degs
+    tl_sun = np.mod(mean_long_sun_degs + precsn_birth_degs, cn.full_circle)
+    ramc_degs = np.mod(tl_sun + lt_corr_degs, cn.full_circle)
+    return np.where(south_hemi, np.mod(ramc_degs + 180, cn.full_circle), ramc_degs)
+
+
+def _nearest_diff_degs(deg1, deg2):
+    """
+    Return the unsigned angular distance between deg1 and deg2 (0-180)
+    """
+    general_diff = find_diff_degs(deg1, deg2)
+    return np.where(
+        general_diff < 180, general_diff, find_diff_degs(cn.full_circle, general_diff)
+    )
+
+
+def _flip_south(degs, south_hemi):
+    return np.where(south_hemi, np.mod(degs + 180, cn.full_circle), degs)
+
+
+def get_ascendant(ramc_degs, latitude_degs, precsn_birth_degs, south_hemi):
+    """
+    Return Nirayana Lagnam in degrees
+    """
+    ramc_rads = ramc_degs * cn.rads_per_degree
+    latitude_rads = latitude_degs * cn.rads_per_degree
+    omega_rads = cn.omega_rads
+
+    with np.errstate(divide="ignore"):
+        gaman_rads = np.arctan(
+            ((np.tan(latitude_rads) * np.sin(omega_rads)) / np.cos(ramc_rads))
+            + np.cos(omega_rads) * np.tan(ramc_rads)
+        )
+    gaman_degs = gaman_rads * cn.degs_per_radian
+    nearest_diff = _nearest_diff_degs(gaman_degs, ramc_degs)
+    gaman_degs = np.where(
+        nearest_diff > 90, np.mod(gaman_degs + 180, cn.full_circle), gaman_degs
+    )
+    gaman_degs = np.mod(gaman_degs + 90, cn.full_circle)
+    gaman_degs = _flip_south(gaman_degs, south_hemi)
+
+    return find_diff_degs(gaman_degs, precsn_birth_degs)
+
+
+def get_culm_point(ramc_degs, latitude_degs, precsn_birth_degs, south_hemi):
+    """
+    Return Nirayana Dhasa in degrees
+    """
+    ramc_rads = ramc_degs * cn.rads_per_degree
+    hlong_rads = np.arctan(np.tan(ramc_rads) / np.cos(cn.omega_rads))
+    hlong_degs = hlong_rads * cn.degs_per_radian
+
+    nearest_diff = _nearest_diff_degs(ramc_degs, hlong_degs)
+    hlong_degs = np.where(
+        nearest_diff > 90, np.mod(hlong_degs + 180, cn.full_circle), hlong_degs
+    )
+    hlong_degs = _flip_south(hlong_degs, south_hemi)
+
+    return find_diff_degs(hlong_degs, precsn_birth_degs)
+
+
+def calculate_house(
+    sine_value, ramc_degs, ramc_adder, pole_id, precsn_birth_degs, south_hemi
+):
+    """
+    Return House Position in degrees (NaN where sine_value > 1)
+    """
+    omega_rads = cn.omega_rads
+    with np.errstate(invalid="ignore"):
+        pole_rads = np.arcsin(sine_value)
+    oblasc_degs = np.mod(ramc_degs + ramc_adder, cn.full_circle)
+    pole_elev_rads = np.arctan(
+        (1.0 / np.tan(omega_rads)) * np.sin(pole_id * pole_rads / 3.0)
+    )
+
+    oblasc_sub90_degs = find_diff_degs(oblasc_degs, 90)
+    oblasc_sub90_rads = oblasc_sub90_degs * cn.rads_per_degree
+    with np.errstate(divide="ignore"):
+        hlong_rads = np.arctan(
+            -1.0
+            / (
+                (
+                    np.tan(pole_elev_rads)
+                    * np.sin(omega_rads)
+                    / np.cos(oblasc_sub90_rads)
+                )
+                + (np.tan(oblasc_sub90_rads) * np.cos(omega_rads))
+            )
+        )
+    hlong_degs = hlong_rads * cn.degs_per_radian
+
+    nearest_diff = _nearest_diff_degs(oblasc_degs, hlong_degs)
+    hlong_degs = np.where(
+        nearest_diff > 67, np.mod(hlong_degs + 180, cn.full_circle), hlong_degs
+    )
+    hlong_degs = _flip_south(hlong_degs, south_hemi)
+
+    return find_diff_degs(hlong_degs, precsn_birth_degs)
+
+
+def get_house_positions(
+    nirayana_lagn,
+    nirayana_dhasa,
+    latitude_degs,
+    ramc_degs,
+    precsn_birth_degs,
+    south_hemi,
+):
+    """
+    Return the 12 house positions as an array of shape (12,) + chart shape
+    """
+    shape = np.broadcast_shapes(
+        np.shape(nirayana_lagn),
+        np.shape(nirayana_dhasa),
+        np.shape(latitude_degs),
+        np.shape(ramc_degs),
+        np.shape(precsn_birth_degs),
+        np.shape(south_hemi),
+    )
+    house_positions = np.zeros((12,) + shape)
+    house_positions[0] = nirayana_lagn
+    house_positions[9] = nirayana_dhasa
+
+    latitude_rads = latitude_degs * cn.rads_per_degree
+    sine_value = np.tan(latitude_rads) * np.tan(cn.omega_rads)
+
+    # High latitudes (sine_value > 1): trisect between lagna and dhasa
+    nirayana_diff = find_diff_degs(nirayana_lagn, nirayana_dhasa)
+    adder_for_h10h11 = nirayana_diff / 3.0
+    tri_h10 = np.mod(house_positions[9] + adder_for_h10h11, cn.full_circle)
+    tri_h11 = np.mod(tri_h10 + adder_for_h10h11, cn.full_circle)
+    adder_for_h1h2 = find_diff_degs(60, adder_for_h10h11)
+    tri_h1 = np.mod(house_positions[0] + adder_for_h1h2, cn.full_circle)
+    tri_h2 = np.mod(tri_h1 + adder_for_h1h2, cn.full_circle)
+
+    trisect = sine_value > 1
+    for idx, tri_degs, ramc_adder, pole_id in [
+        (10, tri_h10, 30, 1),
+        (11, tri_h11, 60, 2),
+        (1, tri_h1, 120, 2),
+        (2, tri_h2, 150, 1),
+    ]:
+        house_degs = calculate_house(
+            sine_value, ramc_degs, ramc_adder, pole_id, precsn_birth_degs, south_hemi
+        )
+        house_positions[idx] = np.where(trisect, tri_degs, house_degs)
+
+    # House Positions of 3-8 are 180 degrees from those of 9-11 and 0-2
+    for i in range(3, 9):
+        house_positions[i] = np.mod(house_positions[(i + 6) % 12] + 180, cn.full_circle)
+
+    return house_positions
+
+
+def get_house_cusps(ramc_degs, latitude_degs, precsn_birth_degs, south_hemi):
+    """
+    Return dictionary with lagna, dhasa (culmination point) and the 12 house
+    positions, for arrays of RAMC, latitude, precession and hemisphere
+    """
+    lagn_degs = get_ascendant(ramc_degs, latitude_degs, precsn_birth_degs, south_hemi)
+    dhasa_degs = get_culm_point(ramc_degs, latitude_degs, precsn_birth_degs, south_hemi)
+
+    house_cusps = dict()
+    house_cusps["lagn"] = lagn_degs
+    house_cusps["dhasa"] = dhasa_degs
+    house_cusps["houses"] = get_house_positions(
+        lagn_degs, dhasa_degs, latitude_degs, ramc_degs, precsn_birth_degs, south_hemi
+    )
+    return house_cusps
+
+
+def _bhava_midpoint(f1, f2):
+    """
+    Return the midpoint of two adjacent house cusps, as in
+    functions.get_bhava_positions
+    """
+    across = np.abs(np.trunc(f1 - f2)) > 90
+    mid = f1 + ((360 - f1) + f2) / 2.0
+    mid = np.where(mid > 360, mid - 360, mid)
+    return np.where(across, mid, (f1 + f2) / 2.0)
+
+
+def get_bhava_positions(house_positions, planet_positions):
+    """
+    Return the bhava of each of the 12 planets (array of shape (12,) +
+    chart shape), and the lower and upper bhava boundaries.
+    Mirrors functions.get_bhava_positions.
+    """
+    house_positions = np.asarray(house_positions, dtype=float)
+    planet_positions = np.asarray(planet_positions, dtype=float)
+    house1_degs = _bhava_midpoint(house_positions, np.roll(house_positions, 1, axis=0))
+    house2_degs = _bhava_midpoint(house_positions, np.roll(house_positions, -1, axis=0))
+
+    lagn_sign = np.floor_divide(planet_positions[0], 30).astype(int)
+    bhava_positions = np.full(planet_positions.shape, -1)
+    for j in range(12):
+        h1 = house1_degs[j]
+        h2 = house2_degs[j]
+        inside = np.where(
+            h2 < h1,
+            ((planet_positions >= h1) & (planet_positions < 360.0))
+            | ((planet_positions >= 0.0) & (planet_positions < h2)),
+            (planet_positions >= h1) & (planet_positions < h2),
+        )
+        # The first bhava (in house order) that holds the planet
+        bhava_positions = np.where(
+            inside & (bhava_positions == -1), (j + lagn_sign) % 12, bhava_positions
+        )
+    bhava_positions = np.where(bhava_positions == -1, 0, bhava_positions)
+    return bhava_positions, house1_degs, house2_degs
+
+
+def get_lagn_params(input_cols, sun_params, asc_table=None):
+    """
+    Return dictionary with RAMC and Lagna (arrays) in degrees.
+    Mirrors functions.get_lagn_params.  Given the precomputed ascendant
+    table (asc_table.get_asc_table), the lagna is looked up in it.
+    """
+    cols = get_input_arrays(input_cols)
+
+    lt_corr_degs = get_local_time_correction(sun_params["d_epoch"])
+    ramc_degs = get_ramc(
+        sun_params["mean_long"], sun_params["prec"], lt_corr_degs, cols["south"]
+    )
+    if asc_table is not None:
+        import asc_table as at  # asc_table builds its table with this module
+
+        lagn_degs = at.get_ascendant(
+            ramc_degs, cols["lat_degs"], sun_params["prec"], cols["south"], asc_table
+        )
+    else:
+        lagn_degs = get_ascendant(
+            ramc_degs, cols["lat_degs"], sun_params["prec"], cols["south"]
+        )
+
+    lagn_params = dict()
+    lagn_params["ramc"] = ramc_degs
+    lagn_params["lagn"] = lagn_degs
+
+    return lagn_params
@@ -0,0 +1,326 @@
+"""
+birth_input.py — The birth details of a chart, validated once.
+
+A BirthInput holds the name, place name, birth date and time, time zone
+and the coordinates of the place, with signed decimal degrees (north and
+east positive) and the directions as enums.  It is immutable and checks
+its fields when made, however it is made.  Its identity is the instant and
+the place, which is all the chart depends on: two that differ only in the
+name or the place name are equal, hash alike and have the same
+get_input_key, a key that is the same in every process, for caches kept on
+disk or shared between workers.
+
+It is also a read-only mapping with the keys of input_params ("in_datetime",
+"diff_from_gst_in_sec", "lat_degs", "lat_dirn", "long_degs", "long_dirn",
+"name", "birthplace"), the degrees unsigned and the directions as the
+letters "N"/"S" and "E"/"W", so it goes through every function that takes
+input_params as it is, and it equals a mapping with the same values for
+those keys (dict(birth) among them).  Its west and south flags are the
+directions as booleans, which the chart functions read (functions.get_west
+and get_south) instead of the letters.  make_birth_input builds one from
+input_params, rejecting directions, coordinates and time zones that are
+not valid.  The input file (astro.read_data_file), the web app and the
+command line tools (add_place_arguments, get_birth_input) go through it; a
+tool that takes a clock but no place reads its signed offset from GMT with
+add_time_zone_argument and get_gst_offset_secs.  The functions further
+down also take a plain input_params dict, which they read as it is,
+unchecked.
+"""
+
+import dataclasses
+import datetime as dt
+import enum
+import hashlib
+import math
+from collections.abc import Mapping
+
+import constants as cn
+
+# Largest time zone offset from GMT (seconds)
+MAX_GST_OFFSET_SECS = 14 * 3600
+
+
+class LatDirn(enum.Enum):
+    NORTH = "N"
+    SOUTH = "S"
+
+
+class LongDirn(enum.Enum):
+    EAST = "E"
+    WEST = "W"
+
+
+_DIRN_NAMES = {
+    "N": LatDirn.NORTH,
+    "NORTH": LatDirn.NORTH,
+    "S": LatDirn.SOUTH,
+    "SOUTH": LatDirn.SOUTH,
+    "E": LongDirn.EAST,
+    "EAST": LongDirn.EAST,
+    "W": LongDirn.WEST,
+    "WEST": LongDirn.WEST,
+}
+
+# The input_params keys the chart depends on, the identity of a BirthInput
+_IDENTITY_KEYS = (
+    "in_datetime", "diff_from_gst_in_sec", "lat_degs", "lat_dirn", "long_degs", "long_dirn",
+)
+
+
+def _get_signed_degs(degs, limit, label):
+    """
+    Return the signed degrees as a float (no negative zero), ValueError if
+    not a number within -limit and limit
+    """
+    if isinstance(degs, bool) or not isinstance(degs, (int, float)):
+        raise ValueError(f"{label} must be a number of degrees: {degs!r}")
+    degs = float(degs) + 0.0
+    if not math.isfinite(degs) or not -limit <= degs <= limit:
+        raise ValueError(f"{label} must be within -{limit:g} and {limit:g} degrees: {degs!r}")
+    return degs
+
+
+@dataclasses.dataclass(frozen=True, eq=False)
+class BirthInput(Mapping):
+    """
+    Birth details: gst_offset_secs is the offset from GMT the time is
+    converted to IST with (diff_from_gst_in_sec, its E/W sign applied), lat
+    and long are signed degrees (north and east positive); west and south
+    follow from them.  ValueError for a field that is not valid.
+    """
+
+    __slots__ = (
+        "name", "birthplace", "in_datetime", "gst_offset_secs", "lat", "long",
+        "west", "south", "_params",
+    )
+
+    name: str
+    birthplace: str
+    in_datetime: dt.datetime
+    gst_offset_secs: int
+    lat: float
+    long: float
+
+    def __post_init__(self):
+        for label in ("name", "birthplace"):
+            if not isinstance(getattr(self, label), str):
+                raise ValueError(f"{label} must be a string: {getattr(self, label)!r}")
+        in_datetime = self.in_datetime
+        if not isinstance(in_datetime, dt.datetime) or in_datetime.tzinfo is not None:
+            raise ValueError(f"in_datetime must be a naive datetime: {in_datetime!r}")
+        gst_offset_secs = self.gst_offset_secs
+        if isinstance(gst_offset_secs, bool) or not isinstance(gst_offset_secs, int):
+            raise ValueError(f"Time zone must be whole seconds: {gst_offset_secs!r}")
+        if abs(gst_offset_secs) > MAX_GST_OFFSET_SECS:
+            raise ValueError(f"Time zone beyond 14 hours from GMT: {gst_offset_secs!r}")
+        object.__setattr__(self, "lat", _get_signed_degs(self.lat, 90.0, "Latitude"))
+        object.__setattr__(self, "long", _get_signed_degs(self.long, 180.0, "Longitude"))
+        object.__setattr__(self, "west", self.long < 0)
+        object.__setattr__(self, "south", self.lat < 0)
+
+        # The input_params view, made once: the pipeline reads its keys on
+        # every evaluation.  The offset there has its E/W sign undone (see
+        # functions.get_ist_offset_days).
+        diff_from_gst_in_sec = self.gst_offset_secs
+        if self.west:
+            diff_from_gst_in_sec = -diff_from_gst_in_sec
+        params = {
+            "name": self.name,
+            "birthplace": self.birthplace,
+            "in_datetime": self.in_datetime,
+            "diff_from_gst_in_sec": diff_from_gst_in_sec,
+            "lat_degs": abs(self.lat),
+            "lat_dirn": self.lat_dirn.value,
+            "long_degs": abs(self.long),
+            "long_dirn": self.long_dirn.value,
+        }
+        object.__setattr__(self, "_params", params)
+
+    @property
+    def lat_dirn(self):
+        return LatDirn.SOUTH if self.south else LatDirn.NORTH
+
+    @property
+    def long_dirn(self):
+        return LongDirn.WEST if self.west else LongDirn.EAST
+
+    def __getitem__(self, key):
+        return self._params[key]
+
+    def __iter__(self):
+        return iter(self._params)
+
+    def __len__(self):
+        return len(self._params)
+
+    def _get_identity(self):
+        return (self.in_datetime, self.gst_offset_secs, self.lat, self.long)
+
+    def __eq__(self, other):
+        if isinstance(other, BirthInput):
+            return self._get_identity() == other._get_identity()
+        if isinstance(other, Mapping):
+            return all(
+                key in other and other[key] == self._params[key] for key in _IDENTITY_KEYS
+            )
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self._get_identity())
+
+    def __reduce__(self):
+        # Pickled by its fields: the default would set the slots one by one,
+        # which a frozen instance refuses
+        fields = dataclasses.fields(self)
+        return (BirthInput, tuple(getattr(self, field.name) for field in fields))
+
+
+def get_dirn(dirn, dirn_type):
+    """
+    Return the direction (LatDirn or LongDirn, as dirn_type) given as a
+    letter or a word in any case; ValueError if it is not one
+    """
+    if isinstance(dirn, dirn_type):
+        return dirn
+    value = _DIRN_NAMES.get(str(dirn).strip().upper())
+    if not isinstance(value, dirn_type):
+        raise ValueError(f"Not a {dirn_type.__name__} direction: {dirn!r}")
+    return value
+
+
+def _get_degs(degs, limit, label):
+    """
+    Return the degrees as a float, ValueError if not within 0 and limit
+    """
+    degs = float(degs)
+    if not math.isfinite(degs) or not 0.0 <= degs <= limit:
+        raise ValueError(f"{label} must be within 0 and {limit:g} degrees: {degs!r}")
+    return degs
+
+
+def make_birth_input(input_params):
+    """
+    Return the BirthInput of input_params (dict, or a BirthInput), with
+    ValueError for a direction, coordinate, time zone or date that is not
+    valid
+    """
+    if isinstance(input_params, BirthInput):
+        return input_params
+
+    lat_degs = _get_degs(input_params["lat_degs"], 90.0, "Latitude")
+    long_degs = _get_degs(input_params["long_degs"], 180.0, "Longitude")
+    lat_dirn = get_dirn(input_params["lat_dirn"], LatDirn)
+    long_dirn = get_dirn(input_params["long_dirn"], LongDirn)
+
+    diff_from_gst_in_sec = input_params["diff_from_gst_in_sec"]
+    if int(diff_from_gst_in_sec) != diff_from_gst_in_sec:
+        raise ValueError(f"Time zone must be whole seconds: {diff_from_gst_in_sec!r}")
+    gst_offset_secs = int(diff_from_gst_in_sec)
+    if long_dirn is LongDirn.WEST:
+        gst_offset_secs = -gst_offset_secs
+
+    # A place on the equator or the meridian is taken as north or east; the
+    # offset keeps the sign it is applied with
+    lat = -lat_degs if lat_dirn is LatDirn.SOUTH and lat_degs > 0 else lat_degs
+    long = -long_degs if long_dirn is LongDirn.WEST and long_degs > 0 else long_degs
+
+    return BirthInput(
+        name=str(input_params.get("name", "")),
+        birthplace=str(input_params.get("birthplace", "")),
+        in_datetime=input_params["in_datetime"],
+        gst_offset_secs=gst_offset_secs,
+        lat=lat,
+        long=long,
+    )
+
+
+def get_input_key(birth):
+    """
+    Return the key (hex string) of the instant and place of a BirthInput,
+    the same in every process and run: BirthInputs that are equal have the
+    same key.  The name and place name, which the chart does not depend on,
+    are not part of it.
+    """
+    text = "|".join(
+        [
+            birth.in_datetime.isoformat(),
+            str(birth.gst_offset_secs),
+            repr(float(birth.lat)),
+            repr(float(birth.long)),
+        ]
+    )
+    return hashlib.sha1(text.encode("ascii")).hexdigest()
+
+
+def add_place_arguments(parser, time_zone=True):
+    """
+    Add the options of a place to an argparse parser: latitude and
+    longitude with their directions and, with time_zone, the offset of its
+    clock from GMT
+    """
+    parser.add_argument("--lat", type=float, required=True, help="latitude degrees")
+    parser.add_argument("--lat-dirn", default="N", help="N or S")
+    parser.add_argument("--long", type=float, required=True, help="longitude degrees")
+    parser.add_argument("--long-dirn", default="E", help="E or W")
+    if time_zone:
+        parser.add_argument("--tz-hours", type=int, default=5, help="hours from GMT")
+        parser.add_argument("--tz-minutes", type=int, default=30, help="minutes from GMT")
+
+
+def add_time_zone_argument(parser):
+    """
+    Add the option of a clock's offset from GMT alone, signed (west
+    negative), to an argparse parser, for tools that take no place
+    """
+    parser.add_argument(
+        "--tz", default="+05:30", help="offset from GMT, +HH:MM or -HH:MM (as --tz=-HH:MM)"
+    )
+
+
+def get_gst_offset_secs(parser, args):
+    """
+    Return the signed offset from GMT (seconds) of the time zone option (see
+    add_time_zone_argument) parsed by parser; a usage error from the parser
+    if it is not +HH:MM or -HH:MM within 14 hours of GMT
+    """
+    text = args.tz.strip()
+    sign = -1 if text[:1] == "-" else 1
+    if text[:1] in ("+", "-"):
+        text = text[1:]
+    hours, sep, minutes = text.partition(":")
+    if not (sep and hours.isdigit() and minutes.isdigit() and int(minutes) < 60):
+        parser.error(f"Time zone must be +HH:MM or -HH:MM: {args.tz!r}")
+    gst_offset_secs = sign * (int(hours) * 3600 + int(minutes) * 60)
+    if abs(gst_offset_secs) > MAX_GST_OFFSET_SECS:
+        parser.error(f"Time zone beyond 14 hours from GMT: {args.tz!r}")
+    return gst_offset_secs
+
+
+def get_birth_input(parser, args, in_datetime, name="", birthplace=""):
+    """
+    Return the BirthInput of the place options (see add_place_arguments)
+    parsed by parser, at in_datetime; a usage error from the parser if they
+    are not valid.  Without the time zone options the clock is IST.
+    """
+    try:
+        if hasattr(args, "tz_hours"):
+            # Same sign convention as the input file (see astro.read_data_file)
+            diff_from_gst_in_sec = args.tz_hours * 3600 + args.tz_minutes * 60
+            if get_dirn(args.long_dirn, LongDirn) is LongDirn.WEST:
+                diff_from_gst_in_sec = -diff_from_gst_in_sec
+        else:
+            diff_from_gst_in_sec = cn.ist_offset_in_sec
+        return make_birth_input(
+            {
+                "name": name,
+                "birthplace": birthplace,
+                "in_datetime": in_datetime,
+                "diff_from_gst_in_sec": diff_from_gst_in_sec,
+                "lat_degs": args.lat,
+                "lat_dirn": args.lat_dirn,
+                "long_degs": args.long,
+                "long_dirn": args.long_dirn,
+            }
+        )
+    except ValueError as err:
+        parser.error(str(err))
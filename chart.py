@@ -0,0 +1,414 @@
+"""
+chart.py — The full horoscope computation, in two stages.
+
+  compute_moment(input_params)         location-independent terms
+  compute_place(moment, input_params)  everything that depends on the place
+  compute(input_params)                both stages, for a single chart
+
+The moment stage reads only the instant (in_datetime and
+diff_from_gst_in_sec, with its E/W sign), so its result can be computed once
+and reused for every place that shares that instant, each given with the
+time on its own clock.
+
+Contract — what the moment holds, i.e. what is invariant to location:
+  - the instant on the IST meridian: IST days and years since Epoch
+  - precession (ayanamsa) and the apse position of the Sun
+  - the apse and node positions of the seven planets, and the Jupiter and
+    Saturn corrections to their mean longitudes
+
+Everything else depends on the place.  The civil date and time are those
+of the place's own input, and so are the weekday and the Saka and Kali
+dates: the same instant is often another date elsewhere.  The longitudes of
+the Sun, Moon, Rahu/Ketu and the planets depend on the place too: the Surya
+Siddhanta model computes them for the local mean time and then corrects
+them by the net correction, which depends on the latitude (through charam)
+as well as the longitude.  Lagna, houses, sunrise/sunset, the Tamil date,
+thithi/yogam/karanam, dasa and shadbala follow from those.
+
+compute_place(compute_moment(p), p) is identical to a chart computed without
+the split.
+
+The place stage takes an optional cache (a dict, kept by the caller across
+charts, as prashna.py does): the parts of a chart that depend only on a
+few discrete inputs are then looked up by those inputs rather than
+recomputed.  They are the Saka date, Kali year and weekday (the date), the
+Tamil date (the date and the part of the day, see _tamil_date), the
+ashtavarga (the signs of the bodies), the mutual disposition (their signs
+and navamsas) and the Saptha Vargaja Bala (see
+shadbala.saptha_vargaja_key).  The chart is the same either way; the cached parts
+are shared by the charts that use them, so they must not be modified.
+"""
+
+import datetime as dt
+import functools
+
+import constants as cn
+import functions as fn
+import shadbala as sb
+from constants import (
+    DASA_LORDS,
+    DASA_YEARS,
+    KARANAM,
+    NAKSHATRA,
+    SAKA_MONTH,
+    TAMIL_MONTH,
+    TAMIL_YEAR,
+    THITHI,
+    WDAYS,
+    YOGAM,
+)
+
+PLANET_NAMES_ORDER = [
+    "LAGN", "SUN", "MOON", "MARS", "MERCURY", "JUPITER",
+    "VENUS", "SATURN", "URANUS", "NEPTUNE", "RAHU", "KETU",
+]
+
+
+# ── Helpers ──────────────────────────────────────────────────────────────────
+
+
+def _nakshatra_pada(degs):
+    nak = min(int(degs / (360.0 / 27)), 26)
+    rem = degs - nak * (360.0 / 27)
+    pada = int(rem / (360.0 / 108)) + 1
+    return nak, pada
+
+
+def _dasa_balance(moon_degs):
+    """Return (lord_name, Y, M, D) for the Vimsottari dasa balance at birth."""
+    nak_width = 360.0 / 27
+    nak_idx = min(int(moon_degs / nak_width), 26)
+    frac_remaining = 1.0 - (moon_degs - nak_idx * nak_width) / nak_width
+    lord_idx = nak_idx % 9
+    bal_years = frac_remaining * DASA_YEARS[lord_idx]
+    y = int(bal_years)
+    m = int((bal_years - y) * 12)
+    d = round(((bal_years - y) * 12 - m) * 30)
+    return DASA_LORDS[lord_idx], y, m, d
+
+
+@functools.lru_cache(maxsize=None)
+def _dasa_offsets(lord_idx):
+    """
+    Return the dasas from the given lord, each with the end of its buktis as
+    an offset (timedelta) from the end of the balance: the running sum of
+    the bukti lengths, the same for every chart, and exact in timedeltas
+    """
+    offsets = []
+    current = dt.timedelta(0)
+    for d in range(9):
+        di = (lord_idx + d) % 9
+        buktis = []
+        for b in range(9):
+            bi = (di + b) % 9
+            current += dt.timedelta(
+                days=DASA_YEARS[di] * DASA_YEARS[bi] / 120.0 * 365.25
+            )
+            buktis.append((DASA_LORDS[bi], current))
+        offsets.append((DASA_LORDS[di], tuple(buktis)))
+    return tuple(offsets)
+
+
+def _format_date(d):
+    # As d.strftime("%Y-%m-%d"), which does not pad years before 1000 here,
+    # at a fraction of its cost
+    return d.date().isoformat() if d.year >= 1000 else d.strftime("%Y-%m-%d")
+
+
+def _full_dasa_table(moon_degs, birth_dt):
+    """Build full 120-year Vimsottari Dasa/Bukti table starting from birth."""
+    nak_width = 360.0 / 27
+    nak_idx = min(int(moon_degs / nak_width), 26)
+    frac_remaining = 1.0 - (moon_degs - nak_idx * nak_width) / nak_width
+    lord_idx = nak_idx % 9
+    start = birth_dt + dt.timedelta(
+        days=frac_remaining * DASA_YEARS[lord_idx] * 365.25
+    )
+    table = []
+    for dasa, buktis in _dasa_offsets(lord_idx):
+        buktis = [(bukti, _format_date(start + offset)) for bukti, offset in buktis]
+        table.append({"dasa": dasa, "buktis": buktis})
+    return table
+
+
+def _dt_to_hrs(d):
+    return d.hour + d.minute / 60.0 + d.second / 3600.0
+
+
+# Entries a cache keeps for each part before it is cleared
+_CACHE_SIZE = 1024
+
+
+def _cached(cache, part, key, func, *args):
+    """Return func(*args), from the cache (by part and key) if there is one."""
+    if cache is None:
+        return func(*args)
+    table = cache.setdefault(part, dict())
+    if key not in table:
+        if len(table) >= _CACHE_SIZE:
+            table.clear()
+        table[key] = func(*args)
+    return table[key]
+
+
+# The Tamil date (functions.calc_tamil_date) counts the days from the
+# Sankranti into the Sun's sign at the instant the search starts: the
+# instant itself, or 5 minutes after sunset during the day.  The Sankranti
+# is found on a minute grid anchored at that start, so it comes out up to a
+# minute late, and the count depends only on the date of the start, the
+# Sun's sign then, the part of the day (the day before sunrise is the day
+# before) and the date and side of sunset of the Sankranti found.  So the
+# Tamil date holds for every instant with the same date and part of the day
+# and the same start date and sign, unless the Sankranti is within this
+# margin (days) of a midnight or of that day's sunset.
+_TAMIL_MARGIN_DAYS = 2.0 / (24 * 60)
+# In the day the search starts this long (days) after sunset
+_TAMIL_AFTER_SET_DAYS = 300 / cn.seconds_in_day
+
+
+def _tamil_date(input_params, sun_params, cache):
+    """
+    Return the Tamil date of the chart, from the cache where it holds for
+    the whole of the part of the day (see above)
+    """
+    time_params = sun_params["time"]
+    if cache is None:
+        return fn.calc_tamil_date(input_params, time_params=time_params)
+
+    civil_days = time_params["civil_days"]
+    start_params = sun_params
+    if civil_days < sun_params["rise_days"]:
+        part_of_day = "night"
+    elif civil_days <= sun_params["set_days"]:
+        part_of_day = "day"
+        start_days = sun_params["set_days"] + _TAMIL_AFTER_SET_DAYS
+        start_time = fn.shift_time_params(time_params, start_days - civil_days)
+        start_params = fn.get_sun_core(input_params, start_time)
+    else:
+        part_of_day = "evening"
+    key = (
+        input_params["in_datetime"].date(),
+        part_of_day,
+        fn.get_midnight_days(start_params["time"]["civil_days"]),
+        int(start_params["true_long"] / cn.deg_in_house),
+        input_params["diff_from_gst_in_sec"],
+        input_params["lat_degs"],
+        input_params["lat_dirn"],
+        input_params["long_degs"],
+        input_params["long_dirn"],
+    )
+    table = cache.setdefault("tamil", dict())
+    if key in table:
+        return table[key]
+
+    details = dict()
+    tamil_date = fn.calc_tamil_date(
+        input_params, time_params=time_params, details=details
+    )
+    # Counted from the day before, the search started a day earlier
+    if details["previous"]:
+        return tamil_date
+    cross_days = details["cross_days"]
+    midnight_days = fn.get_midnight_days(cross_days)
+    margin_days = min(
+        cross_days - midnight_days,
+        midnight_days + 1.0 - cross_days,
+        abs(cross_days - details["cross_set_days"]),
+    )
+    if margin_days > _TAMIL_MARGIN_DAYS:
+        if len(table) >= _CACHE_SIZE:
+            table.clear()
+        table[key] = tamil_date
+    return tamil_date
+
+
+def _calendar_of_date(in_date):
+    """Return the Saka date, Kali year and weekday of a date."""
+    saka_day, saka_month, saka_year = fn.calc_saka_date(in_date)
+    kali_year = fn.get_kali_year(saka_year)
+    birth_day = (in_date.weekday() + 1) % 7
+    return (saka_day, saka_month, saka_year), kali_year, birth_day
+
+
+# ── Stages ───────────────────────────────────────────────────────────────────
+
+
+def compute_moment(input_params):
+    """Return the location-independent terms of a chart (see module doc)."""
+    return fn.get_moment_params(input_params)
+
+
+def compute_place(moment, input_params, cache=None):
+    """
+    Return the full chart (a single structured result dict), given the
+    moment (compute_moment) and the input params, whose instant must be the
+    one the moment was computed for (ValueError otherwise).
+    """
+    sun_params = fn.get_sun_params(input_params, moment_params=moment)
+    moon_params = fn.get_moon_params(input_params, sun_params)
+    lagn_params = fn.get_lagn_params(input_params, sun_params)
+    seven = fn.get_seven_planets(sun_params, moon_params, moment)
+
+    planet_degs = []
+    for nm in PLANET_NAMES_ORDER:
+        if nm == "LAGN":
+            planet_degs.append(lagn_params["lagn"])
+        elif nm == "SUN":
+            planet_degs.append(sun_params["true_long"])
+        elif nm == "MOON":
+            planet_degs.append(moon_params["moon"])
+        elif nm == "RAHU":
+            planet_degs.append(moon_params["rahu"])
+        elif nm == "KETU":
+            planet_degs.append(moon_params["ketu"])
+        else:
+            planet_degs.append(seven[nm]["true_long"])
+
+    # Velocity, latitude, retrograde
+    planet_velocity = [None] * 12
+    planet_latitude = [None] * 12
+    planet_retrograde = [False] * 12
+
+    planet_velocity[1] = abs(sun_params.get("hvel", 1.0))
+    planet_latitude[1] = 0.0
+    planet_velocity[2] = 13.18
+    planet_latitude[2] = 0.0
+
+    for _idx, _nm in zip(
+        [3, 4, 5, 6, 7, 8, 9],
+        ["MARS", "MERCURY", "JUPITER", "VENUS", "SATURN", "URANUS", "NEPTUNE"],
+    ):
+        _gvel = seven[_nm].get("gvel", 0.0)
+        planet_velocity[_idx] = abs(_gvel)
+        planet_latitude[_idx] = seven[_nm].get("lat", 0.0)
+        planet_retrograde[_idx] = _gvel < 0
+
+    ashta_signs = tuple(int(d / 30) % 12 for d in planet_degs)
+    ashta = _cached(cache, "ashtavarga", ashta_signs, sb.compute_ashtavarga, planet_degs)
+
+    prec_degs = sun_params["prec"]
+    ramc_degs = lagn_params["ramc"]
+    lagn_degs = lagn_params["lagn"]
+    lat_degs = input_params["lat_degs"]
+    south_hemi = fn.get_south(input_params)
+
+    nirayana_dhasa = fn.get_culm_point(ramc_degs, lat_degs, prec_degs, south_hemi)
+    house_positions = fn.get_house_positions(
+        lagn_degs, nirayana_dhasa, lat_degs, ramc_degs, prec_degs, south_hemi
+    )
+
+    bhava_positions, bhava1, bhava2 = fn.get_bhava_positions(
+        house_positions, planet_degs
+    )
+    navamsa_positions = fn.get_navamsa_positions(planet_degs)
+    rasi_positions = fn.get_rasi_positions(planet_degs)
+
+    tamil_day, tamil_month, tamil_year = _tamil_date(input_params, sun_params, cache)
+    in_date = input_params["in_datetime"].date()
+    saka, kali_year, birth_day = _cached(
+        cache, "calendar", in_date, _calendar_of_date, in_date
+    )
+    saka_day, saka_month, saka_year = saka
+
+    yogam, karanam, thithi = fn.get_yogam_karanam_thithi(
+        sun_params["true_long"], moon_params["moon"]
+    )
+
+    kali_dina = int(sun_params["d_epoch"]) + cn.kali_day
+
+    p7_degs = [planet_degs[i] for i in [1, 2, 3, 4, 5, 6, 7]]
+    all_signs = [int(d // 30) for d in planet_degs]
+    all_deg_in = [d % 30 for d in planet_degs]
+    all_min_in = [int((d % 30 - int(d % 30)) * 60) for d in planet_degs]
+    all_navamsa = [int(n) for n in navamsa_positions]
+
+    helio_5 = [
+        seven["MARS"]["helio_long"], seven["MERCURY"]["helio_long"],
+        seven["JUPITER"]["helio_long"], seven["VENUS"]["helio_long"],
+        seven["SATURN"]["helio_long"],
+    ]
+
+    local_hrs = _dt_to_hrs(sun_params["local_time"])
+    sunrise_hrs = _dt_to_hrs(sun_params["rise"])
+    sunset_hrs = _dt_to_hrs(sun_params["set"])
+
+    saptha = None
+    if cache is not None:
+        saptha = _cached(
+            cache, "saptha",
+            sb.saptha_vargaja_key(all_signs, all_deg_in, all_min_in, all_navamsa),
+            sb.saptha_vargaja_bala, all_signs, all_deg_in, all_min_in, all_navamsa,
+        )
+    shad = sb.compute_shadbala(
+        p7_degs, all_signs, all_deg_in, all_min_in, all_navamsa,
+        helio_5, house_positions, bhava1, bhava2,
+        local_hrs, sunrise_hrs, sunset_hrs,
+        kali_dina, birth_day, prec_degs, saptha=saptha,
+    )
+
+    bhava_bala = sb.compute_bhava_bala(
+        shad["total"], p7_degs, house_positions, bhava1, bhava2
+    )
+
+    mutual = _cached(
+        cache, "mutual", (tuple(all_signs), tuple(all_navamsa)),
+        sb.compute_mutual_disp, all_signs, all_navamsa,
+    )
+
+    # Paksham / Thithi display
+    paksha = "Krishna" if thithi >= 15 else "Shukla"
+    thithi_idx = (thithi - 15) if thithi >= 15 else thithi
+    if thithi_idx == 14:
+        thithi_idx = 15
+
+    moon_degs = planet_degs[2]
+    janma_nak_idx, janma_pada = _nakshatra_pada(moon_degs)
+    dasa_lord, dasa_y, dasa_m, dasa_d = _dasa_balance(moon_degs)
+
+    return {
+        "input": input_params,
+        "planet_degs": planet_degs,
+        "navamsa_positions": navamsa_positions,
+        "rasi_positions": rasi_positions,
+        "house_positions": house_positions,
+        "bhava_positions": bhava_positions,
+        "sun_params": sun_params,
+        "moon_params": moon_params,
+        "planet_velocity": planet_velocity,
+        "planet_latitude": planet_latitude,
+        "planet_retrograde": planet_retrograde,
+        "sidereal_time": ramc_degs,
+        "ayanamsa": prec_degs,
+        "ashtavarga": ashta,
+        "calendar": {
+            "paksham": f"{paksha} Paksham",
+            "thithi": THITHI[thithi_idx],
+            "yogam": YOGAM[yogam],
+            "karanam": KARANAM[karanam],
+            "tamil_day": tamil_day,
+            "tamil_month": TAMIL_MONTH[tamil_month],
+            "tamil_year": TAMIL_YEAR[tamil_year % 60],
+            "saka_day": saka_day,
+            "saka_month": SAKA_MONTH[saka_month],
+            "saka_year": saka_year,
+            "kali_year": kali_year,
+            "weekday": WDAYS[birth_day],
+            "sunrise": sun_params["rise"],
+            "sunset": sun_params["set"],
+            "janma_nakshatra": NAKSHATRA[janma_nak_idx],
+            "janma_pada": janma_pada,
+            "dasa_lord": dasa_lord,
+            "dasa_y": dasa_y,
+            "dasa_m": dasa_m,
+            "dasa_d": dasa_d,
+            "dasa_table": _full_dasa_table(moon_degs, input_params["in_datetime"]),
+        },
+        "shad": shad,
+        "bhava_bala": bhava_bala,
+        "mutual": mutual,
+    }
+
+
+def compute(input_params):
+    """Run all calculations; return a single structured result dict."""
+    return compute_place(compute_moment(input_params), input_params)
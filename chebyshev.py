@@ -0,0 +1,636 @@
+"""
+chebyshev.py — Compiled (piecewise Chebyshev) ephemeris for one place.
+
+The compiler samples the model (through the vectorised engine in batch.py,
+which mirrors functions.py) and fits Chebyshev coefficients, per body, over
+consecutive intervals: e.g. 4 days for the Moon, 32 days for Saturn.  An
+interval that misses the tolerance is split at the discontinuity it
+contains, or halved.  The model has genuine steps (and a few kinks): the
+net correction wraps at 0/360 degrees, get_ecliptic_moon flips the Moon by
+90 degrees near some quadrant boundaries, and the inferior-planet branch of
+get_geo_longitude switches.  Segments therefore have variable length, and
+evaluation reproduces the steps.
+
+The longitudes depend on the place (see chart.py), so a compiled ephemeris
+is for one place, which is stored in the file.  Instants are IST days: days
+since constants.epoch_sun_rise on the IST clock, i.e. the "ist_days" of the
+float time core (functions.get_time_params).
+
+Compiled ephemerides can also be kept in the memory-mapped store
+(ephem_store.py); get_stored_ephemeris reads one from there.
+
+Compile and report the fitting error per body:
+  python chebyshev.py --lat 13.08 --lat-dirn N --long 80.27 --long-dirn E
+"""
+
+import argparse
+import datetime as dt
+import hashlib
+import os
+import struct
+import time
+
+import numpy as np
+
+import batch as bt
+import birth_input as bi
+import constants as cn
+import ephem_store as es
+import functions as fn
+
+CHEB_VERSION = 1
+CHEB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "chebyshev.bin")
+
+# Nominal interval (days) and polynomial degree, per body
+BODY_INTERVALS = {
+    "SUN": (16.0, 12),
+    "MOON": (4.0, 14),
+    "RAHU": (64.0, 4),
+    "MARS": (16.0, 12),
+    "MERCURY": (8.0, 12),
+    "JUPITER": (32.0, 12),
+    "VENUS": (16.0, 12),
+    "SATURN": (32.0, 12),
+    "URANUS": (64.0, 12),
+    "NEPTUNE": (64.0, 12),
+}
+BODIES = list(BODY_INTERVALS.keys())
+
+# Largest spacing (days) of the check points.  The model has excursions
+# narrower than the node spacing: get_ecliptic_moon flips the Moon by 90
+# degrees for a few minutes at some quadrant boundaries, and the geocentric
+# branch of the inferior planets switches for a few hours.
+SCREEN_STEPS = {body: 1.0 / 24.0 for body in BODIES}
+SCREEN_STEPS["MOON"] = 2.0 / 1440.0
+
+DEFAULT_TOL_ARCSEC = 1.0
+
+_MAGIC = b"CHEB"
+# magic, version, lat, long (signed), start, end, tolerance (degs), bodies,
+# checksum
+_HEADER = struct.Struct("<4sIdddddI32s")
+# name, degree, segments
+_BODY_HEADER = struct.Struct("<8sII")
+
+# An interval that misses the tolerance is split at its largest step when
+# that step looks like a discontinuity (degrees, against the median step)
+# or the interval is short (days); a step or kink is then located.  Failing
+# that, it is halved down to the last span (days).
+_JUMP_DEGS = 0.05
+_SHORT_SPAN_DAYS = 1.0 / 24.0
+_MIN_SPAN_DAYS = 1.0 / 1440.0
+# Breaks are located to within this many days
+_BREAK_RESOLUTION_DAYS = 1e-9
+_CHECKS_PER_NODE = 2
+# Model samples per call in the nominal pass (bounds the memory used)
+_CHUNK_SAMPLES = 1 << 20
+
+
+def model_checksum(lat_degs, long_degs, start_days, end_days):
+    """
+    Return the checksum (32 bytes) of the model constants and the fit set-up
+    """
+    planet_consts = {key: value.tolist() for key, value in bt.planet_consts.items()}
+    model = (
+        CHEB_VERSION,
+        lat_degs,
+        long_degs,
+        start_days,
+        end_days,
+        sorted(BODY_INTERVALS.items()),
+        sorted(SCREEN_STEPS.items()),
+        cn.epoch.isoformat(),
+        cn.epoch_sun_rise.isoformat(),
+        cn.solar_days_in_year,
+        cn.sidereal_days_in_year,
+        cn.mean_sun_long_at_epoch,
+        cn.apse_position_at_epoch,
+        cn.earth_eccentricity,
+        cn.moon_rev_days,
+        cn.mean_moon_long_at_epoch,
+        cn.moon_apse_revolution_days,
+        cn.moon_rahu_revolution_days,
+        cn.moon_eccentricity,
+        sorted(planet_consts.items()),
+    )
+    return hashlib.sha256(repr(model).encode("ascii")).digest()
+
+
+# ---------------------------------------------------------------------------
+# Sampling the model
+# ---------------------------------------------------------------------------
+
+
+def make_place(lat_degs, lat_dirn, long_degs, long_dirn):
+    """
+    Return the place (dict) the ephemeris is compiled for
+    """
+    cols = bt.get_input_arrays(
+        {
+            "in_datetime": cn.epoch_sun_rise,
+            "diff_from_gst_in_sec": cn.ist_offset_in_sec,
+            "lat_degs": lat_degs,
+            "lat_dirn": lat_dirn,
+            "long_degs": long_degs,
+            "long_dirn": long_dirn,
+        }
+    )
+    place = dict()
+    place["cols"] = cols
+    place["local_offset_days"] = fn.get_local_offset_days(long_degs, bool(cols["west"]))
+    place["lat_degs"] = -lat_degs if cols["south"] else lat_degs
+    place["long_degs"] = -long_degs if cols["west"] else long_degs
+    return place
+
+
+def get_model_longitudes(place, ist_days, bodies=BODIES):
+    """
+    Return dictionary (by body) of longitudes from the model, for an array
+    of IST days at the place
+    """
+    ist_days = np.asarray(ist_days, dtype=float)
+    time_params = bt.make_time_params(ist_days, 0.0, place["local_offset_days"])
+    sun_params = bt.get_sun_core(place["cols"], time_params)
+
+    longitudes = dict()
+    if "SUN" in bodies:
+        longitudes["SUN"] = sun_params["true_long"]
+    if "MOON" in bodies or "RAHU" in bodies:
+        moon_params = bt.get_moon_params(sun_params)
+        longitudes["MOON"] = moon_params["moon"]
+        longitudes["RAHU"] = moon_params["rahu"]
+    planet_names = [name for name in bt.PLANET_NAMES if name in bodies]
+    if planet_names:
+        planet_grid = bt.get_planet_grid(sun_params, planet_names)
+        for idx, name in enumerate(planet_names):
+            longitudes[name] = planet_grid["true_long"][idx]
+    return {name: longitudes[name] for name in bodies}
+
+
+def _sample(place, body, ist_days):
+    return get_model_longitudes(place, ist_days, [body])[body]
+
+
+# ---------------------------------------------------------------------------
+# Fitting
+# ---------------------------------------------------------------------------
+
+
+def _cheb_nodes(degree):
+    """
+    Return the Chebyshev-Gauss nodes (in [-1, 1]) and the matrix that turns
+    values at the nodes into coefficients
+    """
+    n = degree + 1
+    theta = np.pi * (np.arange(n) + 0.5) / n
+    nodes = np.cos(theta)
+    to_coeffs = 2.0 / n * np.cos(np.outer(np.arange(n), theta))
+    to_coeffs[0] /= 2.0
+    return nodes, to_coeffs
+
+
+def _unwrap_to(values, ref_degs):
+    """
+    Return values moved by whole turns to lie within 180 degrees of ref_degs
+    """
+    return ref_degs + fn._wrap_diff_degs(values, ref_degs)
+
+
+def _get_checks(body, degree, span_days):
+    """
+    Return the check points (in [-1, 1)) for a span: the two ends and at
+    least _CHECKS_PER_NODE per node in between, closer where screened
+    """
+    n_check = _CHECKS_PER_NODE * (degree + 1)
+    n_check = max(n_check, int(np.ceil(span_days / SCREEN_STEPS[body])))
+    interior = 2.0 * (np.arange(n_check) + 0.5) / n_check - 1.0
+    # The end itself belongs to the next span
+    return np.concatenate([[-1.0], interior, [1.0 - 1e-9]])
+
+
+def _fit_spans(place, body, starts, ends, degree):
+    """
+    Return the coefficients (spans x degree+1) and the maximum error
+    (degrees) at the check points, for each span; and the steps between
+    consecutive check points that may be discontinuities: those above
+    _JUMP_DEGS and the largest of each span (degrees, against the median
+    step), with the span index and the instants around each
+    """
+    starts = np.asarray(starts, dtype=float)[:, None]
+    ends = np.asarray(ends, dtype=float)[:, None]
+    half = (ends - starts) / 2.0
+    mid = (ends + starts) / 2.0
+
+    nodes, to_coeffs = _cheb_nodes(degree)
+    checks = _get_checks(body, degree, float(np.max(ends - starts)))
+
+    node_days = mid + half * nodes
+    check_days = mid + half * checks
+    values = _sample(place, body, np.concatenate([node_days, check_days], axis=1))
+    node_vals = values[:, : degree + 1]
+    check_vals = values[:, degree + 1 :]
+
+    ref_degs = node_vals[:, :1]
+    coeffs = _unwrap_to(node_vals, ref_degs) @ to_coeffs.T
+
+    fitted = np.polynomial.chebyshev.chebval(checks, coeffs.T, tensor=True)
+    errors = np.abs(fn._wrap_diff_degs(check_vals, fitted))
+
+    steps = fn._wrap_diff_degs(check_vals[:, 1:], check_vals[:, :-1])
+    step_devs = np.abs(steps - np.median(steps, axis=1, keepdims=True))
+    largest = np.zeros(step_devs.shape, dtype=bool)
+    largest[np.arange(len(step_devs)), np.argmax(step_devs, axis=1)] = True
+    rows, k = np.nonzero(largest | (step_devs > _JUMP_DEGS))
+    jumps = {
+        "span": rows,
+        "degs": step_devs[rows, k],
+        "largest": largest[rows, k],
+        "lo_days": check_days[rows, k],
+        "hi_days": check_days[rows, k + 1],
+    }
+    return coeffs, errors.max(axis=1), jumps
+
+
+def _locate_breaks(place, body, lo_days, hi_days):
+    """
+    Return the instants (days) of the step discontinuities between lo_days
+    and hi_days (arrays): the first instant on the far side of the largest
+    step in each bracket
+    """
+    n_probe = 64
+    fractions = np.linspace(0.0, 1.0, n_probe + 1)
+    rows = np.arange(len(lo_days))
+    while np.max(hi_days - lo_days, initial=0.0) > _BREAK_RESOLUTION_DAYS:
+        probe_days = lo_days[:, None] + (hi_days - lo_days)[:, None] * fractions
+        values = _sample(place, body, probe_days)
+        steps = fn._wrap_diff_degs(values[:, 1:], values[:, :-1])
+        devs = np.abs(steps - np.median(steps, axis=1, keepdims=True))
+        k = np.argmax(devs, axis=1)
+        lo_days, hi_days = probe_days[rows, k], probe_days[rows, k + 1]
+    return hi_days
+
+
+def _fit_in_chunks(place, body, starts, ends, degree):
+    """
+    Return _fit_spans over many spans, sampling the model in chunks
+    """
+    span_days = float(np.max(ends - starts))
+    per_span = degree + 1 + len(_get_checks(body, degree, span_days))
+    chunk = max(1, _CHUNK_SAMPLES // per_span)
+    firsts = range(0, len(starts), chunk)
+    fits = [
+        _fit_spans(place, body, starts[i : i + chunk], ends[i : i + chunk], degree)
+        for i in firsts
+    ]
+    for first, (_, _, jumps) in zip(firsts, fits):
+        jumps["span"] = jumps["span"] + first
+    coeffs = np.concatenate([c for c, _, _ in fits])
+    errors = np.concatenate([e for _, e, _ in fits])
+    jumps = {
+        key: np.concatenate([j[key] for _, _, j in fits]) for key in fits[0][2]
+    }
+    return coeffs, errors, jumps
+
+
+def compile_body(place, body, start_days, end_days, tol_degs):
+    """
+    Return the compiled ephemeris (dict) of one body over [start, end)
+    """
+    interval_days, degree = BODY_INTERVALS[body]
+    count = int(np.ceil((end_days - start_days) / interval_days))
+    starts = start_days + interval_days * np.arange(count)
+    ends = np.minimum(starts + interval_days, end_days)
+
+    # Fit all pending spans at once; spans that miss the tolerance are cut
+    # at the discontinuities they contain (or halved) and the pieces fitted
+    # again in the next round
+    seg_starts = []
+    seg_coeffs = []
+    while len(starts):
+        coeffs, errors, jumps = _fit_in_chunks(place, body, starts, ends, degree)
+        spans = ends - starts
+        done = (errors <= tol_degs) | (spans <= _MIN_SPAN_DAYS)
+        seg_starts.append(starts[done])
+        seg_coeffs.append(coeffs[done])
+
+        span_idx = jumps["span"]
+        locate = ~done[span_idx] & (
+            (jumps["degs"] > _JUMP_DEGS)
+            | (jumps["largest"] & (spans[span_idx] <= _SHORT_SPAN_DAYS))
+        )
+        span_idx = span_idx[locate]
+        cut_days = _locate_breaks(
+            place, body, jumps["lo_days"][locate], jumps["hi_days"][locate]
+        )
+        inside = (cut_days > starts[span_idx]) & (cut_days < ends[span_idx])
+        span_idx, cut_days = span_idx[inside], cut_days[inside]
+
+        # Halve the failing spans without a discontinuity
+        uncut = ~done & ~np.isin(np.arange(len(starts)), span_idx)
+        halves = np.nonzero(uncut)[0]
+        span_idx = np.concatenate([span_idx, halves])
+        cut_days = np.concatenate([cut_days, (starts + ends)[halves] / 2.0])
+
+        # Pieces between consecutive cuts (and the ends) of each span
+        failed = np.nonzero(~done)[0]
+        point_span = np.concatenate([failed, span_idx, failed])
+        point_days = np.concatenate([starts[failed], cut_days, ends[failed]])
+        order = np.lexsort((point_days, point_span))
+        point_span, point_days = point_span[order], point_days[order]
+        piece = (point_span[1:] == point_span[:-1]) & (point_days[1:] > point_days[:-1])
+        starts, ends = point_days[:-1][piece], point_days[1:][piece]
+
+    seg_starts = np.concatenate(seg_starts)
+    order = np.argsort(seg_starts)
+    return {
+        "degree": degree,
+        "breaks": np.append(seg_starts[order], end_days),
+        "coeffs": np.concatenate(seg_coeffs)[order],
+    }
+
+
+def compile_ephemeris(
+    lat_degs,
+    lat_dirn,
+    long_degs,
+    long_dirn,
+    start_year,
+    end_year,
+    tol_arcsec=DEFAULT_TOL_ARCSEC,
+    bodies=BODIES,
+):
+    """
+    Return a new compiled ephemeris (dict) for the place and range of years
+    """
+    place = make_place(lat_degs, lat_dirn, long_degs, long_dirn)
+    start_days = fn.get_days_from_epoch(dt.datetime(start_year, 1, 1))
+    end_days = fn.get_days_from_epoch(dt.datetime(end_year + 1, 1, 1))
+    tol_degs = tol_arcsec / cn.seconds_in_degree
+
+    return {
+        "version": CHEB_VERSION,
+        "lat_degs": place["lat_degs"],
+        "long_degs": place["long_degs"],
+        "start_days": start_days,
+        "end_days": end_days,
+        "tol_degs": tol_degs,
+        "checksum": model_checksum(
+            place["lat_degs"], place["long_degs"], start_days, end_days
+        ),
+        "bodies": {
+            body: compile_body(place, body, start_days, end_days, tol_degs)
+            for body in bodies
+        },
+    }
+
+
+# ---------------------------------------------------------------------------
+# File I/O
+# ---------------------------------------------------------------------------
+
+
+def save_ephemeris(ephem, path=CHEB_PATH):
+    """
+    Write the compiled ephemeris to a binary file
+    """
+    with open(path, "wb") as f:
+        f.write(
+            _HEADER.pack(
+                _MAGIC,
+                ephem["version"],
+                ephem["lat_degs"],
+                ephem["long_degs"],
+                ephem["start_days"],
+                ephem["end_days"],
+                ephem["tol_degs"],
+                len(ephem["bodies"]),
+                ephem["checksum"],
+            )
+        )
+        for body, body_ephem in ephem["bodies"].items():
+            coeffs = body_ephem["coeffs"]
+            f.write(
+                _BODY_HEADER.pack(
+                    body.encode("ascii"), body_ephem["degree"], coeffs.shape[0]
+                )
+            )
+            f.write(body_ephem["breaks"].astype("<f8").tobytes())
+            f.write(coeffs.astype("<f8").tobytes())
+
+
+def load_ephemeris(path=CHEB_PATH):
+    """
+    Return the compiled ephemeris read from a binary file; None if the file
+    is missing, damaged or built from different model constants
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+
+    if len(data) < _HEADER.size:
+        return None
+    magic, version, lat, long, start, end, tol, n_bodies, checksum = (
+        _HEADER.unpack_from(data)
+    )
+    if magic != _MAGIC or version != CHEB_VERSION:
+        return None
+    if checksum != model_checksum(lat, long, start, end):
+        return None
+
+    bodies = dict()
+    offset = _HEADER.size
+    try:
+        for _ in range(n_bodies):
+            name, degree, count = _BODY_HEADER.unpack_from(data, offset)
+            offset += _BODY_HEADER.size
+            breaks = np.frombuffer(data, "<f8", count + 1, offset)
+            offset += breaks.nbytes
+            coeffs = np.frombuffer(data, "<f8", count * (degree + 1), offset)
+            offset += coeffs.nbytes
+            bodies[name.rstrip(b"\0").decode("ascii")] = {
+                "degree": degree,
+                "breaks": breaks.astype(float),
+                "coeffs": coeffs.reshape(count, degree + 1).astype(float),
+            }
+    except (struct.error, ValueError):
+        return None
+
+    return {
+        "version": version,
+        "lat_degs": lat,
+        "long_degs": long,
+        "start_days": start,
+        "end_days": end,
+        "tol_degs": tol,
+        "checksum": checksum,
+        "bodies": bodies,
+    }
+
+
+def get_store_tables(ephem):
+    """
+    Return the compiled ephemeris as store tables (see
+    ephem_store.write_store), two per body: breaks and coefficients
+    """
+    prefix = f"chebyshev/{ephem['lat_degs']!r},{ephem['long_degs']!r}/"
+    tables = dict()
+    for body, body_ephem in ephem["bodies"].items():
+        meta = {
+            "kind": "chebyshev",
+            "version": ephem["version"],
+            "body": body,
+            "interval_days": BODY_INTERVALS[body][0],
+            "degree": body_ephem["degree"],
+            "lat_degs": ephem["lat_degs"],
+            "long_degs": ephem["long_degs"],
+            "start_days": ephem["start_days"],
+            "end_days": ephem["end_days"],
+            "tol_degs": ephem["tol_degs"],
+            "checksum": ephem["checksum"].hex(),
+        }
+        tables[prefix + body + "/breaks"] = (body_ephem["breaks"], meta)
+        tables[prefix + body + "/coeffs"] = (body_ephem["coeffs"], meta)
+    return tables
+
+
+def get_stored_ephemeris(lat_degs, lat_dirn, long_degs, long_dirn, store=None):
+    """
+    Return the compiled ephemeris for the place from the ephemeris store,
+    its coefficients views into the mapped file; None if the store has no
+    current ephemeris for the place
+    """
+    place = make_place(lat_degs, lat_dirn, long_degs, long_dirn)
+    prefix = f"chebyshev/{place['lat_degs']!r},{place['long_degs']!r}/"
+    tables = es.find_tables(prefix, store)
+    if not tables:
+        return None
+
+    ephem = None
+    for name, (values, meta) in tables.items():
+        if ephem is None:
+            checksum = bytes.fromhex(meta["checksum"])
+            if meta["version"] != CHEB_VERSION or checksum != model_checksum(
+                meta["lat_degs"], meta["long_degs"], meta["start_days"], meta["end_days"]
+            ):
+                return None
+            ephem = {
+                "version": meta["version"],
+                "lat_degs": meta["lat_degs"],
+                "long_degs": meta["long_degs"],
+                "start_days": meta["start_days"],
+                "end_days": meta["end_days"],
+                "tol_degs": meta["tol_degs"],
+                "checksum": checksum,
+                "bodies": dict(),
+            }
+        body_ephem = ephem["bodies"].setdefault(
+            meta["body"], {"degree": meta["degree"]}
+        )
+        body_ephem[name.rsplit("/", 1)[1]] = values
+    return ephem
+
+
+# ---------------------------------------------------------------------------
+# Evaluation
+# ---------------------------------------------------------------------------
+
+
+def get_longitude(ephem, body, ist_days, deriv=False):
+    """
+    Return the longitude (degrees) of the body at the given IST days, scalar
+    or array; with deriv=True, return (longitude, degrees per day)
+    """
+    body_ephem = ephem["bodies"][body]
+    breaks = body_ephem["breaks"]
+    coeffs = body_ephem["coeffs"]
+
+    days = np.asarray(ist_days, dtype=float)
+    if np.any(days < breaks[0]) or np.any(days > breaks[-1]):
+        raise ValueError(f"{body}: instant outside the compiled range")
+
+    idx = np.clip(np.searchsorted(breaks, days, side="right") - 1, 0, len(coeffs) - 1)
+    start = breaks[idx]
+    span = breaks[idx + 1] - start
+    x = 2.0 * (days - start) / span - 1.0
+    c = coeffs[idx]
+
+    # Clenshaw recurrence, vectorised over the instants
+    b1 = np.zeros_like(x)
+    b2 = np.zeros_like(x)
+    d1 = np.zeros_like(x)
+    d2 = np.zeros_like(x)
+    for j in range(c.shape[-1] - 1, 0, -1):
+        if deriv:
+            d1, d2 = 2.0 * x * d1 - d2 + 2.0 * b1, d1
+        b1, b2 = 2.0 * x * b1 - b2 + c[..., j], b1
+    long_degs = np.mod(x * b1 - b2 + c[..., 0], cn.full_circle)
+
+    if not deriv:
+        return long_degs[()]
+    vel_degs = (x * d1 - d2 + b1) * 2.0 / span
+    return long_degs[()], vel_degs[()]
+
+
+def get_error_stats(ephem, place, body, n_samples=20000, seed=0):
+    """
+    Return dictionary of fitting errors (arcsec) of a body against the model,
+    at random instants in the compiled range
+    """
+    rng = np.random.default_rng(seed)
+    days = rng.uniform(ephem["start_days"], ephem["end_days"], n_samples)
+    model_degs = _sample(place, body, days)
+    cheb_degs = get_longitude(ephem, body, days)
+    errors = np.abs(fn._wrap_diff_degs(cheb_degs, model_degs)) * cn.seconds_in_degree
+
+    breaks = ephem["bodies"][body]["breaks"]
+    return {
+        "segments": len(breaks) - 1,
+        "max": float(errors.max()),
+        "rms": float(np.sqrt(np.mean(errors * errors))),
+        "p999": float(np.quantile(errors, 0.999)),
+        "over_tol": int(np.sum(errors > ephem["tol_degs"] * cn.seconds_in_degree)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile a Chebyshev ephemeris")
+    bi.add_place_arguments(parser, time_zone=False)
+    parser.add_argument("--start-year", type=int, default=1800)
+    parser.add_argument("--end-year", type=int, default=2100)
+    parser.add_argument("--tol-arcsec", type=float, default=DEFAULT_TOL_ARCSEC)
+    parser.add_argument("--output", default=CHEB_PATH, help="file to write")
+    args = parser.parse_args()
+    birth = bi.get_birth_input(parser, args, dt.datetime(args.start_year, 1, 1))
+
+    t0 = time.perf_counter()
+    ephem = compile_ephemeris(
+        birth["lat_degs"],
+        birth["lat_dirn"],
+        birth["long_degs"],
+        birth["long_dirn"],
+        args.start_year,
+        args.end_year,
+        args.tol_arcsec,
+    )
+    save_ephemeris(ephem, args.output)
+    print(
+        f"Compiled {args.start_year}-{args.end_year} in "
+        f"{time.perf_counter() - t0:.1f} s to {args.output}"
+    )
+
+    place = make_place(
+        birth["lat_degs"], birth["lat_dirn"], birth["long_degs"], birth["long_dirn"]
+    )
+    print("body     segments  max (\")  rms (\") p99.9 (\")")
+    for body in ephem["bodies"]:
+        stats = get_error_stats(ephem, place, body)
+        print(
+            f"{body:8} {stats['segments']:8d} {stats['max']:8.3f} "
+            f"{stats['rms']:8.3f} {stats['p999']:8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
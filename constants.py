@@ -40,6 +40,13 @@ IST_longitude = 82.5
 seconds_in_day = 24 * 3600.0
 ist_offset_in_sec = IST_longitude / 360.0 * seconds_in_day
 
+# Offsets (in days) used by the float time core, which counts days from
+# Epoch Sun Rise: Epoch Sun Rise after Epoch, and Epoch after the Jupiter and
+# Saturn base dates
+epoch_sun_rise_in_days = (epoch_sun_rise - epoch).total_seconds() / seconds_in_day
+jupiter_base_in_days = (epoch - jupiter_base).total_seconds() / seconds_in_day
+saturn_base_in_days = (epoch - saturn_base).total_seconds() / seconds_in_day
+
 deg_angle_to_time_sec = (seconds_in_day) / full_circle
 deg_angle_in_one_day = 360.0  # 360 degrees in one day
 min_angle_in_one_day = deg_angle_in_one_day * 60.0
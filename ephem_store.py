@@ -0,0 +1,201 @@
+"""
+ephem_store.py — Read-only, memory-mapped store of the precomputed tables.
+
+One file holds the precomputed tables: the Sankranti ingress instants
+(sankranti.py), compiled Chebyshev ephemerides (chebyshev.py) and,
+optionally, the ascendant table (asc_table.py).  The file
+is mapped read-only with numpy.memmap and the tables are views into the
+mapping, so opening the store reads only its header, and the worker
+processes of a pool share one copy of the data in the page cache.
+
+Layout (little-endian):
+  header      magic, STORE_VERSION, length of the directory
+  directory   JSON list: name, dtype, shape and offset of each table, with
+              its metadata (bodies, intervals, model version, checksum)
+  data        the tables, each aligned to _ALIGN bytes
+
+The store does not check the tables itself: each module that writes a table
+records the checksum of its model constants in the metadata and compares
+it when reading, so a stale table is ignored.
+
+Build the store from the Sankranti table and compiled ephemerides:
+  python ephem_store.py --cheb chebyshev.bin --asc-table
+"""
+
+import argparse
+import json
+import os
+import struct
+
+import numpy as np
+
+STORE_VERSION = 1
+STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ephem.store")
+
+_MAGIC = b"EPHS"
+# magic, version, directory length
+_HEADER = struct.Struct("<4sII")
+_ALIGN = 64
+
+_UNSET = object()
+_store = _UNSET
+
+
+def _aligned(offset):
+    return -(-offset // _ALIGN) * _ALIGN
+
+
+def write_store(tables, path=STORE_PATH):
+    """
+    Write the tables to a store file.
+    Input: dictionary (by name) of (array, metadata dict) pairs
+    """
+    global _store
+    directory = []
+    arrays = []
+    for name, (values, meta) in tables.items():
+        values = np.asarray(values)
+        dtype = values.dtype.newbyteorder("<")
+        arrays.append(values.astype(dtype))
+        directory.append(
+            {"name": name, "dtype": dtype.str, "shape": list(values.shape), "meta": meta}
+        )
+
+    # The offsets are part of the directory, so size it with placeholders
+    # first; they only ever shrink when filled in
+    for entry in directory:
+        entry["offset"] = 1 << 62
+    data_start = _aligned(_HEADER.size + len(json.dumps(directory).encode("utf-8")))
+    offset = data_start
+    for entry, values in zip(directory, arrays):
+        entry["offset"] = offset
+        offset = _aligned(offset + values.nbytes)
+    dir_bytes = json.dumps(directory).encode("utf-8")
+
+    # Write a new file and rename it over the old one, so processes that
+    # have the old store mapped keep a consistent copy
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, STORE_VERSION, len(dir_bytes)))
+        f.write(dir_bytes)
+        for entry, values in zip(directory, arrays):
+            f.seek(entry["offset"])
+            f.write(values.tobytes())
+        f.truncate(offset)
+    os.replace(tmp_path, path)
+    _store = _UNSET  # Map the new file on next use
+
+
+def open_store(path=STORE_PATH):
+    """
+    Return the store (dict) mapped from a file; None if the file is missing
+    or damaged
+    """
+    try:
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                return None
+            magic, version, dir_len = _HEADER.unpack(header)
+            if magic != _MAGIC or version != STORE_VERSION:
+                return None
+            directory = json.loads(f.read(dir_len).decode("utf-8"))
+        mapping = np.memmap(path, dtype=np.uint8, mode="r")
+    except (OSError, ValueError):
+        return None
+
+    tables = dict()
+    for entry in directory:
+        dtype = np.dtype(entry["dtype"])
+        shape = tuple(entry["shape"])
+        nbytes = dtype.itemsize * int(np.prod(shape))
+        if entry["offset"] + nbytes > len(mapping):
+            return None
+        tables[entry["name"]] = {
+            "meta": entry["meta"],
+            "values": np.ndarray(shape, dtype, mapping, entry["offset"]),
+        }
+
+    return {"path": path, "version": version, "tables": tables}
+
+
+def get_store():
+    """
+    Return the store at STORE_PATH, mapping it on first use in this process;
+    None if there is no usable store
+    """
+    global _store
+    if _store is _UNSET:
+        _store = open_store()
+    return _store
+
+
+def get_table(name, store=None):
+    """
+    Return (values, metadata) of the named table, the values a read-only
+    view into the store; None if the store or the table is missing
+    """
+    if store is None:
+        store = get_store()
+    if store is None or name not in store["tables"]:
+        return None
+    table = store["tables"][name]
+    return table["values"], table["meta"]
+
+
+def find_tables(prefix, store=None):
+    """
+    Return dictionary (by name) of (values, metadata) of the tables whose
+    names start with prefix
+    """
+    if store is None:
+        store = get_store()
+    if store is None:
+        return dict()
+    return {
+        name: (table["values"], table["meta"])
+        for name, table in store["tables"].items()
+        if name.startswith(prefix)
+    }
+
+
+def build_store(cheb_paths=(), path=STORE_PATH, asc_table=False):
+    """
+    Write a store holding the Sankranti table, the compiled ephemerides
+    read from cheb_paths and, with asc_table, the ascendant table; return
+    the names of the tables written
+    """
+    import asc_table as at
+    import chebyshev as ch
+    import sankranti as sk
+
+    tables = sk.get_store_tables(sk.get_ingress_table())
+    if asc_table:
+        tables.update(at.get_store_tables(at.build_table()))
+    for cheb_path in cheb_paths:
+        ephem = ch.load_ephemeris(cheb_path)
+        if ephem is None:
+            raise ValueError(f"{cheb_path}: missing or stale compiled ephemeris")
+        tables.update(ch.get_store_tables(ephem))
+    write_store(tables, path)
+    return list(tables)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the ephemeris store")
+    parser.add_argument(
+        "--cheb", action="append", default=[], help="compiled ephemeris to add"
+    )
+    parser.add_argument(
+        "--asc-table", action="store_true", help="add the ascendant table"
+    )
+    parser.add_argument("--output", default=STORE_PATH, help="store file to write")
+    args = parser.parse_args()
+
+    names = build_store(args.cheb, args.output, args.asc_table)
+    size = os.path.getsize(args.output)
+    print(f"Wrote {len(names)} tables ({size} bytes) to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
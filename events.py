@@ -0,0 +1,576 @@
+"""
+events.py — Find the instant an angle of the model crosses a target.
+
+Sankranti, nakshatra changes, thithi ends, lagna changes and Varshaphal
+returns all come down to the instant an angle crosses a target longitude.
+The angles are those of ANGLE_RATES, at a place:
+
+  SUN, MOON, RAHU and the seven planets   true longitudes (functions.py)
+  MOON-SUN                                 elongation (thithi, karanam)
+  SUN+MOON                                 sum of the longitudes (yogam)
+  LAGNA                                    ascendant
+  A-B (make_pair_angle)                    difference of two of these, or of
+                                           one and a fixed (natal) longitude
+  any other (make_function_angle)          given by a function of the instant
+
+A solve first brackets the crossing, then refines the bracket with a
+safeguarded secant (regula falsi, falling back to bisection).  Angles that
+only move one way (Sun, Moon, their sum and difference, Lagna and Rahu) are
+bracketed by predicting the crossing from the mean daily motion, then from
+the observed motion.  The planets can be retrograde, so they are scanned
+with steps no longer than the time the planet needs, at its fastest, to
+reach the target; a crossing is then never stepped over, except two within
+_MIN_SCAN_DAYS of each other at a station.
+
+Angles wrap at 360 degrees, so a target of 0 and one of 360 are the same.
+The model has a few genuine steps (see chebyshev.py); a crossing made by a
+step is found at the step.  The Moon's flips of a few minutes, a jump ahead
+and back, are not crossings of a one-way angle and are passed over.
+
+Instants are IST days: days since constants.epoch_sun_rise on the IST
+clock, i.e. the "ist_days" of the float time core (functions.get_time_params).
+Every angle counts its model evaluations, and each solve reports its own.
+Angles made on one evaluation stream (make_stream) share their Sun and Moon
+evaluations.
+"""
+
+import collections
+
+import constants as cn
+import functions as fn
+
+# Mean and greatest daily motion (degrees) of each angle.  The mean comes
+# from the model constants (for the planets, nc is the mean heliocentric
+# motion); the greatest is what the model reaches, with a margin.
+_SUN_RATE = cn.sun_motion / cn.minutes_in_degree
+_MOON_RATE = cn.moon_motion / cn.minutes_in_degree
+_RAHU_RATE = -cn.full_circle / cn.moon_rahu_revolution_days
+_LAGNA_RATE = cn.full_circle + _SUN_RATE  # One turn a sidereal day
+
+ANGLE_RATES = {
+    "SUN": (_SUN_RATE, 1.05 * _SUN_RATE),
+    "MOON": (_MOON_RATE, 1.2 * _MOON_RATE),
+    "RAHU": (_RAHU_RATE, 1.05 * _RAHU_RATE),
+    "MOON-SUN": (_MOON_RATE - _SUN_RATE, 1.2 * (_MOON_RATE - _SUN_RATE)),
+    "SUN+MOON": (_MOON_RATE + _SUN_RATE, 1.2 * (_MOON_RATE + _SUN_RATE)),
+    "LAGNA": (_LAGNA_RATE, None),
+}
+# Greatest geocentric motion of the planets, in units of nc
+_PLANET_RATE_FACTORS = {
+    "MARS": 1.6,
+    "MERCURY": 3.0,
+    "JUPITER": 3.5,
+    "VENUS": 1.8,
+    "SATURN": 4.5,
+    "URANUS": 6.0,
+    "NEPTUNE": 7.0,
+}
+for _name, _planet in cn.planet_dict.items():
+    _rate = _planet.nc / cn.minutes_in_degree
+    ANGLE_RATES[_name] = (_rate, _PLANET_RATE_FACTORS[_name] * _rate)
+
+# Angles that never reverse; the others are scanned
+MONOTONIC_ANGLES = ("SUN", "MOON", "RAHU", "MOON-SUN", "SUN+MOON", "LAGNA")
+
+DEFAULT_TOL_DAYS = 1e-6  # About 0.09 seconds
+
+# Largest angle (degrees) a predicted step aims to cover, so the motion
+# between two evaluations is never ambiguous modulo 360 degrees.  Lagna
+# moves up to 15 times its mean rate at high latitudes.
+_MAX_STEP_DEGS = 90.0
+_MAX_LAGNA_STEP_DEGS = 20.0
+# The Moon steps back 10 to 15 degrees a few times a year (see chebyshev.py).
+# A step of the angles of the Moon covers at most _MOON_STEP_DEGS, so that a
+# step back within it leaves the angle short of _MOON_MIN_RATE times its
+# mean motion (which it never is otherwise, over an hour or more), and the
+# step is then shortened until the step back shows.
+_MOON_ANGLES = ("MOON", "MOON-SUN", "SUN+MOON")
+_MOON_STEP_DEGS = 20.0
+_MOON_MIN_RATE = 0.75
+# Overshoot of a predicted step, so the crossing is usually bracketed by
+# the first step that reaches it
+_OVERSHOOT = 1.05
+# Shortest step when scanning a planet near the target
+_MIN_SCAN_DAYS = 1.0 / 24.0
+_MAX_ITERATIONS = 200
+# Width (days) a step back of the model is located to
+_STEP_DAYS = 1e-8
+# A crossing made by a jump of at least _MIN_JUMP_DEGS that is followed by
+# a step back within _SPIKE_DAYS is one of the Moon's flips
+# (get_ecliptic_moon), which last minutes, and is passed over
+_MIN_JUMP_DEGS = 1.0
+_SPIKE_DAYS = 1.0 / 24.0
+
+# Evaluations a stream keeps, the least recently used dropped first: the
+# solves of a day need a few dozen, and a stream used for years of days
+# stays bounded
+_STREAM_CACHE_SIZE = 2048
+
+
+def make_stream(input_params):
+    """
+    Return an evaluation stream (dict) for the place of input_params: the
+    Sun and Moon evaluated so far, by instant.  Angles made on one stream
+    share its evaluations, so e.g. the thithi and nakshatra solves of a day
+    do not evaluate the model twice at the same instant.  It keeps the
+    latest _STREAM_CACHE_SIZE of them, and counts in "evals" the Sun
+    evaluations it made.
+    Only the place is read: lat_degs, lat_dirn, long_degs, long_dirn and
+    diff_from_gst_in_sec (the clock of the instants reported as datetimes).
+    """
+    stream = dict()
+    stream["place"] = input_params
+    stream["ist_offset_days"] = fn.get_ist_offset_days(
+        input_params.get("diff_from_gst_in_sec", cn.ist_offset_in_sec),
+        fn.get_west(input_params),
+    )
+    stream["local_offset_days"] = fn.get_local_offset_days(
+        input_params["long_degs"], fn.get_west(input_params)
+    )
+    stream["cache"] = collections.OrderedDict()
+    stream["evals"] = 0
+    return stream
+
+
+def make_angle(name, input_params, stream=None):
+    """
+    Return the angle (dict) to solve for, at the place of input_params, on
+    the given evaluation stream (a new one by default; see make_stream)
+    """
+    if name not in ANGLE_RATES:
+        raise ValueError(f"Unknown angle: {name}")
+    mean_rate, max_rate = ANGLE_RATES[name]
+    if stream is None:
+        stream = make_stream(input_params)
+
+    angle = dict()
+    angle["name"] = name
+    angle["stream"] = stream
+    angle["ist_offset_days"] = stream["ist_offset_days"]
+    angle["mean_rate"] = mean_rate
+    angle["max_rate"] = max_rate
+    angle["monotonic"] = name in MONOTONIC_ANGLES
+    angle["max_step_degs"] = _MAX_LAGNA_STEP_DEGS if name == "LAGNA" else _MAX_STEP_DEGS
+    if name in _MOON_ANGLES:
+        angle["step_degs"] = _MOON_STEP_DEGS
+        angle["min_rate"] = _MOON_MIN_RATE * mean_rate
+    else:
+        angle["step_degs"] = angle["max_step_degs"]
+        angle["min_rate"] = None
+    angle["evals"] = 0
+    return angle
+
+
+def make_pair_angle(first, second, input_params, stream=None):
+    """
+    Return the angle (dict) first - second, the difference of two angles
+    (see make_angle; LAGNA excepted), at the place of input_params.  Either
+    may instead be a fixed longitude in degrees, such as a natal position.
+    The angle is scanned, with the sum of the greatest motions of the two.
+    """
+    if stream is None:
+        stream = make_stream(input_params)
+    parts = []
+    mean_rate = 0.0
+    max_rate = 0.0
+    for sign, part in ((1.0, first), (-1.0, second)):
+        if isinstance(part, str):
+            if part == "LAGNA":
+                raise ValueError("LAGNA has no greatest motion to scan with")
+            part = make_angle(part, input_params, stream)
+            mean_rate += sign * part["mean_rate"]
+            max_rate += abs(part["max_rate"])
+        parts.append(part)
+
+    angle = dict()
+    angle["name"] = "-".join(
+        part["name"] if isinstance(part, dict) else f"{part:g}" for part in parts
+    )
+    angle["stream"] = stream
+    angle["ist_offset_days"] = stream["ist_offset_days"]
+    angle["mean_rate"] = mean_rate
+    angle["max_rate"] = max_rate
+    angle["monotonic"] = False
+    angle["evals"] = 0
+    angle["parts"] = parts
+    return angle
+
+
+def make_function_angle(name, function, input_params, mean_rate, max_rate=None,
+                        stream=None):
+    """
+    Return the angle (dict) given by function(ist_days), in degrees, for
+    one the named angles do not cover, such as a body's place among the
+    bhavas.  The function should evaluate the model on the stream (a new one
+    for the place of input_params by default), which the angle carries.
+    With no max_rate, the angle must only move one way, at about mean_rate
+    degrees a day, stepping no more than LAGNA does; otherwise it is scanned.
+    """
+    if stream is None:
+        stream = make_stream(input_params)
+
+    angle = dict()
+    angle["name"] = name
+    angle["stream"] = stream
+    angle["ist_offset_days"] = stream["ist_offset_days"]
+    angle["mean_rate"] = mean_rate
+    angle["max_rate"] = max_rate
+    angle["monotonic"] = max_rate is None
+    angle["max_step_degs"] = _MAX_LAGNA_STEP_DEGS
+    angle["step_degs"] = _MAX_LAGNA_STEP_DEGS
+    angle["min_rate"] = None
+    angle["evals"] = 0
+    angle["function"] = function
+    return angle
+
+
+def get_stream_point(stream, ist_days, moon=True):
+    """
+    Return the evaluation (dict: time, sun and, with moon=True, moon
+    params) at the given IST days from the stream, and whether the model
+    had to be evaluated for it
+    """
+    place = stream["place"]
+    cache = stream["cache"]
+    point = cache.get(ist_days)
+    evaluated = point is None
+    if evaluated:
+        time_params = fn.make_time_params(
+            ist_days - stream["ist_offset_days"],
+            stream["ist_offset_days"],
+            stream["local_offset_days"],
+        )
+        point = {"time": time_params, "sun": fn.get_sun_core(place, time_params)}
+        cache[ist_days] = point
+        stream["evals"] += 1
+        if len(cache) > _STREAM_CACHE_SIZE:
+            cache.popitem(last=False)
+    else:
+        cache.move_to_end(ist_days)
+    if moon and "moon" not in point:
+        point["moon"] = fn.get_moon_params(place, point["sun"])
+        evaluated = True
+    return point, evaluated
+
+
+def get_angle_degs(angle, ist_days):
+    """
+    Return the angle (degrees) at the given IST days; counts one evaluation
+    unless the stream already had it
+    """
+    if "parts" in angle:
+        degs = []
+        for part in angle["parts"]:
+            if isinstance(part, dict):
+                evals_before = part["evals"]
+                degs.append(get_angle_degs(part, ist_days))
+                angle["evals"] += part["evals"] - evals_before
+            else:
+                degs.append(part)
+        return fn.find_diff_degs(degs[0], degs[1])
+    if "function" in angle:
+        angle["evals"] += 1
+        return angle["function"](ist_days)
+
+    name = angle["name"]
+    stream = angle["stream"]
+    point, evaluated = get_stream_point(
+        stream, ist_days, moon=name not in ("SUN", "LAGNA")
+    )
+    # A planet is evaluated afresh even when the Sun and Moon are cached
+    if evaluated or name in cn.planet_dict:
+        angle["evals"] += 1
+    sun_params = point["sun"]
+
+    if name == "SUN":
+        return sun_params["true_long"]
+    if name == "LAGNA":
+        return fn.get_lagn_params(stream["place"], sun_params)["lagn"]
+
+    moon_params = point["moon"]
+    if name == "MOON":
+        return moon_params["moon"]
+    if name == "RAHU":
+        return moon_params["rahu"]
+    if name == "MOON-SUN":
+        return fn.find_diff_degs(moon_params["moon"], sun_params["true_long"])
+    if name == "SUN+MOON":
+        return fn.find_sum_degs([moon_params["moon"], sun_params["true_long"]])
+
+    planet_params = fn.get_planet_params(
+        cn.planet_dict[name],
+        point["time"],
+        sun_params["true_long"],
+        sun_params["hvel"],
+        sun_params["rad"],
+        moon_params["ketu"],
+        sun_params["net_corr"],
+    )
+    return planet_params["true_long"]
+
+
+def _find_step_back(angle, dirn, lo_days, lo_degs, hi_days, max_step_degs):
+    """
+    Return (days, degrees) just before and (days, degrees) just after the
+    step back of a one-way angle between lo_days and hi_days, by bisection
+    """
+    for _ in range(_MAX_ITERATIONS):
+        if hi_days - lo_days <= _STEP_DAYS:
+            break
+        mid_days = (lo_days + hi_days) / 2.0
+        mid_degs = get_angle_degs(angle, mid_days)
+        travel = (dirn * (mid_degs - lo_degs)) % cn.full_circle
+        if travel > cn.full_circle - max_step_degs:
+            hi_days = mid_days
+        else:
+            lo_days, lo_degs = mid_days, mid_degs
+    return lo_days, lo_degs, hi_days, get_angle_degs(angle, hi_days)
+
+
+def get_flip_end(angle, ist_days):
+    """
+    Return the instant (IST days) just past the end of one of the Moon's
+    flips, ahead or back, if the angle is inside one at ist_days: off by
+    more than _MIN_JUMP_DEGS, at its mean motion, from its values
+    _SPIKE_DAYS before and after.  Return ist_days otherwise.
+    """
+    rate = angle["mean_rate"]
+    before_days = ist_days - _SPIKE_DAYS
+    before_degs = get_angle_degs(angle, before_days)
+    ist_degs = get_angle_degs(angle, ist_days)
+    after_degs = get_angle_degs(angle, ist_days + _SPIKE_DAYS)
+    jump_degs = rate * _SPIKE_DAYS
+    for lo_degs, hi_degs in ((before_degs, ist_degs), (ist_degs, after_degs)):
+        if abs(fn._wrap_diff_degs(hi_degs, lo_degs) - jump_degs) <= _MIN_JUMP_DEGS:
+            return ist_days
+
+    def is_off_course(days):
+        course_degs = before_degs + rate * (days - before_days)
+        off_degs = fn._wrap_diff_degs(get_angle_degs(angle, days), course_degs)
+        return abs(off_degs) > _MIN_JUMP_DEGS
+
+    lo_days, hi_days = ist_days, ist_days + _SPIKE_DAYS
+    for _ in range(_MAX_ITERATIONS):
+        if hi_days - lo_days <= _STEP_DAYS:
+            break
+        mid_days = (lo_days + hi_days) / 2.0
+        if is_off_course(mid_days):
+            lo_days = mid_days
+        else:
+            hi_days = mid_days
+    return hi_days
+
+
+def _get_spike_end(angle, ist_days, tol_days):
+    """
+    Return the instant just past the step back, if the one-way angle, having
+    jumped at ist_days, steps back within _SPIKE_DAYS (one of the Moon's
+    flips); None if it does not
+    """
+    dirn = 1.0 if angle["mean_rate"] > 0 else -1.0
+    max_step_degs = angle["max_step_degs"]
+    after_days = ist_days + tol_days
+    after_degs = get_angle_degs(angle, after_days)
+    check_days = ist_days + _SPIKE_DAYS
+    travel = (dirn * (get_angle_degs(angle, check_days) - after_degs)) % cn.full_circle
+    if travel <= cn.full_circle - max_step_degs:
+        return None
+    step = _find_step_back(angle, dirn, after_days, after_degs, check_days, max_step_degs)
+    return step[2]
+
+
+def _bracket_monotonic(angle, target_degs, start_days, end_days, steps_back):
+    """
+    Return (lo, hi, offset at lo, offset at hi) around the first crossing
+    of a one-way angle at or after start_days; None if there is none before
+    end_days.  Offsets are the angle less the target, wrapped to +-180.
+    The instants just past the steps back of the model passed over on the
+    way are added to steps_back (list).
+    """
+    dirn = 1.0 if angle["mean_rate"] > 0 else -1.0
+    rate = abs(angle["mean_rate"])
+    max_step_degs = angle["max_step_degs"]
+    min_rate = angle["min_rate"]
+
+    lo_days = start_days
+    lo_degs = get_angle_degs(angle, lo_days)
+    # Distance still to travel, in the direction of motion
+    remaining = (dirn * (target_degs - lo_degs)) % cn.full_circle
+    if remaining == 0.0:
+        return lo_days, lo_days, 0.0, 0.0
+
+    for _ in range(_MAX_ITERATIONS):
+        if lo_days >= end_days:
+            return None
+        step_degs = min(remaining * _OVERSHOOT, angle["step_degs"])
+        hi_days = min(lo_days + step_degs / rate, end_days)
+        hi_degs = get_angle_degs(angle, hi_days)
+        travel = (dirn * (hi_degs - lo_degs)) % cn.full_circle
+        if travel > cn.full_circle - max_step_degs:
+            # Moved back, across a step of the model (as when lo is inside
+            # one of the Moon's flips): unless the target was reached before
+            # the step, go on from just past it
+            step = _find_step_back(angle, dirn, lo_days, lo_degs, hi_days, max_step_degs)
+            travel = (dirn * (step[1] - lo_degs)) % cn.full_circle
+            if travel < remaining:
+                lo_days, lo_degs = step[2], step[3]
+                steps_back.append(lo_days)
+                remaining = (dirn * (target_degs - lo_degs)) % cn.full_circle
+                if remaining == 0.0:
+                    return lo_days, lo_days, 0.0, 0.0
+                continue
+            hi_days, hi_degs = step[0], step[1]
+        elif (
+            min_rate is not None
+            and hi_days - lo_days > _MIN_SCAN_DAYS
+            and travel < min_rate * (hi_days - lo_days)
+        ):
+            # Too short: a step back may be hidden within the step
+            rate *= 4.0
+            continue
+        if travel >= remaining:
+            lo_offset = fn._wrap_diff_degs(lo_degs, target_degs)
+            hi_offset = fn._wrap_diff_degs(hi_degs, target_degs)
+            if abs(hi_offset - lo_offset) < 180.0:
+                return lo_days, hi_days, lo_offset, hi_offset
+            # Moved much faster than predicted: retry with a shorter step
+            rate *= 4.0
+            continue
+        if travel > 0.0:
+            rate = travel / (hi_days - lo_days)
+        remaining -= travel
+        lo_days, lo_degs = hi_days, hi_degs
+    return None
+
+
+def _bracket_scan(angle, target_degs, start_days, end_days):
+    """
+    Return (lo, hi, offset at lo, offset at hi) around the first crossing,
+    either way, at or after start_days; None if there is none before
+    end_days.  Steps are short enough that the angle cannot reach the
+    target within one at its greatest motion.
+    """
+    max_rate = abs(angle["max_rate"])
+
+    lo_days = start_days
+    lo_offset = fn._wrap_diff_degs(get_angle_degs(angle, lo_days), target_degs)
+    if lo_offset == 0.0:
+        return lo_days, lo_days, 0.0, 0.0
+
+    while lo_days < end_days:
+        step_days = max(abs(lo_offset) / max_rate, _MIN_SCAN_DAYS)
+        hi_days = min(lo_days + step_days, end_days)
+        hi_offset = fn._wrap_diff_degs(get_angle_degs(angle, hi_days), target_degs)
+        # A change of sign across +-180 is the opposite point, not the target
+        if (lo_offset < 0.0) != (hi_offset < 0.0) and abs(hi_offset - lo_offset) < 180.0:
+            return lo_days, hi_days, lo_offset, hi_offset
+        lo_days, lo_offset = hi_days, hi_offset
+    return None
+
+
+def _refine(angle, target_degs, bracket, tol_days):
+    """
+    Return the crossing within the bracket, to within tol_days, by regula
+    falsi (Illinois variant) safeguarded with bisection, and the change of
+    the angle (degrees) across the final bracket
+    """
+    lo_days, hi_days, lo_offset, hi_offset = bracket
+    # The offsets at the ends, before the Illinois halving
+    lo_value, hi_value = lo_offset, hi_offset
+    widths = [hi_days - lo_days]
+    side = 0
+    while hi_days - lo_days > tol_days:
+        days = lo_days - lo_offset * (hi_days - lo_days) / (hi_offset - lo_offset)
+        # Bisect when the secant falls at an end of the bracket, or has not
+        # halved it in two steps (as at a step of the model)
+        bisect = len(widths) > 2 and widths[-1] > widths[-3] / 2.0
+        if bisect or not lo_days < days < hi_days:
+            days = (lo_days + hi_days) / 2.0
+            side = 0
+        # Keep tol_days/2 from the ends, so a point landing just beside the
+        # crossing is followed by one just across it
+        days = min(max(days, lo_days + tol_days / 2.0), hi_days - tol_days / 2.0)
+        offset = fn._wrap_diff_degs(get_angle_degs(angle, days), target_degs)
+        if offset == 0.0:
+            return days, 0.0
+        if (offset < 0.0) == (lo_offset < 0.0):
+            lo_days, lo_offset, lo_value = days, offset, offset
+            if side == -1:
+                hi_offset /= 2.0
+            side = -1
+        else:
+            hi_days, hi_offset, hi_value = days, offset, offset
+            if side == 1:
+                lo_offset /= 2.0
+            side = 1
+        widths.append(hi_days - lo_days)
+    return (lo_days + hi_days) / 2.0, abs(hi_value - lo_value)
+
+
+def find_crossing(angle, target_degs, start_days, end_days, tol_days=DEFAULT_TOL_DAYS):
+    """
+    Return the first crossing of target_degs by the angle within the window
+    (IST days) as a dict: IST days, datetime on the clock of the place,
+    direction of motion (+1 or -1), the instants (IST days) just past the
+    steps back of a one-way angle before it, and the model evaluations it
+    took.  Return None when the angle does not cross the target in the
+    window.
+    """
+    target_degs = target_degs % cn.full_circle
+    evals_before = angle["evals"]
+    steps_back = []
+    while True:
+        if angle["monotonic"]:
+            bracket = _bracket_monotonic(angle, target_degs, start_days, end_days, steps_back)
+        else:
+            bracket = _bracket_scan(angle, target_degs, start_days, end_days)
+        if bracket is None:
+            return None
+        ist_days, jump_degs = _refine(angle, target_degs, bracket, tol_days)
+        if not angle["monotonic"] or jump_degs < _MIN_JUMP_DEGS:
+            break
+        spike_end = _get_spike_end(angle, ist_days, tol_days)
+        if spike_end is None:
+            break
+        # Crossed by one of the model's flips: if the angle is past the
+        # target after it, it crossed during the flip, where its course
+        # from before the flip to after it does; otherwise it crosses later
+        dirn = 1.0 if angle["mean_rate"] > 0 else -1.0
+        end_offset = fn._wrap_diff_degs(get_angle_degs(angle, spike_end), target_degs)
+        if dirn * end_offset >= 0.0:
+            before_offset = fn._wrap_diff_degs(
+                get_angle_degs(angle, ist_days - tol_days), target_degs
+            )
+            fraction = before_offset / (before_offset - end_offset)
+            ist_days += fraction * (spike_end - ist_days)
+            break
+        start_days = spike_end
+    if angle["monotonic"]:
+        direction = 1 if angle["mean_rate"] > 0 else -1
+    else:
+        direction = 1 if bracket[3] > bracket[2] else -1
+    civil_days = ist_days - angle["ist_offset_days"]
+
+    crossing = dict()
+    crossing["ist_days"] = ist_days
+    crossing["datetime"] = fn.get_datetime_from_days(civil_days)
+    crossing["direction"] = direction
+    crossing["steps_back"] = steps_back
+    crossing["evals"] = angle["evals"] - evals_before
+    return crossing
+
+
+def find_crossings(angle, target_degs, start_days, end_days, tol_days=DEFAULT_TOL_DAYS):
+    """
+    Return the list of all crossings (see find_crossing) of target_degs by
+    the angle within the window (IST days), in time order
+    """
+    crossings = []
+    while start_days < end_days:
+        crossing = find_crossing(angle, target_degs, start_days, end_days, tol_days)
+        if crossing is None:
+            break
+        crossings.append(crossing)
+        # Resume just past this crossing
+        start_days = crossing["ist_days"] + max(tol_days, _MIN_SCAN_DAYS / 60.0)
+    return crossings
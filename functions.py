@@ -1,6 +1,6 @@
 import datetime as dt
+import functools
 import math
-import re
 
 import constants as cn
 
@@ -22,52 +22,317 @@ def find_diff_degs(deg1, deg2):
     return deg_result
 
 
-def get_time_in_IST(in_datetime, diff_from_gst_in_sec, dirn):
+def get_days_from_epoch(in_datetime):
     """
-    Convert given time to Indian Standard Time (datetime type)
-    Input: Local Time (datetime type), Difference from GST in seconds, E/W dirn
+    Return the days (fractional) since Epoch Sun Rise, given a datetime
     """
-    # get_local_time converts to local time, given IST
-    # get_time_in_IST converts to IST, given local time
-    if re.match(r"w|(west)", dirn, re.IGNORECASE):
+    return (in_datetime - cn.epoch_sun_rise) / dt.timedelta(days=1)
+
+
+def get_datetime_from_days(epoch_days):
+    """
+    Return the datetime, given the days since Epoch Sun Rise
+    """
+    return cn.epoch_sun_rise + dt.timedelta(days=epoch_days)
+
+
+def get_offset_timedelta(offset_days):
+    """
+    Return the timedelta of an offset given in days, to the microsecond
+    """
+    return dt.timedelta(microseconds=round(offset_days * cn.seconds_in_day * 1e6))
+
+
+def get_clock_datetimes(time_params, civil_time=None):
+    """
+    Return the IST and the local mean time of the float time core as
+    datetimes.  They are built from the civil time (a datetime, if given)
+    and the two offsets, as in the reference program: days since Epoch are
+    good only to about a microsecond, and IST and local days carry the sum.
+    """
+    if civil_time is None:
+        civil_time = get_datetime_from_days(time_params["civil_days"])
+    ist_time = civil_time + get_offset_timedelta(time_params["ist_offset_days"])
+    local_time = ist_time + get_offset_timedelta(time_params["local_offset_days"])
+    return ist_time, local_time
+
+
+def is_west(dirn):
+    """
+    Return True for a West direction: "W" or "West" in any case, as in
+    input_params (or a birth_input.BirthInput)
+    """
+    # Same as re.match(r"w|(west)", dirn, re.IGNORECASE), without the regex
+    return dirn[:1] in ("w", "W")
+
+
+def is_south(dirn):
+    """
+    Return True for a South direction: "S" or "South" in any case
+    """
+    return dirn[:1] in ("s", "S")
+
+
+def get_west(input_params):
+    """
+    Return True for a place west of Greenwich: the flag of a
+    birth_input.BirthInput, set once when it is made, or else the long_dirn
+    of input_params
+    """
+    west = getattr(input_params, "west", None)
+    return is_west(input_params["long_dirn"]) if west is None else west
+
+
+def get_south(input_params):
+    """
+    Return True for a place south of the equator: the flag of a
+    birth_input.BirthInput, or else the lat_dirn of input_params
+    """
+    south = getattr(input_params, "south", None)
+    return is_south(input_params["lat_dirn"]) if south is None else south
+
+
+def get_ist_offset_days(diff_from_gst_in_sec, west):
+    """
+    Return the offset in days that converts a given local time to IST
+    Input: Difference from GST in seconds, True for a place West (get_west)
+    """
+    # get_local_offset_days converts to local time, given IST
+    # get_ist_offset_days converts to IST, given local time
+    if west:
         diff_from_gst_in_sec = -diff_from_gst_in_sec
     time_adj_sec = cn.ist_offset_in_sec - diff_from_gst_in_sec
-    ist_time = in_datetime + dt.timedelta(0, time_adj_sec)
-    return ist_time
+    return time_adj_sec / cn.seconds_in_day
 
 
-def get_local_time(ist_time, local_longitude, dirn):
+def get_local_offset_days(local_longitude, west):
     """
-    Convert Indian Standard Time to local time (datetime type)
-    Input: IST (datetime type), local longitude, E/W dirn
-    This function is NOT an inverse function of get_time_in_IST
-    get_local_time gives the exact time based on the longitude
+    Return the offset in days that converts Indian Standard Time to local time
+    Input: local longitude, True for a place West (get_west)
+    This is NOT the inverse of get_ist_offset_days; the local time is the
+    exact time based on the longitude, kept to the whole second
     """
-    # get_local_time converts to local time, given IST
-    # get_time_in_IST converts to IST, given local time
-    if re.match(r"w|(west)", dirn, re.IGNORECASE):
+    if west:
         local_longitude = -local_longitude
     diff_longitude = cn.IST_longitude - local_longitude
     diff_time_in_sec = diff_longitude * cn.deg_angle_to_time_sec
-    localtm = ist_time - dt.timedelta(0, diff_time_in_sec)
-    return localtm
+    # As the reference program: the offset to the microsecond (a timedelta),
+    # and the local time from a whole second of IST floored to whole seconds
+    return math.floor(-round(diff_time_in_sec, 6)) / cn.seconds_in_day
 
 
-def get_years_elapsed(ist_time, epoch_time):
+def get_years_elapsed(ist_days, base_in_days=0.0):
     """
     Return time elapsed in years (fractional), since a given base date
-    Input: IST in datetime, base date in datetime
+    Input: IST in days since Epoch Sun Rise, days from the base date to Epoch
     """
     # Call this function using the following command for most needs
-    # get_years_elapsed(ist_time, cn.epoch)
-
-    time_elapsed = ist_time - epoch_time
-    years_elapsed = (
-        time_elapsed.days + time_elapsed.seconds / cn.seconds_in_day
-    ) / cn.solar_days_in_year
+    # get_years_elapsed(ist_days)
+    days_elapsed = ist_days + cn.epoch_sun_rise_in_days + base_in_days
+    years_elapsed = days_elapsed / cn.solar_days_in_year
     return years_elapsed
 
 
+def make_time_params(civil_days, ist_offset_days, local_offset_days):
+    """
+    Return the float time core (dict) for an instant
+    Input: Days since Epoch Sun Rise on the given (civil) clock, and the
+           offsets (days) from that clock to IST and from IST to local time
+    """
+    ist_days = civil_days + ist_offset_days
+    local_days = ist_days + local_offset_days
+
+    time_params = dict()
+    time_params["civil_days"] = civil_days
+    time_params["ist_days"] = ist_days
+    time_params["local_days"] = local_days
+    time_params["y_epoch"] = get_years_elapsed(ist_days)
+    time_params["ist_offset_days"] = ist_offset_days
+    time_params["local_offset_days"] = local_offset_days
+    return time_params
+
+
+# Two instants (IST days) closer than this are the same: the civil days of
+# the clocks of two places differ by whole seconds, rounded in the sum
+_SAME_INSTANT_DAYS = 1e-9
+
+
+def get_time_params(input_params, moment_params=None):
+    """
+    Return the float time core (dict) for the input time and place.
+    All times are days since Epoch Sun Rise (civil, IST and local mean time)
+    and y_epoch is the years elapsed since Epoch.  The solar, lunar and
+    planetary functions work on these floats; datetimes are made only for
+    the values handed back to the caller (see get_sun_params).
+    The civil time is always that of input_params, read to the whole second
+    as in the reference program; given the moment params
+    (get_moment_params), ValueError if it is not at their instant.
+    """
+    # Input time given in datetime format. This is an approximate local time
+    # For example, the time given by Indians is that of 82.5 E, which is not
+    # local to individual locations
+
+    # Two Steps:
+    # 1. Convert it to IST equivalent using the GST offset
+    # 2. Get the exact local time, based on the given local longitude
+    civil_days = get_days_from_epoch(input_params["in_datetime"].replace(microsecond=0))
+    west = get_west(input_params)
+    ist_offset_days = get_ist_offset_days(input_params["diff_from_gst_in_sec"], west)
+    local_offset_days = get_local_offset_days(input_params["long_degs"], west)
+    time_params = make_time_params(civil_days, ist_offset_days, local_offset_days)
+    if moment_params is not None:
+        if abs(time_params["ist_days"] - moment_params["ist_days"]) > _SAME_INSTANT_DAYS:
+            raise ValueError("The input time is not the instant of the moment")
+    return time_params
+
+
+def get_moment_params(input_params):
+    """
+    Return dictionary of the location-independent terms of a chart: those
+    driven by IST alone (precession, apse and node positions, the Jupiter
+    and Saturn perturbations), with the instant as IST days and years since
+    Epoch.  The instant is read from input_params: in_datetime and
+    diff_from_gst_in_sec, whose E/W sign is given by long_dirn.
+
+    The civil date and time are not among them, nor anything that follows
+    from them (sunrise, weekday, the Saka and Tamil dates), as the same
+    instant falls on another clock and often another date elsewhere.  Nor
+    are the longitudes of the Sun, Moon and planets: the model computes them
+    for the local mean time and corrects them by the net correction, which
+    depends on the latitude (charam) and longitude of the place.
+    """
+    ist_days = get_time_params(input_params)["ist_days"]
+    years_since_epoch = get_years_elapsed(ist_days)
+    day_terms = get_day_terms(ist_days)
+
+    moment_params = dict()
+    moment_params["ist_days"] = ist_days
+    moment_params["y_epoch"] = years_since_epoch
+    moment_params["prec"], moment_params["sun_apse"] = get_sun_moment(
+        years_since_epoch, day_terms
+    )
+    moment_params["planets"] = {
+        name: get_planet_moment(planet, ist_days, years_since_epoch, day_terms)
+        for name, planet in cn.planet_dict.items()
+    }
+    return moment_params
+
+
+# The precession and the apse and node positions are linear in the years
+# elapsed (see get_precession_degs, get_apse_position_degs and
+# get_node_position_degs).  Charts computed in bulk mostly fall on a few
+# dates, so their values at the start of each calendar day (00:00 IST) and
+# their rates are kept, least recently used day first out, and each instant
+# is evaluated from them exactly: the result agrees with the closed forms to
+# the last few bits.  The Jupiter and Saturn corrections are periodic and
+# are always evaluated at the instant.  The terms of a day are a pure
+# function of its number, kept by functools.lru_cache, which is safe to
+# share between threads.
+_DAY_CACHE_SIZE = 4096
+
+
+@functools.lru_cache(maxsize=_DAY_CACHE_SIZE)
+def _make_day_terms(day_num):
+    """
+    Return dictionary of the slow terms at the start of the given calendar
+    day (days since Epoch Sun Rise, counted from 00:00 IST), with the years
+    elapsed there: precession, apse and node terms before reduction mod 360
+    """
+    years_elapsed = get_years_elapsed(day_num - cn.epoch_sun_rise_in_days)
+    years_in_day = 1.0 / cn.solar_days_in_year
+    secs = cn.seconds_in_degree
+
+    day_terms = dict()
+    day_terms["y_epoch"] = years_elapsed
+    day_terms["prec"] = get_precession_degs(years_elapsed)
+    day_terms["sun_apse"] = (
+        cn.apse_position_at_epoch
+        + (cn.apse_movement_per_year_in_sec * years_elapsed) / secs
+    )
+
+    planets = dict()
+    for name, planet in cn.planet_dict.items():
+        # The node motion is taken as an absolute value, which is linear over
+        # the day unless it changes sign in it (once, early in 1900)
+        node_start = (planet.node_motion * years_elapsed) + 0.5
+        node_end = node_start + planet.node_motion * years_in_day
+        node_sign = None
+        if node_start * node_end > 0:
+            node_sign = math.copysign(1.0, node_start)
+        planets[name] = {
+            "apse": planet.mean_apse_at_epoch
+            + (planet.apse_motion * years_elapsed) / secs,
+            "node": node_start,
+            "node_sign": node_sign,
+        }
+    day_terms["planets"] = planets
+    return day_terms
+
+
+def get_day_terms(ist_days):
+    """
+    Return the slow terms (see _make_day_terms) of the calendar day of the
+    given IST days, from the per-day cache
+    """
+    return _make_day_terms(math.floor(ist_days + cn.epoch_sun_rise_in_days))
+
+
+def get_day_cache_info():
+    """
+    Return dictionary of the per-day cache counters: hits, misses, the days
+    held and the most it holds
+    """
+    cache_info = _make_day_terms.cache_info()
+    return {
+        "hits": cache_info.hits,
+        "misses": cache_info.misses,
+        "size": cache_info.currsize,
+        "max_size": cache_info.maxsize,
+    }
+
+
+def clear_day_cache():
+    """
+    Empty the per-day cache and reset its counters
+    """
+    _make_day_terms.cache_clear()
+
+
+def get_sun_moment(years_elapsed, day_terms):
+    """
+    Return the precession and the apse position of the Sun (degrees) at the
+    given years elapsed, from the slow terms of its day (get_day_terms)
+    """
+    years_in_day = years_elapsed - day_terms["y_epoch"]
+    precession_degs = day_terms["prec"] + (
+        cn.precession_per_year_in_sec * years_in_day
+    ) / cn.seconds_in_degree
+    apse_position_degs = (
+        day_terms["sun_apse"]
+        + (cn.apse_movement_per_year_in_sec * years_in_day) / cn.seconds_in_degree
+    ) % cn.full_circle
+    return precession_degs, apse_position_degs
+
+
+def shift_time_params(time_params, delta_days):
+    """
+    Return the float time core moved by the given number of days
+    """
+    return make_time_params(
+        time_params["civil_days"] + delta_days,
+        time_params["ist_offset_days"],
+        time_params["local_offset_days"],
+    )
+
+
+def get_midnight_days(civil_days):
+    """
+    Return the days since Epoch Sun Rise at 00:00 hours of the given day
+    """
+    esr_days = cn.epoch_sun_rise_in_days
+    return math.floor(civil_days + esr_days) - esr_days
+
+
 def get_precession_degs(years_elapsed):
     """
     Return the current precession in degrees
@@ -103,15 +368,6 @@ def get_mean_anomaly_degs(apse_position_degs, mean_long_planet_degs):
     return mean_anomaly_degs
 
 
-def get_days_from_epoch(localtm):
-    """
-    Return the days since Epoch Sun Rise, given local time in datetime type
-    """
-    time_elapsed = localtm - cn.epoch_sun_rise
-    epoch_days = time_elapsed.days + time_elapsed.seconds / cn.seconds_in_day
-    return epoch_days
-
-
 def get_equation_of_centre(e, mean_anomaly_degs):
     """
     Return the equation of center (mandaphalam) in seconds
@@ -217,14 +473,17 @@ def get_hour_angle(latitude_degs, trop_long_sun_degs):
     )
 
     if lat_rads > ltfi_rads:
-        lat_rads = ltfi_rads
-
-    hour_angle_rads = math.acos(
-        (-1.0 * math.tan(lat_rads) * math.sin(omega) * math.sin(tlsr))
-        / math.sqrt(
+        # Capped at ltfi_rads, where the ratio below is exactly +/-1 (the
+        # Sun grazes the horizon); the rounding of tan and acos there would
+        # move the hour angle by up to 1e-5 degrees, or out of acos's domain
+        cos_hour_angle = -math.copysign(1.0, math.sin(omega) * math.sin(tlsr))
+    else:
+        cos_hour_angle = (
+            -1.0 * math.tan(lat_rads) * math.sin(omega) * math.sin(tlsr)
+        ) / math.sqrt(
             1.0 - math.sin(omega) * math.sin(omega) * math.sin(tlsr) * math.sin(tlsr)
         )
-    )
+    hour_angle_rads = math.acos(min(max(cos_hour_angle, -1.0), 1.0))
 
     hour_angle_degs = hour_angle_rads * cn.degs_per_radian
     return hour_angle_degs
@@ -264,7 +523,6 @@ def get_pranam(trop_long_sun_degs):
 
 
 def get_sun_rise_set(
-    in_datetime,
     trop_long_sun_degs,
     mandaphalam_secs,
     mean_anomaly_degs,
@@ -297,20 +555,17 @@ def get_sun_rise_set(
     sunrise_sec = app_noon_sec - halfday_sec
     sunset_sec = app_noon_sec + halfday_sec
 
-    base_date = in_datetime.replace(hour=0, minute=0, second=0)
-    sunrise_time = base_date + dt.timedelta(seconds=sunrise_sec)
-    sunset_time = base_date + dt.timedelta(seconds=sunset_sec)
-    return sunrise_time, sunset_time
+    return sunrise_sec, sunset_sec
 
 
 def get_net_correction(
-    charam_degs, mandaphalam_secs, pranam_degs, longitude_degs, dirn
+    charam_degs, mandaphalam_secs, pranam_degs, longitude_degs, west
 ):
     """
     Return the net correction in minutes
-    Input: Charam, Mandaphalam, Pranam, Longitude and Direction (E or W)
+    Input: Charam, Mandaphalam, Pranam, Longitude and True for West (get_west)
     """
-    if re.match(r"w|(west)", dirn, re.IGNORECASE):
+    if west:
         longitude_degs = -longitude_degs
     mandaphalam_degs = mandaphalam_secs / cn.seconds_in_degree
     cha_man_pra = find_sum_degs([charam_degs, mandaphalam_degs, pranam_degs])
@@ -336,43 +591,30 @@ def sun_corrected_long(true_long_sun_degs, net_corr_min, helio_vel_degs):
     return corrected_true_long
 
 
-def get_sun_params(input_params):
-
-    # Input time given in datetime format. This is an approximate local time
-    # For example, the time given by Indians is that of 82.5 E, which is not
-    # local to individual locations
-
-    # Two Steps:
-    # 1. Convert it to IST equivalent using the GST offset
-    # 2. Get the exact local time, based on the given local longitude
-
-    # in_datetime = dt.datetime(2014, 9, 12, 17, 30)
-    # diff_from_gst_in_sec = 5 * 3600 + 30 * 60
-    # dirn = "E"
-    # longitude_degs = 78.2
-    # latitude_degs = 11.66
-    # lat_dir = "N"
-
-    in_datetime = input_params["in_datetime"]
-    diff_from_gst_in_sec = input_params["diff_from_gst_in_sec"]
+def get_sun_core(input_params, time_params, moment_params=None):
+    """
+    Return dictionary of sun parameters for the float time core.
+    Same as get_sun_params, but sunrise and sunset are days since Epoch Sun
+    Rise ("rise_days", "set_days") and no datetime objects are made.
+    """
     longitude_degs = input_params["long_degs"]
-    dirn = input_params["long_dirn"]
+    west = get_west(input_params)
     latitude_degs = input_params["lat_degs"]
     lat_dirn = input_params["lat_dirn"]
 
-    ist_time = get_time_in_IST(in_datetime, diff_from_gst_in_sec, dirn)
-    local_time = get_local_time(ist_time, longitude_degs, dirn)
-
-    years_since_epoch = get_years_elapsed(ist_time, cn.epoch)
-    precession_degs = get_precession_degs(years_since_epoch)
+    years_since_epoch = time_params["y_epoch"]
+    if moment_params is not None:
+        precession_degs = moment_params["prec"]
+        apse_posn_sun_degs = moment_params["sun_apse"]
+    else:
+        precession_degs, apse_posn_sun_degs = get_sun_moment(
+            years_since_epoch, get_day_terms(time_params["ist_days"])
+        )
 
-    epoch_days = get_days_from_epoch(local_time)
+    epoch_days = time_params["local_days"]
     rev_days = cn.sidereal_days_in_year
     msle = cn.mean_sun_long_at_epoch
     mean_long_sun_degs = get_mean_longitude(epoch_days, rev_days, msle)
-    apse_posn_sun_degs = get_apse_position_degs(
-        cn.apse_position_at_epoch, cn.apse_movement_per_year_in_sec, years_since_epoch
-    )
     mean_anom_sun_degs = get_mean_anomaly_degs(apse_posn_sun_degs, mean_long_sun_degs)
     mandaphalam_secs = get_equation_of_centre(cn.earth_eccentricity, mean_anom_sun_degs)
 
@@ -389,14 +631,13 @@ def get_sun_params(input_params):
     pranam_degs = get_pranam(trop_long_sun_degs)
 
     net_corr_min = get_net_correction(
-        charam_degs, mandaphalam_secs, pranam_degs, longitude_degs, dirn
+        charam_degs, mandaphalam_secs, pranam_degs, longitude_degs, west
     )
     true_long_sun_degs = sun_corrected_long(
         true_long_sun_degs, net_corr_min, helio_vel_degs
     )
 
-    sunrise_dt, sunset_dt = get_sun_rise_set(
-        in_datetime,
+    sunrise_sec, sunset_sec = get_sun_rise_set(
         trop_long_sun_degs,
         mandaphalam_secs,
         mean_anom_sun_degs,
@@ -404,10 +645,10 @@ def get_sun_params(input_params):
         pranam_degs,
         lat_dirn,
     )
+    midnight_days = get_midnight_days(time_params["civil_days"])
 
     sun_params = dict()
-    sun_params["ist_time"] = ist_time
-    sun_params["local_time"] = local_time
+    sun_params["time"] = time_params
     sun_params["y_epoch"] = years_since_epoch
     sun_params["prec"] = precession_degs
     sun_params["d_epoch"] = epoch_days
@@ -423,28 +664,55 @@ def get_sun_params(input_params):
     sun_params["charam"] = charam_degs
     sun_params["pranam"] = pranam_degs
     sun_params["net_corr"] = net_corr_min
-    sun_params["rise"] = sunrise_dt
-    sun_params["set"] = sunset_dt
+    sun_params["rise_secs"] = sunrise_sec
+    sun_params["set_secs"] = sunset_sec
+    sun_params["rise_days"] = midnight_days + sunrise_sec / cn.seconds_in_day
+    sun_params["set_days"] = midnight_days + sunset_sec / cn.seconds_in_day
+
+    return sun_params
+
+
+def get_sun_params(input_params, time_params=None, moment_params=None):
+    """
+    Return dictionary of sun parameters, with IST, local time, sunrise and
+    sunset as datetimes
+    Input: input params and optionally the float time core (get_time_params)
+           and the moment params (get_moment_params)
+    """
+    if time_params is None:
+        time_params = get_time_params(input_params, moment_params)
+
+    sun_params = get_sun_core(input_params, time_params, moment_params)
+
+    midnight_days = get_midnight_days(time_params["civil_days"])
+    base_date = get_datetime_from_days(midnight_days)
+    civil_time = input_params["in_datetime"].replace(microsecond=0)
+    if get_days_from_epoch(civil_time) != time_params["civil_days"]:
+        civil_time = None
+    sun_params["ist_time"], sun_params["local_time"] = get_clock_datetimes(
+        time_params, civil_time
+    )
+    sun_params["rise"] = base_date + dt.timedelta(seconds=sun_params["rise_secs"])
+    sun_params["set"] = base_date + dt.timedelta(seconds=sun_params["set_secs"])
 
     return sun_params
 
 
 def get_lagn_params(input_params, sun_params):
     lat_degs = input_params["lat_degs"]
-    lat_dirn = input_params["lat_dirn"]
     long_degs = input_params["long_degs"]
-    long_dirn = input_params["long_dirn"]
+    west = get_west(input_params)
 
-    local_time = sun_params["local_time"]
+    local_days = sun_params["d_epoch"]
     mean_long_sun_degs = sun_params["mean_long"]
     precession_degs = sun_params["prec"]
 
-    south_hemi = re.match(r"s|(south)", lat_dirn, re.IGNORECASE)  # True / False
-    lt_corr_degs = get_local_time_correction(local_time)
+    south_hemi = get_south(input_params)
+    lt_corr_degs = get_local_time_correction(local_days)
     ramc_degs = get_ramc(
         long_degs,
         mean_long_sun_degs,
-        long_dirn,
+        west,
         precession_degs,
         lt_corr_degs,
         south_hemi,
@@ -458,77 +726,167 @@ def get_lagn_params(input_params, sun_params):
     return lagn_params
 
 
-def _sun_triple(params):
-    """Helper: call get_sun_params and return (true_long, sunrise, sunset)."""
-    sp = get_sun_params(params)
-    return sp["true_long"], sp["rise"], sp["set"]
+def _wrap_diff_degs(deg1, deg2):
+    """
+    Return deg1 - deg2 wrapped to the range [-180, 180)
+    """
+    return (deg1 - deg2 + 180.0) % cn.full_circle - 180.0
 
 
-def calc_tamil_date(input_params, fine_tuning=True):
+def _first_true(pred, lo, hi, guess):
     """
-    Return Tamil Day, Month and Year
-    Input: Local Time
+    Return the smallest integer n in [lo, hi] for which pred(n) is True.
+    pred must be monotonic (False ... False True ... True) over the range and
+    pred(hi) must be True.  The guess and its neighbour on the indicated side
+    are probed first; bisection takes over when the guess is off.
     """
-    cur_params = input_params.copy()
-    original_time = cur_params["in_datetime"]
-    sun_long_pos, sunrise_time, sunset_time = _sun_triple(cur_params)
+    probes = [min(max(guess, lo), hi)]
+    first_probe = True
+    while lo < hi:
+        n = probes.pop() if probes else (lo + hi) // 2
+        if pred(n):
+            hi = n
+            if first_probe:
+                probes.append(max(n - 1, lo))
+        else:
+            lo = n + 1
+            if first_probe:
+                probes.append(min(n + 1, hi))
+        first_probe = False
+    return lo
 
-    if sunrise_time <= cur_params["in_datetime"] <= sunset_time:
-        # Move to just after sunset so Tamil month/day calculation uses sunset position
-        cur_params["in_datetime"] = sunset_time + dt.timedelta(0, 300)
-        sun_long_pos, sunrise_time, sunset_time = _sun_triple(cur_params)
 
-    tamil_month_num = int(sun_long_pos / cn.deg_in_house)
+def _sankranti_days_back(sun_params, tamil_month_num):
+    """
+    Return the estimated whole days from the given instant back to the local
+    Sankranti starting the month, from the precomputed ingress table.
+    Return None when the instant is outside the table.
+    """
+    import sankranti as sk  # sankranti builds its table from this module
 
-    # Target is the start of the current Tamil month (multiple of 30°)
-    target_pos = tamil_month_num * cn.deg_in_house
+    # The net correction shifts the local sun by net_corr_day days of motion,
+    # so move the local time by that much to compare with the table
+    net_corr_day = sun_params["net_corr"] / cn.min_angle_in_one_day
+    table_days = sun_params["d_epoch"] + net_corr_day
+    ingress_days = sk.find_ingress_days(table_days, tamil_month_num)
+    if ingress_days is None:
+        return None
+    return max(0, math.ceil(table_days - ingress_days))
 
-    # Go backward day by day until sun position is before the month boundary
-    tamil_day = 1
-    while sun_long_pos > target_pos:
-        if abs(sun_long_pos - target_pos) > 330:
-            sun_long_pos -= 360
-            break
-        cur_params["in_datetime"] -= dt.timedelta(1, 0)
-        tamil_day += 1
-        sun_long_pos, sunrise_time, sunset_time = _sun_triple(cur_params)
-
-    # Go forward minute by minute until sun crosses the month boundary
-    while sun_long_pos < target_pos:
-        if abs(sun_long_pos - target_pos) > 330:
-            sun_long_pos -= 360
-            break
-
-        saved_date = cur_params["in_datetime"].date()
-        cur_params["in_datetime"] += dt.timedelta(0, 60)
-
-        # If the day ticked over, decrement the tamil day count
-        if cur_params["in_datetime"].date() != saved_date:
-            tamil_day -= 1
 
-        sun_long_pos, sunrise_time, sunset_time = _sun_triple(cur_params)
+def _calc_tamil_day(input_params, time_params, fine_tuning, details=None):
+    """
+    Return Tamil Day and Month for the float time core (see calc_tamil_date)
+    """
+    # The Tamil day is the count of days since the Sankranti (the instant the
+    # corrected true longitude of the sun crosses a multiple of 30 degrees).
+    # The crossing is located on the same grid the C program walks: whole
+    # days backwards from the given time, then whole minutes forward.  The
+    # index searches below are seeded from the Sankranti table (or the sun's
+    # mean daily motion), so a date needs only a handful of solar
+    # computations.  Times are days since Epoch Sun Rise on the civil clock.
+    original_days = time_params["civil_days"]
+
+    sun_cache = dict()
+
+    def sun_at(civil_days):
+        if civil_days not in sun_cache:
+            delta_days = civil_days - original_days
+            cur_time = shift_time_params(time_params, delta_days)
+            sun_cache[civil_days] = get_sun_core(input_params, cur_time)
+        return sun_cache[civil_days]
 
-        if target_pos == 0:
-            sun_long_pos -= 360
+    def date_of(civil_days):
+        return math.floor(civil_days + cn.epoch_sun_rise_in_days)
 
-    cross_time = cur_params["in_datetime"]
-    _, _, sunset_at_cross = _sun_triple(cur_params)
+    sun_params = sun_at(original_days)
+    start_days = original_days
 
-    if cross_time > sunset_at_cross:
+    if sun_params["rise_days"] <= start_days <= sun_params["set_days"]:
+        # Move to just after sunset so Tamil month/day calculation uses sunset position
+        start_days = sun_params["set_days"] + 300 / cn.seconds_in_day
+        sun_params = sun_at(start_days)
+
+    sun_long_pos = sun_params["true_long"]
+
+    tamil_month_num = int(sun_long_pos / cn.deg_in_house)
+
+    # Target is the start of the current Tamil month (multiple of 30°)
+    target_pos = tamil_month_num * cn.deg_in_house
+    sun_degs_per_day = cn.sun_motion / cn.minutes_in_degree
+
+    def sun_offset(civil_days):
+        return _wrap_diff_degs(sun_at(civil_days)["true_long"], target_pos)
+
+    # Days back until the sun position is at or before the month boundary
+    def before_boundary(days_back):
+        return sun_offset(start_days - days_back) <= 0
+
+    days_guess = _sankranti_days_back(sun_params, tamil_month_num)
+    if days_guess is None:
+        days_guess = math.ceil(sun_offset(start_days) / sun_degs_per_day)
+    days_back = _first_true(before_boundary, 0, 40, days_guess)
+    walk_start = start_days - days_back
+
+    # Minutes forward from there until the sun crosses the month boundary.
+    # The crossing lies within one day, so interpolate between the two days.
+    minutes_in_day = 24 * 60
+
+    def after_boundary(minutes):
+        return sun_offset(walk_start + minutes / minutes_in_day) >= 0
+
+    mins_guess = 0
+    if days_back > 0:
+        lo_offset = sun_offset(walk_start)
+        hi_offset = sun_offset(walk_start + 1)
+        frac = -lo_offset / (hi_offset - lo_offset)
+        mins_guess = math.ceil(frac * minutes_in_day)
+    cross_mins = _first_true(after_boundary, 0, minutes_in_day, mins_guess)
+    cross_days = walk_start + cross_mins / minutes_in_day
+
+    # One day for each step back, less one for each midnight walked forward
+    tamil_day = 1 + days_back - (date_of(cross_days) - date_of(walk_start))
+
+    cross_set_days = sun_at(cross_days)["set_days"]
+    if cross_days > cross_set_days:
         tamil_day -= 1
+    if details is not None:
+        details["cross_days"] = cross_days
+        details["cross_set_days"] = cross_set_days
+        details["previous"] = False
 
     # Reload the original time for fine-tuning check
-    cur_params["in_datetime"] = original_time
-    _, sunrise_time, _ = _sun_triple(cur_params)
+    sunrise_days = sun_at(original_days)["rise_days"]
 
     if fine_tuning:
-        if cur_params["in_datetime"] < sunrise_time:
+        if original_days < sunrise_days:
             tamil_day -= 1
             if tamil_day == 0:
-                cur_params["in_datetime"] -= dt.timedelta(1, 0)
-                tamil_day, _, _ = calc_tamil_date(cur_params, fine_tuning=False)
+                prev_time = shift_time_params(time_params, -1)
+                tamil_day, _ = _calc_tamil_day(input_params, prev_time, False)
+                if details is not None:
+                    details["previous"] = True
+
+    return tamil_day, tamil_month_num
+
+
+def calc_tamil_date(input_params, fine_tuning=True, time_params=None, details=None):
+    """
+    Return Tamil Day, Month and Year
+    Input: Local Time (input params), and optionally its float time core and
+           a dict to fill with the details of the search: the civil days of
+           the Sankranti found on the minute grid ("cross_days") and of the
+           sunset that day ("cross_set_days"), and whether the day was
+           counted from the day before ("previous")
+    """
+    if time_params is None:
+        time_params = get_time_params(input_params)
+    tamil_day, tamil_month_num = _calc_tamil_day(
+        input_params, time_params, fine_tuning, details
+    )
 
     # Tamil year number (0-59 cycle)
+    original_time = input_params["in_datetime"]
     tamil_year_num = int(
         (original_time.year - cn.tamil_year_base) % cn.total_tamil_years
     )
@@ -618,7 +976,7 @@ def is_leap_year(given_year):
 def get_ramc(
     local_longitude,
     mean_long_sun_degs,
-    dirn,
+    west,
     precsn_birth_degs,
     lt_corr_degs,
     south_hemi,
@@ -626,7 +984,7 @@ def get_ramc(
     """
     Return RAMC in degrees
     """
-    if re.match(r"w|(west)", dirn, re.IGNORECASE):
+    if west:
         local_longitude = -local_longitude
 
     # The C code does not apply a separate longitudinal correction here;
@@ -643,22 +1001,19 @@ def get_ramc(
     return ramc_degs
 
 
-def get_local_time_correction(localtm):
+def get_local_time_correction(local_days):
     """
     Return Local Time Correction in degrees
-    Input: Local Time
+    Input: Local Time (days since Epoch Sun Rise)
     """
-    time_twelve = cn.time_twelve
-    time_twelve = time_twelve.replace(
-        day=localtm.day, month=localtm.month, year=localtm.year
-    )
-
-    time_diff = localtm - time_twelve
-
-    t1_time_seconds = time_diff.days * cn.seconds_in_day + time_diff.seconds
+    # Seconds from 12:00 hours of the local day (Epoch Sun Rise is at 06:00),
+    # floored to whole seconds as in the C code.  The local time of a chart is
+    # a whole second (see get_local_offset_days): it is first rounded to the
+    # millisecond, well above the rounding of the days it is carried in.
+    day_fraction = (local_days + cn.epoch_sun_rise_in_days) % 1.0
+    time_diff_sec = round((day_fraction - 0.5) * cn.seconds_in_day, 3)
 
-    if time_diff.days < 0:
-        t1_time_seconds = -t1_time_seconds
+    t1_time_seconds = abs(math.floor(time_diff_sec))
 
     # 1 second adjustment for every 6 minute movement (i.e every 360 seconds)
     # 12 * 60 = 720 minutes moved in 12 hours => adj of 120 seconds
@@ -669,7 +1024,7 @@ def get_local_time_correction(localtm):
     # Converting time into corresponding degrees
     lt_corr_degs = (t1_total_seconds / cn.seconds_in_day) * cn.full_circle
 
-    if localtm <= time_twelve:
+    if time_diff_sec <= 0:
         lt_corr_degs = -lt_corr_degs
 
     return lt_corr_degs
@@ -1071,7 +1426,7 @@ def get_moon_params(input_params, sun_params):
     Return dictionary with positions of Moon, Apse, Rahu and Ketu in degrees
     """
     long_degs = input_params["long_degs"]
-    long_dirn = input_params["long_dirn"]
+    west = get_west(input_params)
 
     mean_sun_degs = sun_params["mean_long"]
     epoch_days = sun_params["d_epoch"]
@@ -1096,7 +1451,7 @@ def get_moon_params(input_params, sun_params):
     mean_ketu_degs = find_sum_degs([mean_rahu_degs, 180])
 
     net_corr_mins = get_net_correction(
-        charam_degs, mandaphalam_secs, pranam_degs, long_degs, long_dirn
+        charam_degs, mandaphalam_secs, pranam_degs, long_degs, west
     )
 
     mmc = cn.moon_motion
@@ -1154,15 +1509,19 @@ def get_helio_velocity(net_corr_mins, ma_degs, e):
     return vel_degs
 
 
-def get_longitude_along_ecliptic(
-    epoch_node_degs, tlpd, inclination_rads, node_vel, years_elapsed
-):
+def get_node_position_degs(epoch_node_degs, node_vel, years_elapsed):
+    """
+    Return the current node position of a planet in degrees
+    """
     node_motion_secs = (node_vel * years_elapsed) + 0.5
     # find the absolute of the node_motion
     # Todo:  This could possibly be wrong!
     node_motion_secs = abs(node_motion_secs)
     node_motion_degs = node_motion_secs / 3600.0
-    cur_node_degs = find_diff_degs(epoch_node_degs, node_motion_degs)
+    return find_diff_degs(epoch_node_degs, node_motion_degs)
+
+
+def get_longitude_along_ecliptic(cur_node_degs, tlpd, inclination_rads):
     angle_node_planet_degs = find_diff_degs(tlpd, cur_node_degs)
     anp_rads = angle_node_planet_degs * cn.rads_per_degree
     dis_rads = math.atan(math.cos(inclination_rads) * math.tan(anp_rads))
@@ -1242,8 +1601,11 @@ def get_geo_longitude(
     return geo_vel_degs, true_long_planet_degs, planet_lat_degs
 
 
-def jupiter_correction(mean_long_degs, ist_time):
-    t = get_years_elapsed(ist_time, cn.jupiter_base)
+def jupiter_adjustment(ist_days):
+    """
+    Return the correction (degrees) to the mean longitude of Jupiter
+    """
+    t = get_years_elapsed(ist_days, cn.jupiter_base_in_days)
     h = 18.129 * (t - 241.75) - (41 + (11 / 60.0))
     sj = 0.4074926
 
@@ -1259,11 +1621,14 @@ def jupiter_correction(mean_long_degs, ist_time):
 
     adj_degs = adj_min / 60.0
 
-    return mean_long_degs + adj_degs
+    return adj_degs
 
 
-def saturn_correction(mean_long_degs, ist_time):
-    t = get_years_elapsed(ist_time, cn.saturn_base)
+def saturn_adjustment(ist_days):
+    """
+    Return the correction (degrees) to the mean longitude of Saturn
+    """
+    t = get_years_elapsed(ist_days, cn.saturn_base_in_days)
     x1 = 168.48 - 5.8945 * t
     x2 = 243.15 - 11.794 * t
     sj = 0.4074926
@@ -1278,15 +1643,13 @@ def saturn_correction(mean_long_degs, ist_time):
 
     adj_degs = adj_min / 60.0
 
-    return mean_long_degs + adj_degs
+    return adj_degs
 
 
-def get_seven_planets(sun_params, moon_params):
+def get_seven_planets(sun_params, moon_params, moment_params=None):
     planet_dict = cn.planet_dict
 
-    ist_time = sun_params["ist_time"]
-    years_elapsed = sun_params["y_epoch"]
-    epoch_days = sun_params["d_epoch"]
+    time_params = sun_params["time"]
     true_long_sun_degs = sun_params["true_long"]
     hvel_sun_degs = sun_params["hvel"]
     radius_vect_sun = sun_params["rad"]
@@ -1297,57 +1660,92 @@ def get_seven_planets(sun_params, moon_params):
     seven_planets = dict()
     for name in planet_dict.keys():
         planet = planet_dict[name]
+        planet_moment = None
+        if moment_params is not None:
+            planet_moment = moment_params["planets"][name]
         seven_planets[name] = get_planet_params(
             planet,
-            ist_time,
-            years_elapsed,
-            epoch_days,
+            time_params,
             true_long_sun_degs,
             hvel_sun_degs,
             radius_vect_sun,
             ketu_long,
             sun_net_corr,
+            planet_moment,
         )
 
     return seven_planets
 
 
+def get_planet_moment(planet, ist_days, years_elapsed, day_terms=None):
+    """
+    Return dictionary of the location-independent terms of a planet: apse
+    and node positions, and the correction to the mean longitude (None for
+    planets without one).  The apse and node come from the slow terms of
+    the day (get_day_terms), looked up if not given.
+    """
+    if day_terms is None:
+        day_terms = get_day_terms(ist_days)
+    day_planet = day_terms["planets"][planet.name]
+    years_in_day = years_elapsed - day_terms["y_epoch"]
+
+    mean_adj_degs = None
+    if planet.name == "JUPITER":
+        mean_adj_degs = jupiter_adjustment(ist_days)
+    if planet.name == "SATURN":
+        mean_adj_degs = saturn_adjustment(ist_days)
+
+    planet_moment = dict()
+    planet_moment["apse"] = (
+        day_planet["apse"] + (planet.apse_motion * years_in_day) / cn.seconds_in_degree
+    ) % cn.full_circle
+    if day_planet["node_sign"] is None:
+        planet_moment["node"] = get_node_position_degs(
+            planet.mean_node_at_epoch, planet.node_motion, years_elapsed
+        )
+    else:
+        node_motion_secs = day_planet["node_sign"] * (
+            day_planet["node"] + planet.node_motion * years_in_day
+        )
+        planet_moment["node"] = find_diff_degs(
+            planet.mean_node_at_epoch, node_motion_secs / 3600.0
+        )
+    planet_moment["mean_adj"] = mean_adj_degs
+    return planet_moment
+
+
 def get_planet_params(
     planet,
-    ist_time,
-    years_elapsed,
-    epoch_days,
+    time_params,
     true_long_sun_degs,
     hvel_sun_degs,
     radius_vect_sun,
     mean_ketu_degs,
     sun_net_corr,
+    planet_moment=None,
 ):
+    epoch_days = time_params["local_days"]
+    if planet_moment is None:
+        planet_moment = get_planet_moment(
+            planet, time_params["ist_days"], time_params["y_epoch"]
+        )
 
     lsma = planet.length_semi_major_axis
     eccentricity = planet.eccentricity
-    apse_motion = planet.apse_motion
-    node_motion = planet.node_motion
     daily_motion = planet.nc
 
-    mmae = planet.mean_apse_at_epoch
-    mmne = planet.mean_node_at_epoch
-
     orbit_degs = planet.orbit_inclination_degs
 
     mean_long_degs = get_mean_longitude(
         epoch_days, planet.rev_days, planet.mean_long_at_epoch
     )
 
-    if planet.name == "JUPITER":
-        mean_long_degs = jupiter_correction(mean_long_degs, ist_time)
-
-    if planet.name == "SATURN":
-        mean_long_degs = saturn_correction(mean_long_degs, ist_time)
+    if planet_moment["mean_adj"] is not None:
+        mean_long_degs = mean_long_degs + planet_moment["mean_adj"]
 
     mean_long_degs = add_correction(mean_long_degs, daily_motion, sun_net_corr)
 
-    apse_position_degs = get_apse_position_degs(mmae, apse_motion, years_elapsed)
+    apse_position_degs = planet_moment["apse"]
     mean_anomaly_degs = get_mean_anomaly_degs(apse_position_degs, mean_long_degs)
     mandaphalam_secs = get_equation_of_centre(eccentricity, mean_anomaly_degs)
     true_long_degs = get_true_longitude(mean_long_degs, mandaphalam_secs)
@@ -1357,7 +1755,7 @@ def get_planet_params(
     )
     inc_rads = orbit_degs * cn.rads_per_degree
     planet_node_degs, true_long_degs = get_longitude_along_ecliptic(
-        mmne, true_long_degs, inc_rads, node_motion, years_elapsed
+        planet_moment["node"], true_long_degs, inc_rads
     )
     planet_node_rads = planet_node_degs * cn.rads_per_degree
     helio_long_degs = true_long_degs  # save before geocentric conversion
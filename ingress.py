@@ -0,0 +1,372 @@
+"""
+ingress.py — Ingress calendar: when each graha enters a rasi, nakshatra or
+pada, over a range of dates at a place.
+
+Every rasi and nakshatra boundary is also a pada boundary (a pada is 3
+degrees 20 minutes), so the calendar records each pada ingress of each
+body, Sun through Ketu in GRAHA_NAMES order, with its instant and the
+direction of motion; the rasi and nakshatra ingresses are those at their
+boundaries.
+
+The search follows the solver in events.py, vectorised with batch.py: each
+body is sampled with a step in which, at its greatest motion
+(events.ANGLE_RATES), it covers a quarter of a pada, the boundaries crossed
+between samples are bracketed, and all brackets are bisected together.
+Two crossings of one boundary within a step, at a station, are not seen.
+The Moon's brief 90 degree flips in the model (see chebyshev.py) are
+dropped as outliers rather than reported as ingresses.  The model also
+jumps: the Moon steps some 13 degrees either way a few times a year, and
+the Sun and Mercury about a degree.  A jump is an ingress of the model: it
+is recorded once, at the instant of the step, into the pada it lands in,
+with the direction it moves in, and its kind is the largest unit that
+differs between the pada left and the pada entered.  After a step back the
+Moon enters its last few padas again.
+
+A calendar keeps, per body, a sorted array of IST days with the pada
+entered and the direction, so "where was Saturn on a date" and "when did it
+enter Meena" are a binary search.  save_calendar and load_calendar keep it
+in a compact .npz file.
+
+  python ingress.py --start-date 2024-01-01 --end-date 2025-01-01 \\
+      --lat 13.08 --long 80.27 --bodies SUN MARS --kind rasi
+"""
+
+import argparse
+import datetime as dt
+
+import numpy as np
+
+import birth_input as bi
+import chebyshev as ch
+import constants as cn
+import events as ev
+import functions as fn
+from constants import NAKSHATRA, RASI_NAMES
+
+# Sun through Ketu, in GRAHA_NAMES order
+BODIES = [
+    "SUN", "MOON", "MARS", "MERCURY", "JUPITER",
+    "VENUS", "SATURN", "URANUS", "NEPTUNE", "RAHU", "KETU",
+]
+
+PADA_DEGS = cn.full_circle / 108.0
+PADAS_IN_RASI = 9
+PADAS_IN_NAKSHATRA = 4
+KINDS = ("rasi", "nakshatra", "pada")
+
+DEFAULT_TOL_DAYS = 1e-6
+
+# Fraction of a pada a body may cover, at its greatest motion, in a step
+_STEP_PADAS = 0.25
+# Samples per call of the model (bounds the memory used)
+_CHUNK_SAMPLES = 1 << 18
+
+
+def _get_longitudes(place, body, ist_days):
+    if body == "KETU":
+        rahu_degs = ch.get_model_longitudes(place, ist_days, ["RAHU"])["RAHU"]
+        return np.mod(rahu_degs + 180.0, cn.full_circle)
+    return ch.get_model_longitudes(place, ist_days, [body])[body]
+
+
+def _get_step_days(body):
+    rate_name = "RAHU" if body == "KETU" else body
+    max_rate = abs(ev.ANGLE_RATES[rate_name][1])
+    return _STEP_PADAS * PADA_DEGS / max_rate
+
+
+def _drop_outliers(days, degs, step_degs):
+    """
+    Return the samples without the isolated ones that jump away from both
+    neighbours by more than the body can move (the Moon's flips)
+    """
+    back = np.abs(fn._wrap_diff_degs(degs[1:-1], degs[:-2]))
+    ahead = np.abs(fn._wrap_diff_degs(degs[2:], degs[1:-1]))
+    across = np.abs(fn._wrap_diff_degs(degs[2:], degs[:-2]))
+    bound = 2.0 * step_degs
+    outlier = (back > bound) & (ahead > bound) & (across <= 2.0 * bound)
+    keep = np.concatenate([[True], ~outlier, [True]])
+    return days[keep], degs[keep]
+
+
+def _bracket_crossings(days, degs, jump_degs):
+    """
+    Return the brackets (lo days, hi days, lo degs, hi degs, boundary index,
+    direction, jumped) of the pada boundaries crossed between consecutive
+    samples.  A move of
+    more than jump_degs gives a single bracket, at the first boundary it
+    crosses, with jumped set.
+    """
+    motion = fn._wrap_diff_degs(degs[1:], degs[:-1])
+    lo_pos = degs[:-1] / PADA_DEGS
+    hi_pos = lo_pos + motion / PADA_DEGS
+    # Boundaries passed, counted from the floor of the earlier position
+    lo_floor = np.floor(lo_pos)
+    hi_floor = np.floor(hi_pos)
+    count = np.abs(hi_floor - lo_floor).astype(int)
+    jumped = np.abs(motion) > jump_degs
+    count = np.where(jumped, np.minimum(count, 1), count)
+    idx = np.repeat(np.arange(len(motion)), count)
+    # k-th boundary passed within each interval (k = 1, 2, ...)
+    k = np.arange(len(idx)) - np.repeat(np.cumsum(count) - count, count) + 1
+    direction = np.where(motion[idx] > 0, 1, -1)
+    # Forward: boundaries lo_floor + k; backward: lo_floor - k + 1
+    boundary = np.where(direction > 0, lo_floor[idx] + k, lo_floor[idx] - k + 1)
+    boundary = np.mod(boundary, 108).astype(int)
+    return (
+        days[idx], days[idx + 1], degs[idx], degs[idx + 1], boundary, direction, jumped[idx]
+    )
+
+
+def _refine_crossings(place, body, lo_days, hi_days, lo_degs, hi_degs, boundary,
+                      direction, jump_degs, tol_days):
+    """
+    Return the instants the body crosses the boundaries, by bisecting all
+    brackets together.  A midpoint more than jump_degs from both ends of
+    its bracket is in one of the Moon's flips: the course from one end to
+    the other is taken there, so a boundary crossed during a flip is
+    crossed where the course crosses it.
+    """
+    boundary_degs = boundary * PADA_DEGS
+    width = np.max(hi_days - lo_days, initial=0.0)
+    iterations = max(int(np.ceil(np.log2(max(width, tol_days) / tol_days))), 0)
+    for _ in range(iterations):
+        mid_days = (lo_days + hi_days) / 2.0
+        mid_degs = _get_longitudes(place, body, mid_days)
+        flipped = (np.abs(fn._wrap_diff_degs(mid_degs, lo_degs)) > jump_degs) & (
+            np.abs(fn._wrap_diff_degs(hi_degs, mid_degs)) > jump_degs
+        )
+        course_degs = lo_degs + fn._wrap_diff_degs(hi_degs, lo_degs) / 2.0
+        mid_degs = np.where(flipped, course_degs, mid_degs)
+        offset = fn._wrap_diff_degs(mid_degs, boundary_degs)
+        passed = direction * offset >= 0.0
+        hi_days = np.where(passed, mid_days, hi_days)
+        hi_degs = np.where(passed, mid_degs, hi_degs)
+        lo_days = np.where(passed, lo_days, mid_days)
+        lo_degs = np.where(passed, lo_degs, mid_degs)
+    return (lo_days + hi_days) / 2.0
+
+
+def get_body_ingresses(place, body, start_days, end_days, tol_days=DEFAULT_TOL_DAYS):
+    """
+    Return the pada ingresses (dict of arrays, in time order: IST days, pada
+    entered 0-107, direction +1/-1) of a body within the window, and the
+    pada it is in at the start
+    """
+    step_days = _get_step_days(body)
+    step_degs = _STEP_PADAS * PADA_DEGS
+    chunk_days = step_days * _CHUNK_SAMPLES
+
+    found = {"days": [], "pada": [], "direction": []}
+    start_pada = None
+    chunk_start = start_days
+    while chunk_start < end_days:
+        chunk_end = min(chunk_start + chunk_days, end_days)
+        count = max(int(np.ceil((chunk_end - chunk_start) / step_days)), 1)
+        days = np.linspace(chunk_start, chunk_end, count + 1)
+        degs = _get_longitudes(place, body, days)
+        if start_pada is None:
+            start_pada = int(degs[0] // PADA_DEGS) % 108
+        days, degs = _drop_outliers(days, degs, step_degs)
+
+        lo_days, hi_days, lo_degs, hi_degs, boundary, direction, jumped = (
+            _bracket_crossings(days, degs, 2.0 * step_degs)
+        )
+        cross_days = _refine_crossings(
+            place, body, lo_days, hi_days, lo_degs, hi_degs, boundary, direction,
+            2.0 * step_degs, tol_days,
+        )
+        # Forward, the pada entered starts at the boundary; backward, it ends
+        # there; a jump lands in the pada of the later sample
+        pada = np.where(direction > 0, boundary, boundary - 1) % 108
+        landed = np.searchsorted(days, hi_days)
+        pada = np.where(jumped, (degs[landed] // PADA_DEGS) % 108, pada)
+        found["days"].append(cross_days)
+        found["pada"].append(pada.astype(np.int16))
+        found["direction"].append(direction.astype(np.int8))
+        chunk_start = chunk_end
+
+    ingresses = {key: np.concatenate(values) for key, values in found.items()}
+    order = np.argsort(ingresses["days"], kind="stable")
+    return {key: values[order] for key, values in ingresses.items()}, start_pada
+
+
+def build_calendar(input_params, start_days, end_days, bodies=BODIES,
+                   tol_days=DEFAULT_TOL_DAYS):
+    """
+    Return the ingress calendar (dict) for the bodies within the window (IST
+    days), at the place of input_params (lat_degs, lat_dirn, long_degs,
+    long_dirn)
+    """
+    place = ch.make_place(
+        input_params["lat_degs"],
+        input_params["lat_dirn"],
+        input_params["long_degs"],
+        input_params["long_dirn"],
+    )
+    calendar = dict()
+    calendar["lat_degs"] = place["lat_degs"]
+    calendar["long_degs"] = place["long_degs"]
+    calendar["start_days"] = start_days
+    calendar["end_days"] = end_days
+    calendar["bodies"] = dict()
+    for body in bodies:
+        ingresses, start_pada = get_body_ingresses(
+            place, body, start_days, end_days, tol_days
+        )
+        ingresses["start_pada"] = start_pada
+        calendar["bodies"][body] = ingresses
+    return calendar
+
+
+def get_boundary_kind(from_pada, to_pada):
+    """
+    Return the kind of the ingress from one pada (0-107) into another:
+    "rasi", "nakshatra" or "pada", the largest unit that changes
+    """
+    if from_pada // PADAS_IN_RASI != to_pada // PADAS_IN_RASI:
+        return "rasi"
+    if from_pada // PADAS_IN_NAKSHATRA != to_pada // PADAS_IN_NAKSHATRA:
+        return "nakshatra"
+    return "pada"
+
+
+def get_pada_position(pada):
+    """
+    Return dictionary with rasi, nakshatra (indexes) and pada (1-4) of a
+    pada index (0-107)
+    """
+    position = dict()
+    position["rasi"] = pada // PADAS_IN_RASI
+    position["nakshatra"] = pada // PADAS_IN_NAKSHATRA
+    position["pada"] = pada % PADAS_IN_NAKSHATRA + 1
+    return position
+
+
+def get_position(calendar, body, ist_days):
+    """
+    Return the position (see get_pada_position) of the body at the given IST
+    days, from the calendar
+    """
+    ingresses = calendar["bodies"][body]
+    if not calendar["start_days"] <= ist_days <= calendar["end_days"]:
+        raise ValueError(f"{body}: instant outside the calendar")
+    idx = np.searchsorted(ingresses["days"], ist_days, side="right") - 1
+    pada = ingresses["start_pada"] if idx < 0 else int(ingresses["pada"][idx])
+    return get_pada_position(pada)
+
+
+def find_ingresses(calendar, body, kind="rasi", index=None, start_days=None,
+                   end_days=None):
+    """
+    Return the list of ingresses (dicts: IST days, direction, kind of the
+    boundary, rasi, nakshatra, pada) of the body of the given kind, in time
+    order.  A rasi (or nakshatra) ingress also changes the nakshatra and
+    pada, so "pada" lists all of them.  index restricts the list to those
+    entering that rasi (or nakshatra, or pada index 0-107).
+    """
+    ingresses = calendar["bodies"][body]
+    days = ingresses["days"]
+    lo = 0 if start_days is None else np.searchsorted(days, start_days)
+    hi = len(days) if end_days is None else np.searchsorted(days, end_days)
+    rank = KINDS.index(kind)
+
+    found = []
+    for i in range(lo, hi):
+        pada = int(ingresses["pada"][i])
+        direction = int(ingresses["direction"][i])
+        from_pada = ingresses["start_pada"] if i == 0 else int(ingresses["pada"][i - 1])
+        boundary_kind = get_boundary_kind(from_pada, pada)
+        if KINDS.index(boundary_kind) > rank:
+            continue
+        position = get_pada_position(pada)
+        entered = pada if kind == "pada" else position[kind]
+        if index is not None and entered != index:
+            continue
+        entry = {"ist_days": float(days[i]), "direction": direction}
+        entry["kind"] = boundary_kind
+        entry.update(position)
+        found.append(entry)
+    return found
+
+
+def save_calendar(calendar, path):
+    """
+    Write the calendar to a compact .npz file
+    """
+    arrays = {
+        "place": np.array([calendar["lat_degs"], calendar["long_degs"]]),
+        "window": np.array([calendar["start_days"], calendar["end_days"]]),
+        "bodies": np.array(list(calendar["bodies"])),
+    }
+    for body, ingresses in calendar["bodies"].items():
+        arrays[f"{body}_days"] = ingresses["days"]
+        arrays[f"{body}_pada"] = ingresses["pada"]
+        arrays[f"{body}_direction"] = ingresses["direction"]
+        arrays[f"{body}_start_pada"] = np.array(ingresses["start_pada"])
+    np.savez(path, **arrays)
+
+
+def load_calendar(path):
+    """
+    Return the calendar read from a .npz file
+    """
+    with np.load(path) as data:
+        calendar = dict()
+        calendar["lat_degs"], calendar["long_degs"] = data["place"].tolist()
+        calendar["start_days"], calendar["end_days"] = data["window"].tolist()
+        calendar["bodies"] = dict()
+        for body in data["bodies"].tolist():
+            calendar["bodies"][body] = {
+                "days": data[f"{body}_days"],
+                "pada": data[f"{body}_pada"],
+                "direction": data[f"{body}_direction"],
+                "start_pada": int(data[f"{body}_start_pada"]),
+            }
+    return calendar
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rasi/nakshatra/pada ingresses")
+    parser.add_argument("--start-date", required=True, help="YYYY-MM-DD")
+    parser.add_argument("--end-date", required=True, help="YYYY-MM-DD")
+    bi.add_place_arguments(parser)
+    parser.add_argument("--bodies", nargs="+", default=BODIES, choices=BODIES)
+    parser.add_argument(
+        "--kind", default="rasi", choices=KINDS, help="narrowest ingress listed"
+    )
+    parser.add_argument("--save", help="also write the calendar to this .npz file")
+    args = parser.parse_args()
+
+    start_date = dt.datetime.fromisoformat(args.start_date)
+    input_params = bi.get_birth_input(parser, args, start_date)
+    ist_offset_days = fn.get_ist_offset_days(
+        input_params["diff_from_gst_in_sec"], fn.get_west(input_params)
+    )
+    start_days = fn.get_days_from_epoch(start_date)
+    end_days = fn.get_days_from_epoch(dt.datetime.fromisoformat(args.end_date))
+
+    calendar = build_calendar(
+        input_params, start_days + ist_offset_days, end_days + ist_offset_days,
+        args.bodies,
+    )
+    if args.save:
+        save_calendar(calendar, args.save)
+
+    rows = []
+    for body in args.bodies:
+        for entry in find_ingresses(calendar, body, args.kind):
+            rows.append((entry["ist_days"], body, entry))
+    rows.sort(key=lambda row: row[0])
+
+    for ist_days, body, entry in rows:
+        when = fn.get_datetime_from_days(ist_days - ist_offset_days)
+        name = RASI_NAMES[entry["rasi"]]
+        if entry["kind"] != "rasi":
+            name = f"{NAKSHATRA[entry['nakshatra']]} {entry['pada']}"
+        motion = "" if entry["direction"] > 0 else " (retrograde)"
+        print(f"{when:%Y-%m-%d %H:%M:%S}  {body:<8} {entry['kind']:<9} {name}{motion}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+"""
+lagna_times.py — Lagna timings: when each rasi rises at a place, from
+sunrise to the next sunrise.
+
+The lagna of the model is get_ascendant of the RAMC, and the RAMC is the
+mean Sun, the precession and the local time correction (get_ramc): none of
+the solar chain beyond the mean Sun.  The ascendant only moves forward as
+the RAMC does (below the polar circles), so each rasi boundary has one RAMC
+at which it rises, found by bisection.  The RAMC advances at a nearly
+constant rate (361 degrees a day of local time, plus the mean Sun, stepping
+back a degree at local midnight), so the instant it reaches that value is
+predicted to within seconds, and the exact lagna is bisected within a few
+minutes of it.  All the boundaries of a day, or of a year, are solved
+together with the batch engine.
+
+A day lists the rasi rising at sunrise (with the instant it rose, before
+sunrise) and the 12 (or 13, a sidereal day being shorter) that rise
+before the next sunrise.
+
+  python lagna_times.py --date 2024-01-15 --lat 13.08 --long 80.27
+  python lagna_times.py --year 2024 --lat 13.08 --long 80.27
+"""
+
+import argparse
+import datetime as dt
+
+import numpy as np
+
+import batch as bt
+import birth_input as bi
+import chebyshev as ch
+import constants as cn
+import events as ev
+import functions as fn
+from constants import RASI_NAMES
+
+DEFAULT_TOL_DAYS = ev.DEFAULT_TOL_DAYS
+
+# Beyond this latitude the ascendant does not advance steadily with the RAMC
+MAX_LAT_DEGS = 90.0 - cn.omega_rads * cn.degs_per_radian
+
+# RAMC motion (degrees a day) between local midnights: the local time
+# correction gains a second every 6 minutes, and the mean Sun moves on
+_RAMC_RATE = cn.full_circle * (1.0 + 1.0 / 360.0) + cn.full_circle / cn.sidereal_days_in_year
+# Mean RAMC motion, over the step back at local midnight
+_MEAN_RAMC_RATE = cn.full_circle + cn.full_circle / cn.sidereal_days_in_year
+# Newton steps on the RAMC, and the window (days) the lagna is bisected in
+_PREDICT_STEPS = 3
+_BRACKET_DAYS = 10.0 / (24.0 * 60.0)
+# Bisection steps for the RAMC at which a boundary rises (to 1e-9 degrees)
+_RAMC_ITERATIONS = 40
+# Past local midnight, after the lagna steps back
+_AFTER_MIDNIGHT_DAYS = 1e-8
+# Days searched before sunrise for the rising of the rasi running then
+_LOOKBACK_DAYS = 1.0
+
+
+def get_lagna(place, ist_days):
+    """
+    Return the lagna and RAMC (degrees; arrays) at the place (see
+    chebyshev.make_place) for an array of IST days, as get_lagn_params
+    """
+    cols = place["cols"]
+    ist_days = np.asarray(ist_days, dtype=float)
+    local_days = ist_days + place["local_offset_days"]
+    precession_degs = bt.get_precession_degs(bt.get_years_elapsed(ist_days))
+    mean_long_sun_degs = bt.get_mean_longitude(
+        local_days, cn.sidereal_days_in_year, cn.mean_sun_long_at_epoch
+    )
+    lt_corr_degs = bt.get_local_time_correction(local_days)
+    ramc_degs = bt.get_ramc(mean_long_sun_degs, precession_degs, lt_corr_degs, cols["south"])
+    lagn_degs = bt.get_ascendant(ramc_degs, cols["lat_degs"], precession_degs, cols["south"])
+    return lagn_degs, ramc_degs
+
+
+def _get_rising_ramc(place, lagn_degs, precession_degs):
+    """
+    Return the RAMC (degrees; array) at which the lagna is at lagn_degs
+    """
+    cols = place["cols"]
+
+    def lagna_from(ramc_degs):
+        degs = bt.get_ascendant(ramc_degs, cols["lat_degs"], precession_degs, cols["south"])
+        return bt.find_diff_degs(degs, base_degs)
+
+    # The lagna goes once round, steadily, as the RAMC goes from 0 to 360
+    base_degs = bt.get_ascendant(0.0, cols["lat_degs"], precession_degs, cols["south"])
+    target_degs = bt.find_diff_degs(lagn_degs, base_degs)
+    lo_degs = np.zeros(np.shape(target_degs))
+    hi_degs = np.full(np.shape(target_degs), cn.full_circle)
+    for _ in range(_RAMC_ITERATIONS):
+        mid_degs = (lo_degs + hi_degs) / 2.0
+        below = lagna_from(mid_degs) < target_degs
+        lo_degs = np.where(below, mid_degs, lo_degs)
+        hi_degs = np.where(below, hi_degs, mid_degs)
+    return (lo_degs + hi_degs) / 2.0
+
+
+def find_rasi_risings(place, start_days, end_days, tol_days=DEFAULT_TOL_DAYS):
+    """
+    Return the instants (IST days, sorted array) within the window each
+    rasi rises at the place, and the rasi (0-11) that rises at each
+    """
+    lat_degs = float(np.max(place["cols"]["lat_degs"]))
+    if lat_degs >= MAX_LAT_DEGS:
+        raise ValueError(f"Lagna timings need a latitude below {MAX_LAT_DEGS:.2f} degrees")
+
+    _, start_ramc = get_lagna(place, start_days)
+    turns = np.floor((end_days - start_days) * _MEAN_RAMC_RATE / cn.full_circle) + 2
+    rasi = np.tile(np.arange(12), int(turns))
+    turn = np.repeat(np.arange(int(turns)), 12)
+
+    # Predict from the mean RAMC motion, then from the motion between
+    # midnights at the precession of the predicted instants
+    precession_degs = bt.get_precession_degs(bt.get_years_elapsed(start_days))
+    ramc_degs = _get_rising_ramc(place, rasi * cn.deg_in_house, precession_degs)
+    ramc_ahead = bt.find_diff_degs(ramc_degs, start_ramc) + turn * cn.full_circle
+    days = start_days + ramc_ahead / _MEAN_RAMC_RATE
+    for _ in range(_PREDICT_STEPS):
+        precession_degs = bt.get_precession_degs(bt.get_years_elapsed(days))
+        ramc_degs = _get_rising_ramc(place, rasi * cn.deg_in_house, precession_degs)
+        _, cur_ramc = get_lagna(place, days)
+        days = days + fn._wrap_diff_degs(ramc_degs, cur_ramc) / _RAMC_RATE
+
+    keep = (days >= start_days - _BRACKET_DAYS) & (days < end_days + _BRACKET_DAYS)
+    days = days[keep]
+    rasi = rasi[keep]
+    target_degs = rasi * cn.deg_in_house
+
+    # Bisect the lagna itself; a bracket that misses the rising (as beside
+    # the step back at midnight) is widened
+    lo_days = days - _BRACKET_DAYS
+    hi_days = days + _BRACKET_DAYS
+    width_days = np.full(len(days), _BRACKET_DAYS)
+    for _ in range(8):
+        lo_offset = fn._wrap_diff_degs(get_lagna(place, lo_days)[0], target_degs)
+        hi_offset = fn._wrap_diff_degs(get_lagna(place, hi_days)[0], target_degs)
+        missed = (lo_offset >= 0.0) | (hi_offset < 0.0)
+        if not np.any(missed):
+            break
+        width_days = np.where(missed, width_days * 2.0, width_days)
+        lo_days = np.where(missed, days - width_days, lo_days)
+        hi_days = np.where(missed, days + width_days, hi_days)
+
+    # The lagna steps back a degree at local midnight; when that takes it
+    # back across the boundary, the rasi rises (for good) after midnight
+    esr_days = cn.epoch_sun_rise_in_days
+    local_offset_days = place["local_offset_days"]
+    midnight_days = np.floor(lo_days + local_offset_days + esr_days) + 1.0
+    midnight_days += _AFTER_MIDNIGHT_DAYS - esr_days - local_offset_days
+    at_midnight = midnight_days < hi_days
+    if np.any(at_midnight):
+        mid_offset = fn._wrap_diff_degs(get_lagna(place, midnight_days)[0], target_degs)
+        lo_days = np.where(at_midnight & (mid_offset < 0.0), midnight_days, lo_days)
+        hi_days = np.where(at_midnight & (mid_offset >= 0.0), midnight_days, hi_days)
+
+    while np.max(hi_days - lo_days, initial=0.0) > tol_days:
+        mid_days = (lo_days + hi_days) / 2.0
+        before = fn._wrap_diff_degs(get_lagna(place, mid_days)[0], target_degs) < 0.0
+        lo_days = np.where(before, mid_days, lo_days)
+        hi_days = np.where(before, hi_days, mid_days)
+
+    days = (lo_days + hi_days) / 2.0
+    inside = (days >= start_days) & (days < end_days)
+    order = np.argsort(days[inside], kind="stable")
+    return days[inside][order], rasi[inside][order]
+
+
+def _get_day_lagnas(rising_days, rising_rasi, rise_days, next_rise_days, ist_offset_days):
+    """
+    Return the list of rasis rising from the one running at sunrise to the
+    last that rises before the next sunrise, each with its start and end
+    """
+    first = int(np.searchsorted(rising_days, rise_days, side="right")) - 1
+    last = int(np.searchsorted(rising_days, next_rise_days, side="left"))
+    lagnas = []
+    for idx in range(max(first, 0), last):
+        end_days = rising_days[idx + 1] if idx + 1 < len(rising_days) else None
+        entry = dict()
+        entry["rasi"] = int(rising_rasi[idx])
+        entry["name"] = RASI_NAMES[entry["rasi"]]
+        entry["start"] = fn.get_datetime_from_days(rising_days[idx] - ist_offset_days)
+        entry["end"] = (
+            None if end_days is None
+            else fn.get_datetime_from_days(end_days - ist_offset_days)
+        )
+        entry["start_ist_days"] = float(rising_days[idx])
+        entry["end_ist_days"] = None if end_days is None else float(end_days)
+        lagnas.append(entry)
+    return lagnas
+
+
+def _get_sunrise_days(input_params, civil_noon_days, ist_offset_days):
+    """
+    Return the sunrise (IST days; array) of each day, given its noon on the
+    clock of the place
+    """
+    cols = bt.get_input_arrays(
+        {
+            "in_datetime": cn.epoch_sun_rise,
+            "diff_from_gst_in_sec": input_params.get("diff_from_gst_in_sec", cn.ist_offset_in_sec),
+            "lat_degs": input_params["lat_degs"],
+            "lat_dirn": input_params["lat_dirn"],
+            "long_degs": input_params["long_degs"],
+            "long_dirn": input_params["long_dirn"],
+        }
+    )
+    local_offset_days = fn.get_local_offset_days(
+        input_params["long_degs"], fn.get_west(input_params)
+    )
+    time_params = bt.make_time_params(civil_noon_days, ist_offset_days, local_offset_days)
+    return bt.get_sun_core(cols, time_params)["rise_days"] + ist_offset_days
+
+
+def get_lagna_times(input_params, year=None, tol_days=DEFAULT_TOL_DAYS):
+    """
+    Return the lagna timings for the date of input_params["in_datetime"] at
+    its place, or, given a year, the list of those of each day of the year.
+    The timings of a day (dict): sunrise, next sunrise (datetimes and IST
+    days) and the list of rasis rising in between, from the one running at
+    sunrise, each with its number, name and start and end (datetimes and
+    IST days).
+    """
+    ist_offset_days = fn.get_ist_offset_days(
+        input_params.get("diff_from_gst_in_sec", cn.ist_offset_in_sec),
+        fn.get_west(input_params),
+    )
+    if year is None:
+        first_day = input_params["in_datetime"].date()
+        day_count = 1
+    else:
+        first_day = dt.date(year, 1, 1)
+        day_count = (dt.date(year + 1, 1, 1) - first_day).days
+    first_noon = dt.datetime(first_day.year, first_day.month, first_day.day, 12)
+    civil_noon_days = fn.get_days_from_epoch(first_noon) + np.arange(day_count + 1)
+    rise_days = _get_sunrise_days(input_params, civil_noon_days, ist_offset_days)
+
+    place = ch.make_place(
+        input_params["lat_degs"],
+        input_params["lat_dirn"],
+        input_params["long_degs"],
+        input_params["long_dirn"],
+    )
+    rising_days, rising_rasi = find_rasi_risings(
+        place, rise_days[0] - _LOOKBACK_DAYS, rise_days[-1] + _LOOKBACK_DAYS, tol_days
+    )
+
+    timings = []
+    for idx in range(day_count):
+        day_timings = dict()
+        day_timings["date"] = first_day + dt.timedelta(days=idx)
+        day_timings["sunrise"] = fn.get_datetime_from_days(rise_days[idx] - ist_offset_days)
+        day_timings["next_sunrise"] = fn.get_datetime_from_days(
+            rise_days[idx + 1] - ist_offset_days
+        )
+        day_timings["rise_ist_days"] = float(rise_days[idx])
+        day_timings["next_rise_ist_days"] = float(rise_days[idx + 1])
+        day_timings["lagnas"] = _get_day_lagnas(
+            rising_days, rising_rasi, rise_days[idx], rise_days[idx + 1], ist_offset_days
+        )
+        timings.append(day_timings)
+    if year is None:
+        return timings[0]
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lagna timings, sunrise to sunrise")
+    when = parser.add_mutually_exclusive_group(required=True)
+    when.add_argument("--date", help="YYYY-MM-DD")
+    when.add_argument("--year", type=int)
+    bi.add_place_arguments(parser)
+    args = parser.parse_args()
+
+    if args.date:
+        in_datetime = dt.datetime.fromisoformat(args.date)
+    else:
+        in_datetime = dt.datetime(args.year, 1, 1)
+    input_params = bi.get_birth_input(parser, args, in_datetime)
+    if args.date:
+        timings = [get_lagna_times(input_params)]
+    else:
+        timings = get_lagna_times(input_params, args.year)
+
+    for day_timings in timings:
+        print(
+            f"{day_timings['date']}  sunrise {day_timings['sunrise']:%H:%M:%S}"
+            f"  next sunrise {day_timings['next_sunrise']:%Y-%m-%d %H:%M:%S}"
+        )
+        for entry in day_timings["lagnas"]:
+            print(
+                f"  {entry['name']:<12} {entry['start']:%Y-%m-%d %H:%M:%S}"
+                f"  to {entry['end']:%Y-%m-%d %H:%M:%S}"
+            )
+
+
+if __name__ == "__main__":
+    main()
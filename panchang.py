@@ -0,0 +1,230 @@
+"""
+panchang.py — End times of the thithi, nakshatra, yogam and karanam.
+
+For a date and place, get_panchang returns each element running at sunrise
+and those that begin before the next sunrise, with the instant each ends.
+The ends are the crossings of the element boundaries, found with the
+solver in events.py:
+
+  thithi      Moon - Sun       every 12 degrees
+  karanam     Moon - Sun       every 6 degrees
+  nakshatra   Moon             every 13 degrees 20 minutes
+  yogam       Sun + Moon       every 13 degrees 20 minutes
+
+All the solves of a day share one evaluation stream, so the Sun and Moon
+are evaluated once at each instant, and a thithi end is the karanam end
+found at the same boundary.  Given the panchang of the previous day, the
+elements running at sunrise (and their ends) are carried over from it, and
+only the later ends are searched for.
+
+The model's Moon has flips of a few minutes and a few steps (see
+chebyshev.py).  The elements at sunrise are read past a flip, and the
+elements a step crosses at once end together, at the step.
+"""
+
+import math
+
+import constants as cn
+import events as ev
+import functions as fn
+from constants import KARANAM, NAKSHATRA, THITHI, YOGAM
+
+# Angle, width of an element (degrees), and the number of elements
+ELEMENTS = {
+    "thithi": ("MOON-SUN", cn.full_circle / cn.total_thithis, 30),
+    "karanam": ("MOON-SUN", cn.full_circle / cn.total_thithis / 2.0, 60),
+    "nakshatra": ("MOON", cn.full_circle / 27.0, 27),
+    "yogam": ("SUN+MOON", cn.full_circle / cn.total_yogams, 27),
+}
+
+# Days searched for the end of an element from its start: a nakshatra lasts
+# up to about 27 hours, and a step back of the Moon (up to 14 degrees, see
+# chebyshev.py) can add a day to any element
+_SEARCH_DAYS = 3.0
+_SAME_INSTANT_DAYS = 1e-9
+# The element after a boundary is read off the angle this long (days) after
+# its crossing; a step of the model (see chebyshev.py) can cross a boundary
+# or two more at once, up to _MAX_STEP_ELEMENTS elements on
+_PAST_CROSSING_DAYS = 2.0 * ev.DEFAULT_TOL_DAYS
+_MAX_STEP_ELEMENTS = 3
+
+
+def get_element_name(element, num):
+    """
+    Return the name of an element, given its number (0-based slot of the
+    angle for the thithi and karanam)
+    """
+    if element == "thithi":
+        if num == 29:
+            return THITHI[15]  # Amavasya
+        return THITHI[num % 15]
+    if element == "karanam":
+        # The karanam running at the middle of the 6 degree slot
+        karanam_num = fn.get_yogam_karanam_thithi(0.0, (num + 0.5) * 6.0)[1]
+        return KARANAM[karanam_num]
+    if element == "nakshatra":
+        return NAKSHATRA[num]
+    return YOGAM[num]
+
+
+def _get_next_num(angle, width_degs, count, num, ist_days):
+    """
+    Return the number of the element that begins at ist_days, when num ends:
+    the next, unless a step of the model there crosses more boundaries or
+    goes back to an earlier element
+    """
+    angle_degs = ev.get_angle_degs(angle, ist_days + _PAST_CROSSING_DAYS)
+    next_num = math.floor(angle_degs / width_degs) % count
+    if 0 < (next_num - num) % count <= _MAX_STEP_ELEMENTS:
+        return next_num
+    if 0 < (num - next_num) % count <= _MAX_STEP_ELEMENTS:
+        return next_num
+    return (num + 1) % count
+
+
+def get_element_num(angle, element, ist_days):
+    """
+    Return the number of the element running at ist_days, read past one of
+    the Moon's flips (see events.get_flip_end), and the instant it is read at
+    """
+    _, width_degs, count = ELEMENTS[element]
+    settled_days = ev.get_flip_end(angle, ist_days)
+    angle_degs = ev.get_angle_degs(angle, settled_days)
+    return math.floor(angle_degs / width_degs) % count, settled_days
+
+
+def find_element_end(angle, element, num, start_days, tol_days=ev.DEFAULT_TOL_DAYS,
+                     crossings=None):
+    """
+    Return the end (IST days) of the element num, running at start_days, and
+    the number of the element after it.  The end is the crossing of its
+    upper boundary, or a step back of the model out of it if that comes
+    first.  Crossings already found may be given (dict, kept up to date).
+    RuntimeError if there is no end within _SEARCH_DAYS, which only a
+    failed solve gives.
+    """
+    _, width_degs, count = ELEMENTS[element]
+    target_degs = ((num + 1) % count) * width_degs
+    key = (angle["name"], round(target_degs, 9))
+    crossing = None if crossings is None else crossings.get(key)
+    if crossing is None or crossing["ist_days"] < start_days:
+        crossing = ev.find_crossing(
+            angle, target_degs, start_days, start_days + _SEARCH_DAYS, tol_days
+        )
+        if crossing is None:
+            raise RuntimeError(
+                f"No end found for the {element} {get_element_name(element, num)} "
+                f"after IST day {start_days:.6f}"
+            )
+        if crossings is not None:
+            crossings[key] = crossing
+
+    for step_days in crossing["steps_back"]:
+        if step_days <= start_days:
+            continue
+        # Not the Moon falling back for one of its flips
+        back_num, _ = get_element_num(angle, element, step_days)
+        if back_num != num:
+            return step_days, back_num
+    end_days = crossing["ist_days"]
+    return end_days, _get_next_num(angle, width_degs, count, num, end_days)
+
+
+def _get_elements(angles, crossings, element, rise_days, next_rise_days, first=None):
+    """
+    Return the list of elements from the one running at sunrise to the one
+    running at the next sunrise, each with its end.  The element running at
+    sunrise may be given (first), as found the day before.  Elements that a
+    step of the model crosses at once end at the instant they begin.
+    RuntimeError as find_element_end.
+    """
+    name, width_degs, count = ELEMENTS[element]
+    angle = angles[name]
+    rise_num, settled_days = get_element_num(angle, element, rise_days)
+    # An element is carried over only with its end, and only if it is the
+    # one at sunrise (a step back of the model can undo a crossing)
+    if first is not None and (first["end_ist_days"] is None or first["num"] != rise_num):
+        first = None
+    if first is not None:
+        elements = [first]
+        if first["end_ist_days"] >= next_rise_days:
+            return elements
+        start_days = first["end_ist_days"]
+        num = _get_next_num(angle, width_degs, count, first["num"], start_days)
+    else:
+        elements = []
+        start_days = settled_days
+        num = rise_num
+
+    while True:
+        end_days, next_num = find_element_end(
+            angle, element, num, start_days, crossings=crossings
+        )
+        end = fn.get_datetime_from_days(end_days - angle["ist_offset_days"])
+        # Elements a step crosses at once end where they begin; after a step
+        # back, the element is this one
+        ended = (next_num - num) % count
+        for _ in range(ended if ended <= _MAX_STEP_ELEMENTS else 1):
+            entry = dict()
+            entry["num"] = num
+            entry["name"] = get_element_name(element, num)
+            entry["end"] = end
+            entry["end_ist_days"] = end_days
+            elements.append(entry)
+            num = (num + 1) % count
+        num = next_num
+        start_days = end_days
+        if start_days >= next_rise_days:
+            return elements
+
+
+def get_panchang(input_params, stream=None, previous=None):
+    """
+    Return the panchang (dict) for the date of input_params["in_datetime"]
+    at its place: sunrise, sunset, next sunrise, and for each element
+    (thithi, karanam, nakshatra, yogam) the list of those running from
+    sunrise to the next sunrise, each with its number, name and end
+    (datetime and IST days).
+    Input: input params, and optionally the evaluation stream to use and
+           the panchang of the previous day at the same place
+    """
+    if stream is None:
+        stream = ev.make_stream(input_params)
+    ist_offset_days = stream["ist_offset_days"]
+
+    # Sunrise of the date, and of the next, from the sun at noon
+    noon_days = fn.get_midnight_days(fn.get_days_from_epoch(input_params["in_datetime"]))
+    noon_days += 0.5
+    rise_days = []
+    set_days = []
+    for civil_days in (noon_days, noon_days + 1.0):
+        point, _ = ev.get_stream_point(stream, civil_days + ist_offset_days, moon=False)
+        rise_days.append(point["sun"]["rise_days"] + ist_offset_days)
+        set_days.append(point["sun"]["set_days"] + ist_offset_days)
+
+    # The previous day carries over only if it ended at this sunrise
+    if previous is not None:
+        if abs(previous["next_rise_ist_days"] - rise_days[0]) > _SAME_INSTANT_DAYS:
+            previous = None
+
+    angles = {
+        name: ev.make_angle(name, input_params, stream)
+        for name in ("MOON-SUN", "MOON", "SUN+MOON")
+    }
+    crossings = dict()
+
+    panchang = dict()
+    panchang["sunrise"] = fn.get_datetime_from_days(rise_days[0] - ist_offset_days)
+    panchang["sunset"] = fn.get_datetime_from_days(set_days[0] - ist_offset_days)
+    panchang["next_sunrise"] = fn.get_datetime_from_days(rise_days[1] - ist_offset_days)
+    panchang["rise_ist_days"] = rise_days[0]
+    panchang["next_rise_ist_days"] = rise_days[1]
+    for element in ("karanam", "thithi", "nakshatra", "yogam"):
+        first = None if previous is None else previous[element][-1]
+        panchang[element] = _get_elements(
+            angles, crossings, element, rise_days[0], rise_days[1], first
+        )
+    thithi_num = panchang["thithi"][0]["num"]
+    panchang["paksham"] = "Krishna" if thithi_num >= 15 else "Shukla"
+    panchang["evals"] = stream["evals"]
+    return panchang
@@ -0,0 +1,303 @@
+"""
+sankranti.py — Precomputed solar ingress (Sankranti) table.
+
+The table holds the instant of every solar ingress into a rasi (the true
+longitude of the sun crossing a multiple of 30 degrees) for the range the app
+supports (1800-2100).  Instants are stored as float days since
+constants.epoch_sun_rise, on the IST (82.5 E) meridian, in a compact binary
+file.  calc_tamil_date looks up the ingress with a bisect instead of
+searching for it.
+
+The longitude tabulated is the true longitude before the local net
+correction (get_net_correction), so the table does not depend on the place.
+The local Sankranti is found from it by allowing for the net correction.
+
+A checksum over the model constants and TABLE_VERSION is stored in the file;
+a table built from different constants is detected as stale and rebuilt.
+The table can also be kept in the memory-mapped store (ephem_store.py),
+which is tried first.
+
+Build (or rebuild) the table file with:
+  python sankranti.py
+"""
+
+import argparse
+import array
+import bisect
+import datetime as dt
+import hashlib
+import math
+import os
+import struct
+
+import constants as cn
+import ephem_store as es
+import functions as fn
+
+# Bump whenever the solar model in functions.py changes in a way that the
+# constants below do not capture.
+TABLE_VERSION = 1
+
+TABLE_START_YEAR = 1800
+TABLE_END_YEAR = 2100
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sankranti.bin")
+
+_MAGIC = b"SKRT"
+# magic, version, first month, start year, end year, count, checksum
+_HEADER = struct.Struct("<4sIiiiI32s")
+
+# Margin (days) tabulated beyond the year range, so a date early in the first
+# year still finds the ingress before it.
+_MARGIN_DAYS = 40.0
+
+_table = None
+
+
+def model_checksum(start_year=TABLE_START_YEAR, end_year=TABLE_END_YEAR):
+    """
+    Return the checksum (32 bytes) of the constants the table is built from
+    """
+    model = (
+        TABLE_VERSION,
+        start_year,
+        end_year,
+        cn.epoch.isoformat(),
+        cn.epoch_sun_rise.isoformat(),
+        cn.solar_days_in_year,
+        cn.sidereal_days_in_year,
+        cn.mean_sun_long_at_epoch,
+        cn.apse_position_at_epoch,
+        cn.apse_movement_per_year_in_sec,
+        cn.earth_eccentricity,
+        cn.arcsec_in_radian,
+    )
+    return hashlib.sha256(repr(model).encode("ascii")).digest()
+
+
+def get_true_long_sun(epoch_days):
+    """
+    Return the true longitude of sun in degrees, before the net correction
+    Input: Days since Epoch Sun Rise on the IST meridian
+    """
+    years_since_epoch = fn.get_years_elapsed(epoch_days)
+    mean_long_sun_degs = fn.get_mean_longitude(
+        epoch_days, cn.sidereal_days_in_year, cn.mean_sun_long_at_epoch
+    )
+    apse_posn_sun_degs = fn.get_apse_position_degs(
+        cn.apse_position_at_epoch, cn.apse_movement_per_year_in_sec, years_since_epoch
+    )
+    mean_anom_sun_degs = fn.get_mean_anomaly_degs(
+        apse_posn_sun_degs, mean_long_sun_degs
+    )
+    mandaphalam_secs = fn.get_equation_of_centre(
+        cn.earth_eccentricity, mean_anom_sun_degs
+    )
+    return fn.get_true_longitude(mean_long_sun_degs, mandaphalam_secs)
+
+
+def _find_ingress(lo_days, hi_days, target_degs):
+    """
+    Return the instant (days) the sun crosses target_degs within the bracket
+    """
+    for _ in range(48):
+        mid_days = (lo_days + hi_days) / 2.0
+        sun_degs = get_true_long_sun(mid_days)
+        if fn._wrap_diff_degs(sun_degs, target_degs) < 0:
+            lo_days = mid_days
+        else:
+            hi_days = mid_days
+        if hi_days - lo_days < 1e-9:
+            break
+    return (lo_days + hi_days) / 2.0
+
+
+def build_ingress_table(start_year=TABLE_START_YEAR, end_year=TABLE_END_YEAR):
+    """
+    Return a new ingress table (dict) for the given range of years
+    """
+    first_days = fn.get_days_from_epoch(dt.datetime(start_year, 1, 1)) - _MARGIN_DAYS
+    last_days = fn.get_days_from_epoch(dt.datetime(end_year + 1, 1, 1)) + _MARGIN_DAYS
+    sun_degs_per_day = cn.full_circle / cn.sidereal_days_in_year
+
+    first_month = int(get_true_long_sun(first_days) / cn.deg_in_house) + 1
+    ingress_days = array.array("d")
+    month = first_month
+    guess_days = first_days
+    while True:
+        target_degs = (month % 12) * cn.deg_in_house
+        offset_degs = fn.find_diff_degs(target_degs, get_true_long_sun(guess_days))
+        guess_days += offset_degs / sun_degs_per_day
+        # The equation of centre is never more than about 2.2 days of motion
+        cross_days = _find_ingress(guess_days - 4.0, guess_days + 4.0, target_degs)
+        if cross_days > last_days:
+            break
+        ingress_days.append(cross_days)
+        guess_days = cross_days + 1.0
+        month += 1
+
+    return {
+        "version": TABLE_VERSION,
+        "first_month": first_month % 12,
+        "start_year": start_year,
+        "end_year": end_year,
+        "checksum": model_checksum(start_year, end_year),
+        "days": ingress_days,
+    }
+
+
+def save_ingress_table(table, path=TABLE_PATH):
+    """
+    Write the ingress table to a binary file
+    """
+    header = _HEADER.pack(
+        _MAGIC,
+        table["version"],
+        table["first_month"],
+        table["start_year"],
+        table["end_year"],
+        len(table["days"]),
+        table["checksum"],
+    )
+    days = array.array("d", table["days"])
+    if struct.pack("=d", 1.0) != struct.pack("<d", 1.0):
+        days.byteswap()
+    with open(path, "wb") as f:
+        f.write(header)
+        days.tofile(f)
+
+
+def load_ingress_table(path=TABLE_PATH):
+    """
+    Return the ingress table read from a binary file; None if the file is
+    missing, damaged or stale
+    """
+    try:
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                return None
+            magic, version, first_month, start_year, end_year, count, checksum = (
+                _HEADER.unpack(header)
+            )
+            if magic != _MAGIC or version != TABLE_VERSION:
+                return None
+            if checksum != model_checksum(start_year, end_year):
+                return None
+            days = array.array("d")
+            days.fromfile(f, count)
+    except (OSError, EOFError):
+        return None
+
+    if struct.pack("=d", 1.0) != struct.pack("<d", 1.0):
+        days.byteswap()
+
+    return {
+        "version": version,
+        "first_month": first_month,
+        "start_year": start_year,
+        "end_year": end_year,
+        "checksum": checksum,
+        "days": days,
+    }
+
+
+def get_store_tables(table):
+    """
+    Return the ingress table as store tables (see ephem_store.write_store)
+    """
+    meta = {
+        "kind": "sankranti",
+        "version": table["version"],
+        "first_month": table["first_month"],
+        "start_year": table["start_year"],
+        "end_year": table["end_year"],
+        "checksum": table["checksum"].hex(),
+    }
+    return {"sankranti/days": (table["days"], meta)}
+
+
+def get_stored_table(store=None):
+    """
+    Return the ingress table from the ephemeris store, its instants a view
+    into the mapped file; None if the store has no current table
+    """
+    stored = es.get_table("sankranti/days", store)
+    if stored is None:
+        return None
+    days, meta = stored
+    if meta["version"] != TABLE_VERSION:
+        return None
+    checksum = bytes.fromhex(meta["checksum"])
+    if checksum != model_checksum(meta["start_year"], meta["end_year"]):
+        return None
+    return {
+        "version": meta["version"],
+        "first_month": meta["first_month"],
+        "start_year": meta["start_year"],
+        "end_year": meta["end_year"],
+        "checksum": checksum,
+        "days": days,
+    }
+
+
+def get_ingress_table():
+    """
+    Return the ingress table, from the ephemeris store or TABLE_PATH on first
+    use.  A missing or stale table is rebuilt and written back when possible.
+    """
+    global _table
+    if _table is None:
+        years = (TABLE_START_YEAR, TABLE_END_YEAR)
+        table = get_stored_table()
+        if table is None or (table["start_year"], table["end_year"]) != years:
+            table = load_ingress_table()
+        if table is None or (table["start_year"], table["end_year"]) != years:
+            table = build_ingress_table()
+            try:
+                save_ingress_table(table)
+            except OSError:
+                pass  # Read-only install: keep the table in memory only
+        _table = table
+    return _table
+
+
+def find_ingress_days(epoch_days, tamil_month_num, table=None):
+    """
+    Return the instant (days since Epoch Sun Rise) of the ingress starting
+    the given month, latest at or around epoch_days; None if out of range.
+    Input: days since Epoch Sun Rise on the IST meridian, month number (0-11)
+    """
+    if table is None:
+        table = get_ingress_table()
+    days = table["days"]
+
+    idx = bisect.bisect_right(days, epoch_days) - 1
+    # The month may start just after epoch_days, as the local correction
+    # moves the ingress by up to a day either way.
+    for i in (idx, idx + 1, idx - 1):
+        if 0 <= i < len(days):
+            if (table["first_month"] + i) % 12 == tamil_month_num:
+                if abs(days[i] - epoch_days) < 35.0:
+                    return days[i]
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the Sankranti table")
+    parser.add_argument("--output", default=TABLE_PATH, help="table file to write")
+    parser.add_argument("--start-year", type=int, default=TABLE_START_YEAR)
+    parser.add_argument("--end-year", type=int, default=TABLE_END_YEAR)
+    args = parser.parse_args()
+
+    table = build_ingress_table(args.start_year, args.end_year)
+    save_ingress_table(table, args.output)
+    span = math.floor(table["days"][-1] - table["days"][0])
+    print(
+        f"Wrote {len(table['days'])} ingresses spanning {span} days "
+        f"({args.start_year}-{args.end_year}) to {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
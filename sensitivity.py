@@ -0,0 +1,392 @@
+"""
+sensitivity.py — Birth-time sensitivity: what in the chart changes if the
+birth time is off by up to N minutes.
+
+Within a window of +-N minutes around the birth instant, the report lists
+every instant where one of these changes:
+
+  the lagna rasi and the lagna navamsa
+  the Moon's nakshatra and pada, and with the nakshatra the dasa lord
+  the bhava of any body (get_bhava_positions), counted from the lagna
+
+and the alternative charts: each stretch of the window over which none of
+them changes, with the elements it has.
+
+The boundaries are found with the crossing solver of events.py rather than
+by computing the chart minute by minute.  Every lagna navamsa boundary
+(every 3 degrees 20 minutes, so every rasi boundary too) and every Moon
+pada boundary (likewise every nakshatra boundary) that the angle passes in
+the window is solved for.  A body changes bhava when it crosses the middle
+between two house cusps; the body's place among the bhavas (30 degrees a
+bhava, in proportion within each) mostly goes back, as the houses turn
+past it, so its boundaries are solved for the same way.  It is not quite
+one-way, though (the cusps about the body turn at different rates, and the
+body moves too), so a body can go back a bhava and forward again, and a
+solve finds only one of the two.  Each stretch between the boundaries found
+is therefore checked at its ends, and one whose ends differ is bisected
+for the changes within it.  The lagna, and with it the houses, steps back
+at local midnight, so the window is split there.  The chart elements are
+then evaluated once for each stretch between boundaries; a boundary where
+nothing changes is dropped.  A window of an hour takes some tens of solves
+and a few hundred model evaluations.
+
+The Moon's brief 90 degree flips in the model (see chebyshev.py) are not
+looked for.
+
+  python sensitivity.py --datetime 1947-08-15T10:30 --lat 11.66 --long 78.15 \\
+      --minutes 30
+"""
+
+import argparse
+import datetime as dt
+import math
+
+import birth_input as bi
+import chart
+import constants as cn
+import events as ev
+import functions as fn
+from constants import DASA_LORDS, NAKSHATRA, RASI_NAMES
+
+DEFAULT_MINUTES = 30
+# Longest half window: the lagna should not come round to where it was
+MAX_MINUTES = 6 * 60
+
+# Bodies whose bhava is followed (the lagna is always in the first)
+BHAVA_BODIES = chart.PLANET_NAMES_ORDER[1:]
+
+_NAVAMSA_DEGS = cn.full_circle / 108.0  # Also the width of a pada
+_BHAVA_DEGS = cn.full_circle / 12.0
+_MINUTES_IN_DAY = 24.0 * 60.0
+
+# Past local midnight, after the lagna steps back
+_AFTER_MIDNIGHT_DAYS = 1e-8
+
+
+def _get_houses(place, sun_params):
+    """
+    Return the lagna and the 12 house positions (degrees) at the place, as
+    chart.compute_place
+    """
+    south_hemi = fn.get_south(place)
+    lagn_params = fn.get_lagn_params(place, sun_params)
+    lagn_degs = lagn_params["lagn"]
+    ramc_degs = lagn_params["ramc"]
+    prec_degs = sun_params["prec"]
+    dhasa_degs = fn.get_culm_point(ramc_degs, place["lat_degs"], prec_degs, south_hemi)
+    house_positions = fn.get_house_positions(
+        lagn_degs, dhasa_degs, place["lat_degs"], ramc_degs, prec_degs, south_hemi
+    )
+    return lagn_degs, house_positions
+
+
+def _get_body_degs(body_angles, name, ist_days):
+    """
+    Return the longitude (degrees) of a body (of BHAVA_BODIES) at the IST
+    days, from its events angle
+    """
+    if name == "KETU":
+        return fn.find_sum_degs([ev.get_angle_degs(body_angles["RAHU"], ist_days), 180.0])
+    return ev.get_angle_degs(body_angles[name], ist_days)
+
+
+def get_bhava_longitude(house_positions, degs):
+    """
+    Return the place (degrees) of a longitude among the bhavas: 30 degrees
+    for each bhava from the start of the lagna bhava, in proportion within
+    the bhava it falls in (see functions.get_bhava_positions)
+    """
+    positions = [house_positions[0], degs] + [house_positions[0]] * 10
+    bhavas, house1_degs, house2_degs = fn.get_bhava_positions(house_positions, positions)
+    bhava = (bhavas[1] - int(house_positions[0] // cn.deg_in_house)) % 12
+    width_degs = (house2_degs[bhava] - house1_degs[bhava]) % cn.full_circle
+    into_degs = (degs - house1_degs[bhava]) % cn.full_circle
+    fraction = 0.0
+    if width_degs > 0.0:
+        fraction = min(into_degs / width_degs, 1.0 - 1e-9)
+    return (bhava + fraction) * _BHAVA_DEGS
+
+
+def get_chart_state(stream, ist_days):
+    """
+    Return the chart elements (dict) the report follows at the IST days, on
+    the evaluation stream of the place (see events.make_stream): lagna
+    rasi and navamsa, Moon nakshatra and pada, dasa lord, and the bhava
+    (1-12, from the lagna) of each of BHAVA_BODIES
+    """
+    place = stream["place"]
+    point, _ = ev.get_stream_point(stream, ist_days)
+    sun_params = point["sun"]
+    moon_params = point["moon"]
+    lagn_degs, house_positions = _get_houses(place, sun_params)
+
+    planet_degs = []
+    for name in chart.PLANET_NAMES_ORDER:
+        if name == "LAGN":
+            planet_degs.append(lagn_degs)
+        elif name == "SUN":
+            planet_degs.append(sun_params["true_long"])
+        elif name == "MOON":
+            planet_degs.append(moon_params["moon"])
+        elif name == "RAHU":
+            planet_degs.append(moon_params["rahu"])
+        elif name == "KETU":
+            planet_degs.append(moon_params["ketu"])
+        else:
+            planet_params = fn.get_planet_params(
+                cn.planet_dict[name],
+                point["time"],
+                sun_params["true_long"],
+                sun_params["hvel"],
+                sun_params["rad"],
+                moon_params["ketu"],
+                sun_params["net_corr"],
+            )
+            planet_degs.append(planet_params["true_long"])
+
+    bhava_positions, _, _ = fn.get_bhava_positions(house_positions, planet_degs)
+    lagn_sign = int(lagn_degs // cn.deg_in_house)
+    pada_idx = min(int(moon_params["moon"] / _NAVAMSA_DEGS), 107)
+
+    state = dict()
+    state["lagna_rasi"] = lagn_sign
+    state["lagna_navamsa"] = int(fn.get_navamsa_positions(planet_degs)[0])
+    state["nakshatra"] = pada_idx // 4
+    state["pada"] = pada_idx % 4 + 1
+    state["dasa_lord"] = DASA_LORDS[state["nakshatra"] % 9]
+    state["bhavas"] = {
+        name: (bhava - lagn_sign) % 12 + 1
+        for name, bhava in zip(chart.PLANET_NAMES_ORDER[1:], bhava_positions[1:])
+    }
+    return state
+
+
+def get_state_items(state):
+    """
+    Return the chart elements of a state as a list of (label, value) pairs
+    of display strings, in report order
+    """
+    items = [
+        ("Lagna rasi", RASI_NAMES[state["lagna_rasi"]]),
+        ("Lagna navamsa", RASI_NAMES[state["lagna_navamsa"]]),
+        ("Moon nakshatra", NAKSHATRA[state["nakshatra"]]),
+        ("Moon pada", str(state["pada"])),
+        ("Dasa lord", state["dasa_lord"]),
+    ]
+    for name in BHAVA_BODIES:
+        items.append((f"{name} bhava", str(state["bhavas"][name])))
+    return items
+
+
+def _get_boundaries(angle, unit_degs, start_days, end_days, tol_days):
+    """
+    Return the IST days within the window at which the one-way angle
+    crosses a multiple of unit_degs, the window being short enough that it
+    goes less than a turn
+    """
+    dirn = 1.0 if angle["mean_rate"] > 0 else -1.0
+    start_degs = ev.get_angle_degs(angle, start_days)
+    end_degs = ev.get_angle_degs(angle, end_days)
+    travel_degs = (dirn * (end_degs - start_degs)) % cn.full_circle
+
+    # The boundaries ahead, in the direction of motion
+    if dirn > 0:
+        first_degs = (math.floor(start_degs / unit_degs) + 1) * unit_degs
+    else:
+        first_degs = math.floor(start_degs / unit_degs) * unit_degs
+    boundaries = []
+    for k in range(int(travel_degs / unit_degs) + 2):
+        target_degs = first_degs + dirn * k * unit_degs
+        if abs(target_degs - start_degs) > travel_degs + unit_degs:
+            break
+        crossing = ev.find_crossing(angle, target_degs, start_days, end_days, tol_days)
+        if crossing is not None and crossing["ist_days"] > start_days:
+            boundaries.append(crossing["ist_days"])
+    return boundaries
+
+
+def _find_hidden_changes(stream, lo_days, hi_days, lo_state, hi_state, tol_days):
+    """
+    Return the IST days, to within tol_days, at which the chart elements
+    change between lo_days and hi_days, given their states there, by
+    bisection: those that one change leads to and another undoes between
+    the points it evaluates are not seen
+    """
+    if lo_state == hi_state:
+        return []
+    if hi_days - lo_days <= tol_days:
+        return [(lo_days + hi_days) / 2.0]
+    mid_days = (lo_days + hi_days) / 2.0
+    mid_state = get_chart_state(stream, mid_days)
+    return _find_hidden_changes(
+        stream, lo_days, mid_days, lo_state, mid_state, tol_days
+    ) + _find_hidden_changes(stream, mid_days, hi_days, mid_state, hi_state, tol_days)
+
+
+def _get_midnights(stream, start_days, end_days):
+    """
+    Return the local midnights (IST days, just after the lagna steps back)
+    within the window
+    """
+    esr_days = cn.epoch_sun_rise_in_days
+    local_offset_days = stream["local_offset_days"]
+    midnight_days = math.floor(start_days + local_offset_days + esr_days) + 1.0
+    midnight_days += _AFTER_MIDNIGHT_DAYS - esr_days - local_offset_days
+    midnights = []
+    while midnight_days < end_days:
+        midnights.append(midnight_days)
+        midnight_days += 1.0
+    return midnights
+
+
+def find_changes(input_params, minutes=DEFAULT_MINUTES, tol_days=ev.DEFAULT_TOL_DAYS):
+    """
+    Return the sensitivity report (dict) of the chart of input_params over
+    +-minutes of its birth time: the birth state (see get_chart_state), the
+    changes (list, in time order: IST days, datetime on the birth clock,
+    minutes from the birth time, and the (label, before, after) items that
+    change) and the alternative charts (list of the stretches between
+    changes: start and end as IST days, datetimes and minutes from the
+    birth time, the state, and whether it holds the birth time)
+    """
+    if not 0 < minutes <= MAX_MINUTES:
+        raise ValueError(f"minutes must be within 0 to {MAX_MINUTES}")
+    stream = ev.make_stream(input_params)
+    ist_offset_days = stream["ist_offset_days"]
+    birth_days = fn.get_days_from_epoch(input_params["in_datetime"]) + ist_offset_days
+    half_days = minutes / _MINUTES_IN_DAY
+    start_days = birth_days - half_days
+    end_days = birth_days + half_days
+
+    lagna = ev.make_angle("LAGNA", input_params, stream)
+    moon = ev.make_angle("MOON", input_params, stream)
+    body_angles = {
+        name: ev.make_angle(name, input_params, stream)
+        for name in BHAVA_BODIES if name != "KETU"
+    }
+    bhava_angles = []
+    for name in BHAVA_BODIES:
+        rate_name = "RAHU" if name == "KETU" else name
+
+        def get_degs(ist_days, name=name):
+            point, _ = ev.get_stream_point(stream, ist_days, moon=False)
+            _, house_positions = _get_houses(input_params, point["sun"])
+            return get_bhava_longitude(
+                house_positions, _get_body_degs(body_angles, name, ist_days)
+            )
+
+        mean_rate = ev.ANGLE_RATES[rate_name][0] - ev.ANGLE_RATES["LAGNA"][0]
+        bhava_angles.append(
+            ev.make_function_angle(f"{name} bhava", get_degs, input_params, mean_rate,
+                                   stream=stream)
+        )
+
+    # The solves, in each part of the window between local midnights
+    midnights = _get_midnights(stream, start_days, end_days)
+    edges = [start_days] + midnights + [end_days]
+    boundaries = set(midnights)
+    for lo_days, hi_days in zip(edges[:-1], edges[1:]):
+        boundaries.update(_get_boundaries(lagna, _NAVAMSA_DEGS, lo_days, hi_days, tol_days))
+        boundaries.update(_get_boundaries(moon, _NAVAMSA_DEGS, lo_days, hi_days, tol_days))
+        for angle in bhava_angles:
+            boundaries.update(
+                _get_boundaries(angle, _BHAVA_DEGS, lo_days, hi_days, tol_days)
+            )
+    boundaries = sorted(days for days in boundaries if start_days < days < end_days)
+
+    # Each stretch checked at its ends, just inside them (the boundaries are
+    # found to within tol_days)
+    edges = [start_days] + boundaries + [end_days]
+    hidden = []
+    for lo_days, hi_days in zip(edges[:-1], edges[1:]):
+        lo_days += tol_days
+        hi_days -= tol_days
+        if hi_days <= lo_days:
+            continue
+        lo_state = get_chart_state(stream, lo_days)
+        hi_state = get_chart_state(stream, hi_days)
+        hidden.extend(
+            _find_hidden_changes(stream, lo_days, hi_days, lo_state, hi_state, tol_days)
+        )
+    boundaries = sorted(boundaries + hidden)
+
+    def get_when(ist_days):
+        return (
+            fn.get_datetime_from_days(ist_days - ist_offset_days),
+            (ist_days - birth_days) * _MINUTES_IN_DAY,
+        )
+
+    # One state per stretch between boundaries; merge those that agree
+    edges = [start_days] + boundaries + [end_days]
+    changes = []
+    charts = []
+    for lo_days, hi_days in zip(edges[:-1], edges[1:]):
+        state = get_chart_state(stream, (lo_days + hi_days) / 2.0)
+        if charts and charts[-1]["state"] == state:
+            charts[-1]["end_ist_days"] = hi_days
+            continue
+        if charts:
+            items = zip(get_state_items(charts[-1]["state"]), get_state_items(state))
+            change = dict()
+            change["ist_days"] = lo_days
+            change["datetime"], change["minutes"] = get_when(lo_days)
+            change["items"] = [
+                (label, before, after)
+                for (label, before), (_, after) in items if before != after
+            ]
+            changes.append(change)
+        charts.append({"start_ist_days": lo_days, "end_ist_days": hi_days, "state": state})
+    for entry in charts:
+        entry["start"], entry["start_minutes"] = get_when(entry["start_ist_days"])
+        entry["end"], entry["end_minutes"] = get_when(entry["end_ist_days"])
+        entry["birth"] = entry["start_ist_days"] <= birth_days < entry["end_ist_days"]
+
+    report = dict()
+    report["ist_days"] = birth_days
+    report["minutes"] = minutes
+    report["birth"] = get_chart_state(stream, birth_days)
+    report["changes"] = changes
+    report["charts"] = charts
+    report["evals"] = (
+        lagna["evals"] + moon["evals"] + sum(angle["evals"] for angle in bhava_angles)
+    )
+    return report
+
+
+def get_alternative_input(input_params, entry):
+    """
+    Return the input params of the alternative chart (an entry of the
+    report's charts): the birth time moved to the middle of its stretch
+    """
+    middle_minutes = (entry["start_minutes"] + entry["end_minutes"]) / 2.0
+    alternative = dict(input_params)
+    alternative["in_datetime"] = input_params["in_datetime"] + dt.timedelta(
+        minutes=middle_minutes
+    )
+    return alternative
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Birth-time sensitivity report")
+    parser.add_argument("--datetime", required=True, help="YYYY-MM-DDTHH:MM[:SS]")
+    bi.add_place_arguments(parser)
+    parser.add_argument(
+        "--minutes", type=float, default=DEFAULT_MINUTES, help="half window, minutes"
+    )
+    args = parser.parse_args()
+
+    input_params = bi.get_birth_input(parser, args, dt.datetime.fromisoformat(args.datetime))
+
+    report = find_changes(input_params, args.minutes)
+    print(f"Birth chart ({args.datetime}):")
+    for label, value in get_state_items(report["birth"]):
+        print(f"  {label:<16} {value}")
+    print(f"\nChanges within +-{args.minutes:g} minutes:")
+    for change in report["changes"]:
+        items = ", ".join(f"{label} {before} -> {after}" for label, before, after in change["items"])
+        print(f"  {change['datetime']:%Y-%m-%d %H:%M:%S} ({change['minutes']:+7.2f} min)  {items}")
+    print(f"\n{len(report['charts'])} alternative charts ({report['evals']} model evaluations)")
+
+
+if __name__ == "__main__":
+    main()
@@ -248,6 +248,26 @@ def saptha_vargaja_bala(p_signs, p_degs_in_sign, p_mins_in_sign, navamsa_signs):
     return saptha
 
 
+def saptha_vargaja_key(p_signs, p_degs_in_sign, p_mins_in_sign, navamsa_signs):
+    """Return the values of the bodies that saptha_vargaja_bala depends on.
+
+    The seven planets' signs and navamsas, and of their degrees and minutes
+    within the sign only the whole degree and the parts that fix the
+    saptamsa and dwadasamsa (every other test on the degree is against a
+    whole degree), so equal keys give equal balas.
+    """
+    return tuple(
+        (
+            p_signs[i],
+            int(p_degs_in_sign[i]),
+            (p_degs_in_sign[i] * 7) // 30,
+            int((int(p_degs_in_sign[i]) + p_mins_in_sign[i] / 60.0) * 2.0 / 5.0),
+            navamsa_signs[i],
+        )
+        for i in range(1, 8)
+    )
+
+
 # ---------------------------------------------------------------------------
 # 3. Oja Bala (Odd/Even sign strength)
 # ---------------------------------------------------------------------------
@@ -589,6 +609,15 @@ def _aspect_strength(aspector_idx, aspected_sign_diff_degs, aspected_pos_in_sign
     return 0.25 * (asp[sign - 1] + (asp[sign] - asp[sign - 1]) * frac)
 
 
+def full_aspect_houses(aspector_idx):
+    """Houses (2-12, counted from the aspector as 1) that planet aspector_idx
+    aspects fully (strength 4 in _ASPEX): the 7th for all, and the special
+    aspects of Mars (4, 8), Jupiter (5, 9) and Saturn (3, 10).
+    """
+    asp = _ASPEX[_ASP_PTR[aspector_idx]]
+    return [k + 2 for k, value in enumerate(asp) if value == 4]
+
+
 def drig_bala(p_degs):
     """Aspectual strength. Returns (ben_drig, mal_drig) each a list of 7 floats."""
     ben_drig = [0.0] * 7
@@ -636,6 +665,7 @@ def compute_shadbala(
     kali_dina,
     birth_day,
     prec_degs,
+    saptha=None,
 ):
     """
     Compute Shadbala for 7 planets (Sun, Moon, Mars, Mercury, Jupiter, Venus, Saturn).
@@ -657,6 +687,8 @@ def compute_shadbala(
     kali_dina       : int      days from Kali epoch
     birth_day       : int      day of week 0=Sunday
     prec_degs       : float    precession at birth in degrees
+    saptha          : list[7]  the Saptha Vargaja Bala, if already known
+                               (computed from the signs otherwise)
 
     Returns
     -------
@@ -675,7 +707,8 @@ def compute_shadbala(
     sun_degs = p_degs[0]
 
     uchcha = uchcha_bala(p_degs)
-    saptha = saptha_vargaja_bala(p_signs, p_degs_in_sign, p_mins_in_sign, navamsa_signs)
+    if saptha is None:
+        saptha = saptha_vargaja_bala(p_signs, p_degs_in_sign, p_mins_in_sign, navamsa_signs)
     oja = oja_bala(p_signs, navamsa_signs)
     kendra = kendra_di_bala(p_degs, bhava1, bhava2)
     dreka = drekana_bala(p_degs_in_sign)
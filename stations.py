@@ -0,0 +1,236 @@
+"""
+stations.py — Retrograde and direct stations of the planets, and their
+retrograde intervals.
+
+A planet is retrograde while the geocentric velocity of the model
+(geo_vel_degs of get_geo_longitude, the "gvel" whose sign sets
+planet_retrograde in the chart) is negative.  The velocity is sampled with
+the batch engine over the range, every STATION_STEPS days, and each change
+of sign is bisected to the instant of the station.  All the changes of sign
+of a planet are bisected together.
+
+The geocentric branch of the inferior planets switches for a few hours now
+and then (see chebyshev.py), and the velocity jumps there rather than
+passing through zero; such changes of sign are not stations and are
+dropped.
+
+The retrograde intervals are sorted arrays of start and end instants, so
+"is Mercury retrograde on a date" is a binary search.
+
+  python stations.py --start-year 1800 --end-year 2100 --lat 13.08 --long 80.27
+"""
+
+import argparse
+import datetime as dt
+import time
+
+import numpy as np
+
+import batch as bt
+import birth_input as bi
+import chebyshev as ch
+import functions as fn
+
+STATION_PLANETS = ["MARS", "MERCURY", "JUPITER", "VENUS", "SATURN"]
+
+# Sampling step (days), well inside the shortest time between stations
+STATION_STEPS = {
+    "MARS": 2.0,
+    "MERCURY": 1.0,
+    "JUPITER": 4.0,
+    "VENUS": 2.0,
+    "SATURN": 4.0,
+    "URANUS": 4.0,
+    "NEPTUNE": 4.0,
+}
+
+DEFAULT_TOL_DAYS = 1e-6
+
+# A station holds: the planet moves the other way for some days after it
+# (the majority of the velocities at these offsets from it), while a branch
+# switch of the model lasts hours
+_HOLD_DAYS = (1.0, 2.0, 3.0)
+# Samples per call of the model (bounds the memory used)
+_CHUNK_SAMPLES = 1 << 18
+
+
+def _get_planet(place, planet, ist_days):
+    """
+    Return the geocentric velocity and true longitude of the planet
+    """
+    time_params = bt.make_time_params(ist_days, 0.0, place["local_offset_days"])
+    sun_params = bt.get_sun_core(place["cols"], time_params)
+    planet_grid = bt.get_planet_grid(sun_params, [planet])
+    return planet_grid["gvel"][0], planet_grid["true_long"][0]
+
+
+def get_planet_stations(place, planet, start_days, end_days, tol_days=DEFAULT_TOL_DAYS):
+    """
+    Return the stations of the planet within the window (dict of arrays in
+    time order: IST days, longitude, and kind: -1 turning retrograde, +1
+    turning direct) and whether it is retrograde at the start
+    """
+    step_days = STATION_STEPS[planet]
+    chunk_days = step_days * _CHUNK_SAMPLES
+
+    lo_parts = []
+    hi_parts = []
+    retro_at_start = None
+    chunk_start = start_days
+    while chunk_start < end_days:
+        chunk_end = min(chunk_start + chunk_days, end_days)
+        count = max(int(np.ceil((chunk_end - chunk_start) / step_days)), 1)
+        days = np.linspace(chunk_start, chunk_end, count + 1)
+        gvel, _ = _get_planet(place, planet, days)
+        if retro_at_start is None:
+            retro_at_start = bool(gvel[0] < 0)
+        change = np.nonzero((gvel[1:] < 0) != (gvel[:-1] < 0))[0]
+        lo_parts.append(days[change])
+        hi_parts.append(days[change + 1])
+        chunk_start = chunk_end
+
+    lo_days = np.concatenate(lo_parts)
+    hi_days = np.concatenate(hi_parts)
+    lo_vel, _ = _get_planet(place, planet, lo_days)
+    lo_retro = lo_vel < 0
+
+    width = np.max(hi_days - lo_days, initial=0.0)
+    iterations = max(int(np.ceil(np.log2(max(width, tol_days) / tol_days))), 0)
+    for _ in range(iterations):
+        mid_days = (lo_days + hi_days) / 2.0
+        mid_vel, _ = _get_planet(place, planet, mid_days)
+        same = (mid_vel < 0) == lo_retro
+        lo_days = np.where(same, mid_days, lo_days)
+        hi_days = np.where(same, hi_days, mid_days)
+
+    days = (lo_days + hi_days) / 2.0
+
+    retro_before = np.zeros(len(days))
+    retro_after = np.zeros(len(days))
+    for hold_days in _HOLD_DAYS:
+        retro_before += _get_planet(place, planet, days - hold_days)[0] < 0
+        retro_after += _get_planet(place, planet, days + hold_days)[0] < 0
+    majority = len(_HOLD_DAYS) / 2.0
+    holds = ((retro_before > majority) == lo_retro) & ((retro_after > majority) != lo_retro)
+
+    stations = dict()
+    stations["days"] = days[holds]
+    stations["long"] = _get_planet(place, planet, days[holds])[1]
+    stations["kind"] = np.where(lo_retro, 1, -1)[holds].astype(np.int8)
+    return stations, retro_at_start
+
+
+def get_retrograde_intervals(stations, retro_at_start, start_days, end_days):
+    """
+    Return the retrograde intervals (dict of sorted arrays: starts, ends, in
+    IST days) from the stations, clipped to the window
+    """
+    starts = []
+    ends = []
+    retro_since = start_days if retro_at_start else None
+    for days, kind in zip(stations["days"].tolist(), stations["kind"].tolist()):
+        if kind < 0 and retro_since is None:
+            retro_since = days
+        elif kind > 0 and retro_since is not None:
+            starts.append(retro_since)
+            ends.append(days)
+            retro_since = None
+    if retro_since is not None:
+        starts.append(retro_since)
+        ends.append(end_days)
+    return {"starts": np.array(starts), "ends": np.array(ends)}
+
+
+def find_stations(input_params, start_days, end_days, planets=STATION_PLANETS,
+                  tol_days=DEFAULT_TOL_DAYS):
+    """
+    Return dictionary (by planet) of the stations and retrograde intervals
+    within the window (IST days), at the place of input_params (lat_degs,
+    lat_dirn, long_degs, long_dirn)
+    """
+    place = ch.make_place(
+        input_params["lat_degs"],
+        input_params["lat_dirn"],
+        input_params["long_degs"],
+        input_params["long_dirn"],
+    )
+    found = dict()
+    for planet in planets:
+        stations, retro_at_start = get_planet_stations(
+            place, planet, start_days, end_days, tol_days
+        )
+        found[planet] = {
+            "stations": stations,
+            "retrograde": get_retrograde_intervals(
+                stations, retro_at_start, start_days, end_days
+            ),
+        }
+    return found
+
+
+def is_retrograde(intervals, ist_days):
+    """
+    Return whether (bool, or array for an array) the instants fall within a
+    retrograde interval
+    """
+    ist_days = np.asarray(ist_days, dtype=float)
+    idx = np.searchsorted(intervals["starts"], ist_days, side="right") - 1
+    inside = idx >= 0
+    ends = intervals["ends"][np.maximum(idx, 0)] if len(intervals["ends"]) else 0.0
+    return (inside & (ist_days < ends))[()]
+
+
+def get_retrograde_interval(intervals, ist_days):
+    """
+    Return (start, end) of the retrograde interval containing the instant;
+    None when the planet is direct then
+    """
+    idx = int(np.searchsorted(intervals["starts"], ist_days, side="right")) - 1
+    if idx < 0 or ist_days >= intervals["ends"][idx]:
+        return None
+    return float(intervals["starts"][idx]), float(intervals["ends"][idx])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Retrograde and direct stations")
+    parser.add_argument("--start-year", type=int, default=1800)
+    parser.add_argument("--end-year", type=int, default=2100)
+    bi.add_place_arguments(parser)
+    parser.add_argument("--planets", nargs="+", default=STATION_PLANETS,
+                        choices=list(STATION_STEPS))
+    parser.add_argument("--list", action="store_true", help="print every station")
+    args = parser.parse_args()
+
+    start_date = dt.datetime(args.start_year, 1, 1)
+    input_params = bi.get_birth_input(parser, args, start_date)
+    ist_offset_days = fn.get_ist_offset_days(
+        input_params["diff_from_gst_in_sec"], fn.get_west(input_params)
+    )
+    start_days = fn.get_days_from_epoch(start_date)
+    end_days = fn.get_days_from_epoch(dt.datetime(args.end_year + 1, 1, 1))
+    start_days += ist_offset_days
+    end_days += ist_offset_days
+
+    t0 = time.perf_counter()
+    found = find_stations(input_params, start_days, end_days, args.planets)
+    print(
+        f"Stations {args.start_year}-{args.end_year} found in "
+        f"{time.perf_counter() - t0:.1f} s"
+    )
+    for planet, planet_found in found.items():
+        stations = planet_found["stations"]
+        print(
+            f"{planet:8} {len(stations['days']):6d} stations "
+            f"{len(planet_found['retrograde']['starts']):6d} retrograde intervals"
+        )
+        if args.list:
+            for days, long_degs, kind in zip(
+                stations["days"], stations["long"], stations["kind"]
+            ):
+                when = fn.get_datetime_from_days(days - ist_offset_days)
+                turn = "retrograde" if kind < 0 else "direct"
+                print(f"  {when:%Y-%m-%d %H:%M}  {long_degs:8.3f}  {turn}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+A coarse ascendant table of asc_table.py: its lookups within the tolerance
+of batch.get_ascendant at random RAMCs and latitudes (validate_table), in
+the south as in the north, and beyond the grid.
+"""
+
+import numpy as np
+import pytest
+
+import asc_table as at
+import batch as bt
+import constants as cn
+
+
+@pytest.fixture(scope="module")
+def table():
+    return at.build_table(step_degs=0.5)
+
+
+def _diff_degs(deg1, deg2):
+    return np.abs(np.mod(deg1 - deg2 + 180.0, cn.full_circle) - 180.0)
+
+
+def test_validate(table):
+    report = at.validate_table(table, count=100_000)
+    assert report["max_error_degs"] <= report["tol_degs"] == at.DEFAULT_TOL_DEGS
+    assert report["cell_max_error_degs"] <= report["tol_degs"]
+    # Near RAMC 90 and 270 the coarse grid leaves cells to the exact function
+    assert 0.0 < report["fallback_share"] < 1.0
+
+
+def test_south(table):
+    rng = np.random.default_rng(1)
+    ramc_degs = rng.uniform(0.0, cn.full_circle, 100_000)
+    # Beyond the grid too, where the exact function serves
+    lat_degs = rng.uniform(0.0, 70.0, 100_000)
+    prec_degs = rng.uniform(20.0, 26.0, 100_000)
+    south_hemi = rng.uniform(size=100_000) < 0.5
+    assert np.any(south_hemi) and np.any(lat_degs > table["max_lat_degs"])
+
+    table_degs = at.get_ascendant(ramc_degs, lat_degs, prec_degs, south_hemi, table)
+    exact_degs = bt.get_ascendant(ramc_degs, lat_degs, prec_degs, south_hemi)
+    assert np.max(_diff_degs(table_degs, exact_degs)) <= table["tol_degs"]
+
+    # A single southern place, as numbers
+    assert _diff_degs(
+        at.get_ascendant(123.4, 33.87, 24.1, True, table),
+        bt.get_ascendant(123.4, 33.87, 24.1, True),
+    ) <= table["tol_degs"]
@@ -0,0 +1,129 @@
+"""
+batch.py against the scalar path in functions.py, chart by chart, on a
+seeded random corpus over 1800-2100 at every latitude, north and south.
+
+Tolerances (degrees): the Sun, Moon, Rahu/Ketu, RAMC, lagna and the 12
+house cusps agree to 1e-12, the planets to 1e-9 (their geocentric conversion divides by the
+distance, which costs Mercury a few more bits).  The other terms of the
+Sun (anomaly, equation of centre, velocity, radius, charam, pranam and the
+net correction) agree to 1e-11 in their own units; sunrise, sunset, IST
+and the local time agree to the microsecond.
+"""
+
+import datetime as dt
+import random
+
+import numpy as np
+import pytest
+
+import batch
+import functions as fn
+
+BODY_TOL_DEGS = 1e-12
+PLANET_TOL_DEGS = 1e-9
+SUN_TOL = 1e-11
+TIME_TOL_US = 1
+
+# Terms of get_sun_params besides the true longitude and the times
+SUN_KEYS = ("anom", "eqnc", "hvel", "rad", "charam", "pranam", "net_corr")
+
+# Beyond the latitude where the Sun grazes the horizon (see
+# functions.get_hour_angle)
+POLAR_CASES = [
+    (dt.datetime(1856, 12, 17, 12, 0), 68.7, "S"),
+    (dt.datetime(1862, 1, 5, 12, 0), 69.3, "S"),
+    (dt.datetime(2000, 6, 21, 0, 0), 89.9, "N"),
+    (dt.datetime(2000, 6, 21, 0, 0), 89.9, "S"),
+]
+
+
+def _make_corpus(seed, count, min_lat, max_lat):
+    rng = random.Random(seed)
+    input_params_list = []
+    for _ in range(count):
+        secs = rng.randrange(0, 300 * 365 * 86400)
+        input_params_list.append(
+            {
+                "in_datetime": dt.datetime(1800, 1, 1) + dt.timedelta(seconds=secs),
+                "diff_from_gst_in_sec": rng.choice([19800, 0, 18000, 36000]),
+                "lat_degs": round(rng.uniform(min_lat, max_lat), 2),
+                "lat_dirn": rng.choice("NS"),
+                "long_degs": round(rng.uniform(0.0, 180.0), 2),
+                "long_dirn": rng.choice("EW"),
+            }
+        )
+    return input_params_list
+
+
+def _polar_corpus():
+    return [
+        {
+            "in_datetime": in_datetime,
+            "diff_from_gst_in_sec": 19800,
+            "lat_degs": lat_degs,
+            "lat_dirn": lat_dirn,
+            "long_degs": 80.27,
+            "long_dirn": "E",
+        }
+        for in_datetime, lat_degs, lat_dirn in POLAR_CASES
+    ]
+
+
+def _diff_degs(deg1, deg2):
+    diff = abs(deg1 - deg2) % 360.0
+    return min(diff, 360.0 - diff)
+
+
+def _diff_us(value, values, idx):
+    return abs((np.datetime64(value, "us") - values[idx]) / np.timedelta64(1, "us"))
+
+
+CORPORA = {
+    "temperate": _make_corpus(1, 1000, 0.0, 66.0),
+    "polar": _make_corpus(2, 1000, 60.0, 90.0) + _polar_corpus(),
+}
+
+
+@pytest.mark.parametrize("corpus", sorted(CORPORA))
+def test_parity(corpus):
+    input_params_list = CORPORA[corpus]
+    input_cols = batch.stack_input_params(input_params_list)
+    sun_cols = batch.get_sun_params(input_cols)
+    moon_cols = batch.get_moon_params(sun_cols)
+    planet_cols = batch.get_seven_planets(sun_cols, moon_cols)
+    lagn_cols = batch.get_lagn_params(input_cols, sun_cols)
+    cols = batch.get_input_arrays(input_cols)
+    house_cols = batch.get_house_cusps(
+        lagn_cols["ramc"], cols["lat_degs"], sun_cols["prec"], cols["south"]
+    )
+
+    for idx, input_params in enumerate(input_params_list):
+        sun_params = fn.get_sun_params(input_params)
+        moon_params = fn.get_moon_params(input_params, sun_params)
+        seven = fn.get_seven_planets(sun_params, moon_params)
+        lagn_params = fn.get_lagn_params(input_params, sun_params)
+
+        true_long = sun_cols["true_long"][idx]
+        assert _diff_degs(sun_params["true_long"], true_long) < BODY_TOL_DEGS
+        for key in SUN_KEYS:
+            assert abs(sun_params[key] - sun_cols[key][idx]) < SUN_TOL
+        for key in ("rise", "set", "ist_time", "local_time"):
+            assert _diff_us(sun_params[key], sun_cols[key], idx) <= TIME_TOL_US
+        for key in ("moon", "rahu", "ketu"):
+            assert _diff_degs(moon_params[key], moon_cols[key][idx]) < BODY_TOL_DEGS
+        for key in ("ramc", "lagn"):
+            assert _diff_degs(lagn_params[key], lagn_cols[key][idx]) < BODY_TOL_DEGS
+        south_hemi = fn.get_south(input_params)
+        dhasa_degs = fn.get_culm_point(
+            lagn_params["ramc"], input_params["lat_degs"], sun_params["prec"], south_hemi
+        )
+        house_positions = fn.get_house_positions(
+            lagn_params["lagn"], dhasa_degs, input_params["lat_degs"],
+            lagn_params["ramc"], sun_params["prec"], south_hemi,
+        )
+        assert len(house_positions) == len(house_cols["houses"]) == 12
+        for house_degs, house_col in zip(house_positions, house_cols["houses"]):
+            assert _diff_degs(house_degs, house_col[idx]) < BODY_TOL_DEGS
+        for name, planet in seven.items():
+            true_long = planet_cols[name]["true_long"][idx]
+            assert _diff_degs(planet["true_long"], true_long) < PLANET_TOL_DEGS
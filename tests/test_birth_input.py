@@ -0,0 +1,94 @@
+"""
+BirthInput checks its fields however it is made, and has one identity, the
+instant and the place, for equality, hashing, get_input_key and its
+input_params view, and its west and south flags give the chart of the
+letters.  The time zone option of a tool without a place is a
+signed offset from GMT.
+"""
+
+import argparse
+import datetime as dt
+import pickle
+
+import pytest
+
+import birth_input as bi
+import functions as fn
+
+INPUT_PARAMS = {
+    "name": "New York",
+    "birthplace": "New York",
+    "in_datetime": dt.datetime(2024, 1, 15, 10, 30),
+    "diff_from_gst_in_sec": -18000,
+    "lat_degs": 40.71,
+    "lat_dirn": "N",
+    "long_degs": 74.01,
+    "long_dirn": "W",
+}
+
+
+@pytest.mark.parametrize(
+    "field, value",
+    [
+        ("lat", 500.0),
+        ("long", -180.5),
+        ("lat", float("nan")),
+        ("gst_offset_secs", 15 * 3600),
+        ("gst_offset_secs", 1800.5),
+        ("in_datetime", dt.datetime(2024, 1, 15, tzinfo=dt.timezone.utc)),
+        ("name", None),
+    ],
+)
+def test_direct_invalid(field, value):
+    fields = dict(
+        name="", birthplace="", in_datetime=dt.datetime(2024, 1, 15),
+        gst_offset_secs=19800, lat=13.08, long=80.27,
+    )
+    fields[field] = value
+    with pytest.raises(ValueError):
+        bi.BirthInput(**fields)
+
+
+def test_identity():
+    birth = bi.make_birth_input(INPUT_PARAMS)
+    other = bi.make_birth_input(dict(INPUT_PARAMS, name="Other", birthplace="Other"))
+    assert birth == dict(birth) and dict(birth) == birth
+    assert birth == INPUT_PARAMS
+    assert birth == other and hash(birth) == hash(other)
+    assert bi.get_input_key(birth) == bi.get_input_key(other)
+    assert birth != dict(INPUT_PARAMS, lat_dirn="S")
+    assert pickle.loads(pickle.dumps(birth)) == birth
+
+
+@pytest.mark.parametrize("lat_dirn, long_dirn", [("N", "W"), ("S", "E"), ("S", "W")])
+def test_direction_flags(lat_dirn, long_dirn):
+    input_params = dict(INPUT_PARAMS, lat_dirn=lat_dirn, long_dirn=long_dirn)
+    birth = bi.make_birth_input(input_params)
+    assert birth.west is (long_dirn == "W") and birth.south is (lat_dirn == "S")
+    assert fn.get_west(birth) is fn.get_west(input_params) is birth.west
+    assert fn.get_south(birth) is fn.get_south(input_params) is birth.south
+
+    sun_params = fn.get_sun_params(birth)
+    assert sun_params == fn.get_sun_params(input_params)
+    assert fn.get_lagn_params(birth, sun_params) == fn.get_lagn_params(input_params, sun_params)
+    assert fn.get_moon_params(birth, sun_params) == fn.get_moon_params(input_params, sun_params)
+
+
+@pytest.mark.parametrize(
+    "text, gst_offset_secs",
+    [("+05:30", 19800), ("-05:00", -18000), ("-00:30", -1800), ("00:45", 2700)],
+)
+def test_time_zone_option(text, gst_offset_secs):
+    parser = argparse.ArgumentParser()
+    bi.add_time_zone_argument(parser)
+    args = parser.parse_args([f"--tz={text}"])
+    assert bi.get_gst_offset_secs(parser, args) == gst_offset_secs
+
+
+@pytest.mark.parametrize("text", ["+15:00", "5", "+05:60", "-5:3x"])
+def test_time_zone_option_invalid(text):
+    parser = argparse.ArgumentParser()
+    bi.add_time_zone_argument(parser)
+    args = parser.parse_args([f"--tz={text}"])
+    with pytest.raises(SystemExit):
+        bi.get_gst_offset_secs(parser, args)
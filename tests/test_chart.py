@@ -0,0 +1,140 @@
+"""
+The two stages of chart.py: a moment shared between places that have the
+same instant gives each place its own chart.  The IST and local times of a
+chart, and the shadbala and bhava bala that follow from the local time, are
+those of the reference program's datetime arithmetic.
+"""
+
+import datetime as dt
+import random
+
+import pytest
+
+import chart
+import constants as cn
+import functions as fn
+import shadbala as sb
+
+CHENNAI = {
+    "name": "Chennai",
+    "birthplace": "Chennai",
+    "in_datetime": dt.datetime(2024, 3, 10, 9, 30),
+    "diff_from_gst_in_sec": 19800,
+    "lat_degs": 13.08,
+    "lat_dirn": "N",
+    "long_degs": 80.27,
+    "long_dirn": "E",
+}
+# The same instant on the clock of New York
+NEW_YORK = {
+    "name": "New York",
+    "birthplace": "New York",
+    "in_datetime": dt.datetime(2024, 3, 9, 23, 0),
+    "diff_from_gst_in_sec": 18000,
+    "lat_degs": 40.71,
+    "lat_dirn": "N",
+    "long_degs": 74.01,
+    "long_dirn": "W",
+}
+
+
+def _get_calendar(result):
+    calendar = dict(result["calendar"])
+    del calendar["dasa_table"]
+    return calendar
+
+
+@pytest.mark.parametrize("input_params", [CHENNAI, NEW_YORK])
+def test_split(input_params):
+    moment = chart.compute_moment(input_params)
+    result = chart.compute_place(moment, input_params)
+    expected = chart.compute(input_params)
+    assert result["planet_degs"] == expected["planet_degs"]
+    assert _get_calendar(result) == _get_calendar(expected)
+
+
+def test_shared_moment():
+    moment = chart.compute_moment(CHENNAI)
+    result = chart.compute_place(moment, NEW_YORK)
+    calendar = result["calendar"]
+    assert calendar["sunrise"].date() == dt.date(2024, 3, 9)
+    assert calendar["weekday"] == "Saturday"
+    assert calendar["tamil_day"] == 26
+
+    expected = chart.compute(NEW_YORK)
+    assert result["planet_degs"] == expected["planet_degs"]
+    assert result["house_positions"] == expected["house_positions"]
+    assert _get_calendar(result) == _get_calendar(expected)
+
+
+def test_other_instant():
+    moment = chart.compute_moment(CHENNAI)
+    later = dict(NEW_YORK, in_datetime=NEW_YORK["in_datetime"] + dt.timedelta(minutes=1))
+    with pytest.raises(ValueError):
+        chart.compute_place(moment, later)
+
+
+def _make_corpus(seed, count):
+    rng = random.Random(seed)
+    input_params_list = []
+    for _ in range(count):
+        secs = rng.randrange(0, 200 * 365 * 86400)
+        input_params_list.append(
+            {
+                "name": "Random",
+                "birthplace": "Random",
+                "in_datetime": dt.datetime(1900, 1, 1) + dt.timedelta(seconds=secs),
+                "diff_from_gst_in_sec": rng.choice([19800, 0, 18000, 20700, 36000]),
+                "lat_degs": round(rng.uniform(0.0, 60.0), 3),
+                "lat_dirn": rng.choice("NS"),
+                "long_degs": round(rng.uniform(0.0, 180.0), 3),
+                "long_dirn": rng.choice("EW"),
+            }
+        )
+    return input_params_list
+
+
+def _get_reference_times(input_params):
+    """
+    Return IST and the local mean time as the reference program has them:
+    datetime arithmetic on the input, the local time read to the second
+    """
+    west = fn.is_west(input_params["long_dirn"])
+    diff_from_gst_in_sec = input_params["diff_from_gst_in_sec"]
+    local_longitude = input_params["long_degs"]
+    if west:
+        diff_from_gst_in_sec = -diff_from_gst_in_sec
+        local_longitude = -local_longitude
+    time_adj_sec = cn.ist_offset_in_sec - diff_from_gst_in_sec
+    ist_time = input_params["in_datetime"] + dt.timedelta(0, time_adj_sec)
+    diff_time_in_sec = (cn.IST_longitude - local_longitude) * cn.deg_angle_to_time_sec
+    local_time = ist_time - dt.timedelta(0, diff_time_in_sec)
+    return ist_time, local_time.replace(microsecond=0)
+
+
+@pytest.mark.parametrize("input_params", _make_corpus(3, 300))
+def test_reference_times(input_params, monkeypatch):
+    shadbala_args = []
+    compute_shadbala = sb.compute_shadbala
+
+    def keep_shadbala_args(*args, **kwargs):
+        shadbala_args.append(args)
+        return compute_shadbala(*args, **kwargs)
+
+    monkeypatch.setattr(sb, "compute_shadbala", keep_shadbala_args)
+    result = chart.compute(input_params)
+
+    ist_time, local_time = _get_reference_times(input_params)
+    assert result["sun_params"]["ist_time"] == ist_time
+    assert result["sun_params"]["local_time"] == local_time
+
+    # Shadbala and bhava bala from the chart, at the reference local time
+    args = list(shadbala_args[0])
+    args[9] = chart._dt_to_hrs(local_time)
+    shad = compute_shadbala(*args)
+    assert result["shad"] == shad
+    p7_degs, house_positions, bhava1, bhava2 = args[0], args[6], args[7], args[8]
+    bhava_bala = sb.compute_bhava_bala(
+        shad["total"], p7_degs, house_positions, bhava1, bhava2
+    )
+    assert result["bhava_bala"] == bhava_bala
@@ -0,0 +1,49 @@
+"""
+A compiled ephemeris of chebyshev.py for a year at Chennai: every body
+within the tolerance of the model at random instants, and the file written
+and read back unchanged.
+"""
+
+import numpy as np
+import pytest
+
+import chebyshev as ch
+import constants as cn
+
+CHENNAI = (13.08, "N", 80.27, "E")
+
+
+@pytest.fixture(scope="module")
+def ephem():
+    return ch.compile_ephemeris(*CHENNAI, 2024, 2024)
+
+
+@pytest.mark.parametrize("body", ch.BODIES)
+def test_error_stats(ephem, body):
+    stats = ch.get_error_stats(ephem, ch.make_place(*CHENNAI), body, n_samples=5000)
+    assert stats["over_tol"] == 0
+    assert stats["max"] <= ephem["tol_degs"] * cn.seconds_in_degree
+
+
+def test_round_trip(ephem, tmp_path):
+    path = str(tmp_path / "chebyshev.bin")
+    ch.save_ephemeris(ephem, path)
+    loaded = ch.load_ephemeris(path)
+    for key in ["version", "lat_degs", "long_degs", "start_days", "end_days", "tol_degs",
+                "checksum"]:
+        assert loaded[key] == ephem[key]
+    assert list(loaded["bodies"]) == list(ephem["bodies"])
+    for body, body_ephem in ephem["bodies"].items():
+        assert loaded["bodies"][body]["degree"] == body_ephem["degree"]
+        assert np.array_equal(loaded["bodies"][body]["breaks"], body_ephem["breaks"])
+        assert np.array_equal(loaded["bodies"][body]["coeffs"], body_ephem["coeffs"])
+
+    days = np.linspace(ephem["start_days"], ephem["end_days"], 1000)
+    assert np.array_equal(
+        ch.get_longitude(loaded, "MOON", days), ch.get_longitude(ephem, "MOON", days)
+    )
+
+    # A damaged file is not read
+    with open(path, "r+b") as f:
+        f.truncate(ch._HEADER.size + 10)
+    assert ch.load_ephemeris(path) is None
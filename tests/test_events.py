@@ -0,0 +1,100 @@
+"""
+The crossing solver of events.py at Chennai: a plain one-way crossing, a
+crossing next to one of the Moon's flips, a crossing after a step back of
+the model, and a window without a crossing.  The instants below are those
+the model gives (found on a minute grid), on the IST clock.
+"""
+
+import datetime as dt
+
+import events as ev
+import functions as fn
+
+CHENNAI = {
+    "diff_from_gst_in_sec": 19800,
+    "lat_degs": 13.08,
+    "lat_dirn": "N",
+    "long_degs": 80.27,
+    "long_dirn": "E",
+}
+
+# Checks of a crossing: this far (days) either side of it
+_SIDE_DAYS = 1e-5
+
+
+def _ist_days(*args):
+    return fn.get_days_from_epoch(dt.datetime(*args))
+
+
+def _get_offset(angle, ist_days, target_degs):
+    return fn._wrap_diff_degs(ev.get_angle_degs(angle, ist_days), target_degs)
+
+
+def _check_crossing(angle, crossing, target_degs):
+    ist_days = crossing["ist_days"]
+    before = _get_offset(angle, ist_days - _SIDE_DAYS, target_degs)
+    after = _get_offset(angle, ist_days + _SIDE_DAYS, target_degs)
+    assert before < 0.0 < after
+    # Across the crossing the angle moves on, it does not jump
+    assert after - before < 1e-3
+
+
+def test_one_way():
+    # Makara Sankranti, 2024-01-15
+    sun = ev.make_angle("SUN", CHENNAI)
+    crossing = ev.find_crossing(sun, 270.0, _ist_days(2024, 1, 10), _ist_days(2024, 1, 20))
+    _check_crossing(sun, crossing, 270.0)
+    assert crossing["datetime"].date() == dt.date(2024, 1, 15)
+    assert crossing["direction"] == 1
+    assert crossing["steps_back"] == []
+    assert crossing["evals"] < 20
+
+    # The same target from 360 degrees, and a second month on
+    crossings = ev.find_crossings(sun, -90.0, _ist_days(2024, 1, 10), _ist_days(2025, 1, 20))
+    assert [found["datetime"].date() for found in crossings] == [
+        dt.date(2024, 1, 15), dt.date(2025, 1, 14)
+    ]
+
+
+def test_moon_flip():
+    # From 19:44 to 19:51 on 2023-01-07 the Moon flips from 89.93 to 179.94
+    # degrees and back; it reaches 90 degrees just after the flip
+    moon = ev.make_angle("MOON", CHENNAI)
+    flip_start = _ist_days(2023, 1, 7, 19, 44)
+    flip_end = _ist_days(2023, 1, 7, 19, 52)
+    crossing = ev.find_crossing(moon, 90.0, _ist_days(2023, 1, 7, 12), _ist_days(2023, 1, 8))
+    _check_crossing(moon, crossing, 90.0)
+    assert flip_start + 7.0 / (24 * 60) < crossing["ist_days"] < flip_end + 1.0 / 24
+
+    # Started inside the flip, the next crossing is that after it
+    inside_days = _ist_days(2023, 1, 7, 19, 47)
+    assert ev.get_flip_end(moon, inside_days) > inside_days
+    crossing = ev.find_crossing(moon, 120.0, inside_days, _ist_days(2023, 1, 12))
+    _check_crossing(moon, crossing, 120.0)
+    assert crossing["datetime"].date() == dt.date(2023, 1, 10)
+
+
+def test_step_back():
+    # At 16:53 on 2023-11-09 the Moon steps back from 169.57 to 157.40
+    # degrees.  From 10:00, past 165 degrees, it crosses 165 again after
+    # the step back, not a turn later
+    moon = ev.make_angle("MOON", CHENNAI)
+    crossing = ev.find_crossing(
+        moon, 165.0, _ist_days(2023, 11, 9, 10), _ist_days(2023, 12, 31)
+    )
+    _check_crossing(moon, crossing, 165.0)
+    assert crossing["datetime"].date() == dt.date(2023, 11, 10)
+    assert len(crossing["steps_back"]) == 1
+    step_days = crossing["steps_back"][0]
+    assert _ist_days(2023, 11, 9, 16, 53) < step_days < _ist_days(2023, 11, 9, 16, 55)
+
+
+def test_no_crossing():
+    start_days = _ist_days(2024, 1, 10)
+    end_days = _ist_days(2024, 1, 20)
+    sun = ev.make_angle("SUN", CHENNAI)
+    assert ev.find_crossing(sun, 90.0, start_days, end_days) is None
+    assert ev.find_crossings(sun, 90.0, start_days, end_days) == []
+    # A scanned angle: Saturn stays in Kumbha all of January 2024
+    saturn = ev.make_angle("SATURN", CHENNAI)
+    assert ev.find_crossing(saturn, 0.0, start_days, end_days) is None
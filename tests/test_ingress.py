@@ -0,0 +1,34 @@
+"""
+ingress.py at Chennai: the model's jumps are ingresses into the sign they
+land in, with the direction they move in.
+"""
+
+import datetime as dt
+
+import pytest
+
+import functions as fn
+import ingress as ing
+
+CHENNAI = {"lat_degs": 13.08, "lat_dirn": "N", "long_degs": 80.27, "long_dirn": "E"}
+
+# The Moon steps 118.5 -> 130.4 degrees (into Simha) on 2023-09-12, and
+# 350.8 -> 4.2 degrees (into Mesha) on 2022-09-12
+MOON_STEPS = [
+    (dt.datetime(2023, 9, 10), dt.datetime(2023, 9, 15), 4, [3, 4, 5]),
+    (dt.datetime(2022, 9, 10), dt.datetime(2022, 9, 15), 0, [11, 0, 1]),
+]
+
+
+@pytest.mark.parametrize("start, end, rasi, entered", MOON_STEPS)
+def test_moon_step(start, end, rasi, entered):
+    calendar = ing.build_calendar(
+        CHENNAI, fn.get_days_from_epoch(start), fn.get_days_from_epoch(end), ["MOON"]
+    )
+    found = ing.find_ingresses(calendar, "MOON", "rasi")
+    assert [entry["rasi"] for entry in found] == entered
+    assert all(entry["direction"] == 1 for entry in found)
+
+    (entry,) = ing.find_ingresses(calendar, "MOON", "rasi", index=rasi)
+    assert ing.get_position(calendar, "MOON", entry["ist_days"] + 0.01)["rasi"] == rasi
+    assert ing.get_position(calendar, "MOON", entry["ist_days"] - 0.01)["rasi"] != rasi
@@ -0,0 +1,66 @@
+"""
+lagna_times.find_rasi_risings against the scalar lagna (get_lagn_params):
+a few seconds before each rising the lagna is short of the rasi, a few
+seconds after it is in it, at places north and south, east and west, up to
+the latitude of Oslo.
+"""
+
+import datetime as dt
+
+import pytest
+
+import chebyshev as ch
+import constants as cn
+import functions as fn
+import lagna_times as lt
+
+# Checks of a rising: this far (days) either side of it
+_SIDE_DAYS = 3.0 / cn.seconds_in_day
+
+PLACES = [
+    (13.08, "N", 80.27, "E"),  # Chennai
+    (33.87, "S", 151.21, "E"),  # Sydney
+    (51.51, "N", 0.13, "W"),  # London
+    (34.60, "S", 58.38, "W"),  # Buenos Aires
+    (59.91, "N", 10.75, "E"),  # Oslo
+    (54.80, "S", 68.30, "W"),  # Ushuaia
+]
+
+
+def _get_scalar_offset(place, ist_days, target_degs):
+    """
+    Return the scalar lagna at the place less target_degs (wrapped), for
+    the instant on the IST clock
+    """
+    lat_degs, lat_dirn, long_degs, long_dirn = place
+    input_params = {
+        "in_datetime": fn.get_datetime_from_days(ist_days),
+        # The clock is IST at every place: the sign is undone for the west
+        "diff_from_gst_in_sec": (
+            -cn.ist_offset_in_sec if fn.is_west(long_dirn) else cn.ist_offset_in_sec
+        ),
+        "lat_degs": lat_degs,
+        "lat_dirn": lat_dirn,
+        "long_degs": long_degs,
+        "long_dirn": long_dirn,
+    }
+    sun_params = fn.get_sun_params(input_params)
+    lagn_degs = fn.get_lagn_params(input_params, sun_params)["lagn"]
+    return fn._wrap_diff_degs(lagn_degs, target_degs)
+
+
+@pytest.mark.parametrize("place", PLACES)
+@pytest.mark.parametrize("start", [dt.datetime(2024, 1, 15), dt.datetime(2024, 6, 21)])
+def test_risings(place, start):
+    start_days = fn.get_days_from_epoch(start)
+    rising_days, rising_rasi = lt.find_rasi_risings(
+        ch.make_place(*place), start_days, start_days + 3.0
+    )
+    # Every rasi in turn, 12 or 13 a day
+    assert 36 <= len(rising_days) <= 38
+    assert all((rising_rasi[1:] - rising_rasi[:-1]) % 12 == 1)
+
+    for ist_days, rasi in zip(rising_days, rising_rasi):
+        target_degs = rasi * cn.deg_in_house
+        assert _get_scalar_offset(place, ist_days - _SIDE_DAYS, target_degs) < 0.0
+        assert _get_scalar_offset(place, ist_days + _SIDE_DAYS, target_degs) >= 0.0
@@ -0,0 +1,170 @@
+"""
+The interval sets of muhurta.py at their edges (empty, touching and nested
+intervals), a search at Chennai against the constraints evaluated on a
+grid of instants a minute apart, and the daylight of the polar day and
+night.
+"""
+
+import datetime as dt
+
+import numpy as np
+import pytest
+
+import events as ev
+import functions as fn
+import muhurta as mh
+import panchang as pc
+from constants import RASI_NAMES, WDAYS
+
+CHENNAI = {
+    "name": "Chennai",
+    "birthplace": "Chennai",
+    "in_datetime": dt.datetime(2025, 1, 1),
+    "diff_from_gst_in_sec": 19800,
+    "lat_degs": 13.08,
+    "lat_dirn": "N",
+    "long_degs": 80.27,
+    "long_dirn": "E",
+}
+
+# A grid instant this close (days) to the edge of a window may fall either
+# side: the lagna of the search comes from the compiled ephemeris
+_EDGE_DAYS = 1e-4
+
+
+def _get_pairs(intervals):
+    return list(zip(intervals["starts"].tolist(), intervals["ends"].tolist()))
+
+
+def _make(*pairs):
+    return mh.make_intervals([start for start, _ in pairs], [end for _, end in pairs])
+
+
+@pytest.mark.parametrize(
+    "first, second, expected",
+    [
+        ([], [(0.0, 1.0)], []),
+        ([(0.0, 1.0)], [], []),
+        ([(0.0, 1.0)], [(1.0, 2.0)], []),
+        ([(0.0, 10.0)], [(2.0, 3.0), (5.0, 6.0)], [(2.0, 3.0), (5.0, 6.0)]),
+        ([(0.0, 2.0), (3.0, 5.0)], [(1.0, 4.0)], [(1.0, 2.0), (3.0, 4.0)]),
+    ],
+)
+def test_intersect(first, second, expected):
+    assert _get_pairs(mh.intersect_intervals(_make(*first), _make(*second))) == expected
+    assert _get_pairs(mh.intersect_intervals(_make(*second), _make(*first))) == expected
+
+
+@pytest.mark.parametrize(
+    "first, second, expected",
+    [
+        ([], [(0.0, 1.0)], []),
+        ([(0.0, 1.0)], [], [(0.0, 1.0)]),
+        ([(0.0, 1.0)], [(1.0, 2.0)], [(0.0, 1.0)]),
+        ([(1.0, 2.0)], [(0.0, 1.0)], [(1.0, 2.0)]),
+        ([(0.0, 10.0)], [(2.0, 3.0), (5.0, 6.0)], [(0.0, 2.0), (3.0, 5.0), (6.0, 10.0)]),
+        ([(2.0, 3.0)], [(0.0, 10.0)], []),
+        ([(0.0, 2.0), (3.0, 5.0)], [(1.0, 4.0)], [(0.0, 1.0), (4.0, 5.0)]),
+    ],
+)
+def test_subtract(first, second, expected):
+    assert _get_pairs(mh.subtract_intervals(_make(*first), _make(*second))) == expected
+
+
+def _get_sun_days(input_params, first_date, day_count):
+    """
+    Return the sunrise and sunset (IST days) of each date, from the scalar
+    model at noon
+    """
+    stream = ev.make_stream(input_params)
+    ist_offset_days = stream["ist_offset_days"]
+    sun_days = dict()
+    for idx in range(day_count):
+        date = first_date + dt.timedelta(days=idx)
+        noon_days = fn.get_days_from_epoch(dt.datetime(date.year, date.month, date.day, 12))
+        time_params = fn.make_time_params(
+            noon_days, ist_offset_days, stream["local_offset_days"]
+        )
+        sun_params = fn.get_sun_core(input_params, time_params)
+        sun_days[date] = (
+            sun_params["rise_days"] + ist_offset_days,
+            sun_params["set_days"] + ist_offset_days,
+        )
+    return sun_days
+
+
+def test_search():
+    constraints = [
+        mh.make_constraint("nakshatra", ["Rohini", "Hastham", "Anusham", "Revathi"]),
+        mh.make_constraint("thithi", ["Amavasya"], exclude=True),
+        mh.make_constraint("lagna", ["fixed"]),
+        mh.make_constraint("rahu_kalam", exclude=True),
+        mh.make_constraint("weekday", ["Sunday"], exclude=True),
+    ]
+    start_days = fn.get_days_from_epoch(dt.datetime(2025, 1, 1))
+    end_days = start_days + 10.0
+    windows = mh.find_muhurtas(CHENNAI, start_days, end_days, constraints)
+    assert windows
+    assert [window["minutes"] for window in windows] == sorted(
+        (window["minutes"] for window in windows), reverse=True
+    )
+    edges = np.array(
+        [window["start_ist_days"] for window in windows]
+        + [window["end_ist_days"] for window in windows]
+    )
+
+    stream = ev.make_stream(CHENNAI)
+    moon = ev.make_angle("MOON", CHENNAI, stream)
+    moon_sun = ev.make_angle("MOON-SUN", CHENNAI, stream)
+    lagna = ev.make_angle("LAGNA", CHENNAI, stream)
+    sun_days = _get_sun_days(CHENNAI, dt.date(2024, 12, 31), 12)
+    fixed = mh.LAGNA_GROUPS["fixed"]
+    meeting = 0
+
+    def meets(ist_days):
+        date = fn.get_datetime_from_days(ist_days).date()
+        rise_days, set_days = sun_days[date]
+        if ist_days < rise_days:
+            date -= dt.timedelta(days=1)
+            rise_days, set_days = sun_days[date]
+        weekday = WDAYS[(date.weekday() + 1) % 7]
+        part_days = (set_days - rise_days) / 8.0
+        part = mh.RAHU_KALAM_PARTS[(date.weekday() + 1) % 7]
+        rahu_start = rise_days + part * part_days
+        rahu_kalam = rahu_start <= ist_days < rahu_start + part_days
+        nakshatra_num, _ = pc.get_element_num(moon, "nakshatra", ist_days)
+        thithi_num, _ = pc.get_element_num(moon_sun, "thithi", ist_days)
+        nakshatra = pc.get_element_name("nakshatra", nakshatra_num)
+        thithi = pc.get_element_name("thithi", thithi_num)
+        rasi = RASI_NAMES[int(ev.get_angle_degs(lagna, ist_days) // 30.0)]
+        return (
+            nakshatra in ("Rohini", "Hastham", "Anusham", "Revathi")
+            and thithi != "Amavasya"
+            and rasi in fixed
+            and not rahu_kalam
+            and weekday != "Sunday"
+        )
+
+    grid_days = start_days + (np.arange(10 * 24 * 60) + 0.5) / (24 * 60)
+    for ist_days in grid_days.tolist():
+        found = any(
+            window["start_ist_days"] <= ist_days < window["end_ist_days"] for window in windows
+        )
+        if found != meets(ist_days):
+            assert np.min(np.abs(edges - ist_days)) < _EDGE_DAYS
+        meeting += found
+    # Over 10 hours of the 10 days meet them all
+    assert meeting > 600
+
+
+@pytest.mark.parametrize("month, daylight_days", [(6, 10.0), (12, 0.0)])
+def test_polar_daylight(month, daylight_days):
+    # At 78 N the model's day is a whole day of daylight in June, and has
+    # none in December
+    place = dict(CHENNAI, diff_from_gst_in_sec=3600, lat_degs=78.22, long_degs=15.65)
+    start_days = fn.get_days_from_epoch(dt.datetime(2024, month, 1))
+    windows = mh.find_muhurtas(
+        place, start_days, start_days + 10.0, [mh.make_constraint("daylight")]
+    )
+    total_days = sum(window["minutes"] for window in windows) / (24 * 60)
+    assert total_days == pytest.approx(daylight_days, abs=1e-6)
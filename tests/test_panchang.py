@@ -0,0 +1,99 @@
+"""
+Whole years of panchangs, day after day as almanac.py makes them: every
+element has its end, the elements at sunrise are those of the model, and a
+day carried over from the previous one is the day computed afresh.
+"""
+
+import datetime as dt
+import math
+
+import pytest
+
+import events as ev
+import panchang as pc
+
+PLACES = {
+    "chennai": {
+        "diff_from_gst_in_sec": 19800,
+        "lat_degs": 13.08,
+        "lat_dirn": "N",
+        "long_degs": 80.27,
+        "long_dirn": "E",
+    },
+    "new_york": {
+        "diff_from_gst_in_sec": -18000,
+        "lat_degs": 40.71,
+        "lat_dirn": "N",
+        "long_degs": 74.01,
+        "long_dirn": "W",
+    },
+    "sydney": {
+        "diff_from_gst_in_sec": 36000,
+        "lat_degs": 33.87,
+        "lat_dirn": "S",
+        "long_degs": 151.21,
+        "long_dirn": "E",
+    },
+}
+
+
+def _get_year(place, year):
+    """
+    Return the panchangs of every day of the year at the place, each made
+    from the previous one
+    """
+    panchangs = []
+    previous = None
+    day = dt.date(year, 1, 1)
+    while day.year == year:
+        input_params = dict(place, in_datetime=dt.datetime(day.year, day.month, day.day, 12))
+        previous = pc.get_panchang(input_params, previous=previous)
+        panchangs.append((input_params, previous))
+        day += dt.timedelta(days=1)
+    return panchangs
+
+
+@pytest.mark.parametrize("year", [2021, 2024])
+@pytest.mark.parametrize("place_name", sorted(PLACES))
+def test_year(place_name, year):
+    place = PLACES[place_name]
+    stream = ev.make_stream(place)
+    for input_params, panchang in _get_year(place, year):
+        day = input_params["in_datetime"].date()
+        for element, (name, width_degs, count) in pc.ELEMENTS.items():
+            entries = panchang[element]
+            ends = [entry["end_ist_days"] for entry in entries]
+            assert None not in ends, (day, element)
+            assert ends == sorted(ends), (day, element)
+            assert ends[0] > panchang["rise_ist_days"], (day, element)
+            assert ends[-1] >= panchang["next_rise_ist_days"], (day, element)
+
+            angle = ev.make_angle(name, place, stream)
+            rise_days = ev.get_flip_end(angle, panchang["rise_ist_days"])
+            num = math.floor(ev.get_angle_degs(angle, rise_days) / width_degs) % count
+            assert entries[0]["num"] == num, (day, element)
+
+
+def test_carried_over():
+    place = PLACES["chennai"]
+    for input_params, panchang in _get_year(place, 2024)[150:200]:
+        fresh = pc.get_panchang(input_params)
+        for element in pc.ELEMENTS:
+            carried = [(entry["num"], entry["end_ist_days"]) for entry in panchang[element]]
+            expected = [(entry["num"], entry["end_ist_days"]) for entry in fresh[element]]
+            assert [num for num, _ in carried] == [num for num, _ in expected]
+            for (_, end_days), (_, expected_days) in zip(carried, expected):
+                assert end_days == pytest.approx(expected_days, abs=ev.DEFAULT_TOL_DAYS)
+
+
+def test_ends_at_sunrise():
+    # The Moon crosses into Aswini as one of its flips begins
+    input_params = dict(PLACES["chennai"], in_datetime=dt.datetime(2024, 6, 30, 12))
+    panchang = pc.get_panchang(input_params)
+    for element in pc.ELEMENTS:
+        for entry in panchang[element]:
+            assert entry["end"] is not None, element
+            assert entry["end_ist_days"] > panchang["rise_ist_days"], element
+    names = [entry["name"] for entry in panchang["nakshatra"]]
+    assert names[:2] == ["Revathi", "Aswini"]
+    assert panchang["nakshatra"][1]["end"] > dt.datetime(2024, 7, 1)
@@ -0,0 +1,32 @@
+"""
+A prashna session gives the chart chart.compute gives at each instant,
+through a Sankranti, with the Tamil date taken from its cache.
+"""
+
+import datetime as dt
+
+import pytest
+
+import birth_input as bi
+import chart
+import prashna
+
+
+@pytest.mark.parametrize(
+    "lat, long, gst_offset_secs", [(13.08, 80.27, 19800), (64.84, -147.72, 32400)]
+)
+def test_steps(lat, long, gst_offset_secs):
+    # Makara Sankranti falls on 2024-01-15
+    birth = bi.BirthInput(
+        "Prashna", "", dt.datetime(2024, 1, 13, 20, 0), gst_offset_secs, lat, long
+    )
+    session = prashna.make_prashna(birth)
+    tamil_months = set()
+    for _ in range(120):
+        result = prashna.advance(session, 37)
+        expected = chart.compute(session["input_params"])
+        assert result["planet_degs"] == expected["planet_degs"]
+        assert result["calendar"] == expected["calendar"]
+        tamil_months.add(result["calendar"]["tamil_month"])
+    assert len(tamil_months) == 2
+    assert session["cache"]["tamil"]
@@ -0,0 +1,125 @@
+"""
+The Sankranti table of sankranti.py: its ingresses against a direct solve
+of the Sun's longitude, a table file rebuilt when its version or checksum
+is not current, and the model searched without the table outside
+1800-2100.
+"""
+
+import datetime as dt
+import functools
+
+import pytest
+
+import functions as fn
+import sankranti as sk
+
+
+def _solve_ingress(after_days, target_degs):
+    """
+    Return the first instant (days) after after_days at which the Sun's
+    longitude before the net correction reaches target_degs: a day-by-day
+    scan for the bracket, then bisection
+    """
+    lo_days = after_days
+    while fn._wrap_diff_degs(sk.get_true_long_sun(lo_days + 1.0), target_degs) < 0:
+        lo_days += 1.0
+    hi_days = lo_days + 1.0
+    while hi_days - lo_days > 1e-9:
+        mid_days = (lo_days + hi_days) / 2.0
+        if fn._wrap_diff_degs(sk.get_true_long_sun(mid_days), target_degs) < 0:
+            lo_days = mid_days
+        else:
+            hi_days = mid_days
+    return hi_days
+
+
+@pytest.mark.parametrize(
+    "start",
+    [dt.datetime(1800, 1, 1), dt.datetime(1947, 8, 1), dt.datetime(2100, 1, 1)],
+)
+def test_ingress_days(start):
+    # Each month in turn from the start, for a year
+    start_days = fn.get_days_from_epoch(start)
+    month = int(sk.get_true_long_sun(start_days) / 30.0)
+    for _ in range(12):
+        month = (month + 1) % 12
+        solved_days = _solve_ingress(start_days, month * 30.0)
+        # Seen from a few days after it, the table has the same ingress
+        assert sk.find_ingress_days(solved_days + 3.0, month) == pytest.approx(
+            solved_days, abs=1e-6
+        )
+        start_days = solved_days
+
+
+@pytest.fixture(scope="module")
+def built_table():
+    return sk.build_ingress_table()
+
+
+@pytest.fixture
+def table_path(tmp_path, monkeypatch):
+    """
+    Return the path of a table file in tmp_path, with get_ingress_table
+    reading and writing there and no table in memory or in the store
+    """
+    path = str(tmp_path / "sankranti.bin")
+    monkeypatch.setattr(sk, "_table", None)
+    monkeypatch.setattr(sk, "get_stored_table", lambda store=None: None)
+    monkeypatch.setattr(
+        sk, "load_ingress_table", functools.partial(sk.load_ingress_table, path=path)
+    )
+    monkeypatch.setattr(
+        sk, "save_ingress_table", functools.partial(sk.save_ingress_table, path=path)
+    )
+    return path
+
+
+def test_round_trip(table_path, built_table):
+    table = built_table
+    sk.save_ingress_table(table)
+    loaded = sk.load_ingress_table()
+    assert loaded["checksum"] == table["checksum"]
+    assert list(loaded["days"]) == list(table["days"])
+    assert sk.get_ingress_table()["days"] == loaded["days"]
+
+
+@pytest.mark.parametrize("stale", ["version", "checksum"])
+def test_rebuild(table_path, built_table, stale):
+    table = dict(built_table)
+    days = list(table["days"])
+    table["days"] = [day + 1.0 for day in days]
+    if stale == "version":
+        table["version"] = sk.TABLE_VERSION + 1
+    else:
+        table["checksum"] = bytes(32)
+    sk.save_ingress_table(table)
+    assert sk.load_ingress_table() is None
+
+    # The stale table is rebuilt, and written back
+    assert list(sk.get_ingress_table()["days"]) == days
+    assert list(sk.load_ingress_table()["days"]) == days
+
+
+CHENNAI = {
+    "name": "Chennai",
+    "birthplace": "Chennai",
+    "diff_from_gst_in_sec": 19800,
+    "lat_degs": 13.08,
+    "lat_dirn": "N",
+    "long_degs": 80.27,
+    "long_dirn": "E",
+}
+
+
+@pytest.mark.parametrize(
+    "in_datetime, tamil_date",
+    [(dt.datetime(1790, 5, 20, 12), (10, 1, 43)), (dt.datetime(2110, 9, 25, 12), (8, 5, 3))],
+)
+def test_outside_table(in_datetime, tamil_date):
+    input_params = dict(CHENNAI, in_datetime=in_datetime)
+    sun_params = fn.get_sun_params(input_params)
+    month = int(sun_params["true_long"] / 30.0)
+    assert sk.find_ingress_days(fn.get_days_from_epoch(in_datetime), month) is None
+    assert fn._sankranti_days_back(sun_params, month) is None
+    # The search is seeded from the Sun's mean motion instead
+    assert fn.calc_tamil_date(input_params) == tamil_date
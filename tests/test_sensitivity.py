@@ -0,0 +1,52 @@
+"""
+sensitivity.find_changes against the chart elements evaluated every few
+seconds over the window.
+"""
+
+import datetime as dt
+
+import pytest
+
+import events as ev
+import functions as fn
+import sensitivity as se
+
+CASES = [
+    # The Venus bhava goes back and forward again: the one-way solve for
+    # its boundaries does not see the change at -28.4 minutes
+    {
+        "in_datetime": dt.datetime(1928, 10, 17, 11, 2),
+        "diff_from_gst_in_sec": 28800,
+        "lat_degs": 27.04,
+        "lat_dirn": "S",
+        "long_degs": 115.868745,
+        "long_dirn": "E",
+    },
+    {
+        "in_datetime": dt.datetime(1957, 6, 4, 1, 8),
+        "diff_from_gst_in_sec": 19800,
+        "lat_degs": 11.66,
+        "lat_dirn": "N",
+        "long_degs": 78.15,
+        "long_dirn": "E",
+    },
+]
+MINUTES = 30
+SCAN_MINUTES = 0.05
+
+
+@pytest.mark.parametrize("input_params", CASES)
+def test_all_changes(input_params):
+    report = se.find_changes(input_params, MINUTES)
+    found = [change["minutes"] for change in report["changes"]]
+
+    stream = ev.make_stream(input_params)
+    birth_days = fn.get_days_from_epoch(input_params["in_datetime"])
+    birth_days += stream["ist_offset_days"]
+    previous = None
+    for step in range(int(2 * MINUTES / SCAN_MINUTES)):
+        minutes = -MINUTES + (step + 0.5) * SCAN_MINUTES
+        state = se.get_chart_state(stream, birth_days + minutes / (24 * 60))
+        if previous is not None and state != previous:
+            assert any(abs(minutes - SCAN_MINUTES - at) < SCAN_MINUTES for at in found)
+        previous = state
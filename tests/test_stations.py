@@ -0,0 +1,57 @@
+"""
+The stations of stations.py at Chennai over 2000-2030: they alternate
+between turning retrograde and turning direct, and the retrograde intervals
+built from them agree with the sign of the scalar model's geocentric
+velocity (the gvel of get_seven_planets) every other day of the span.
+"""
+
+import datetime as dt
+
+import numpy as np
+import pytest
+
+import chebyshev as ch
+import functions as fn
+import stations as st
+
+CHENNAI = {
+    "diff_from_gst_in_sec": 19800,
+    "lat_degs": 13.08,
+    "lat_dirn": "N",
+    "long_degs": 80.27,
+    "long_dirn": "E",
+}
+
+START_DAYS = fn.get_days_from_epoch(dt.datetime(2000, 1, 1))
+END_DAYS = fn.get_days_from_epoch(dt.datetime(2030, 1, 1))
+# Days between the checks of the sign of the velocity
+CHECK_STEP_DAYS = 2.0
+# Checks this near (days) a station are skipped
+_NEAR_DAYS = 1e-4
+
+
+def _get_scalar_gvel(planet, ist_days):
+    input_params = dict(CHENNAI, in_datetime=fn.get_datetime_from_days(ist_days))
+    sun_params = fn.get_sun_params(input_params)
+    moon_params = fn.get_moon_params(input_params, sun_params)
+    return fn.get_seven_planets(sun_params, moon_params)[planet]["gvel"]
+
+
+@pytest.mark.parametrize("planet", ["MARS", "JUPITER", "SATURN"])
+def test_stations(planet):
+    place = ch.make_place(
+        CHENNAI["lat_degs"], CHENNAI["lat_dirn"], CHENNAI["long_degs"], CHENNAI["long_dirn"]
+    )
+    stations, retro_at_start = st.get_planet_stations(place, planet, START_DAYS, END_DAYS)
+    kinds = stations["kind"].tolist()
+    # Mars goes retrograde about every two years, Jupiter and Saturn every
+    # year; the planet turns retrograde and direct in turn
+    assert 20 <= len(kinds) <= 62
+    assert kinds[0] == (1 if retro_at_start else -1)
+    assert all(kind != next_kind for kind, next_kind in zip(kinds, kinds[1:]))
+
+    intervals = st.get_retrograde_intervals(stations, retro_at_start, START_DAYS, END_DAYS)
+    for ist_days in np.arange(START_DAYS, END_DAYS, CHECK_STEP_DAYS):
+        if np.min(np.abs(stations["days"] - ist_days)) < _NEAR_DAYS:
+            continue
+        assert st.is_retrograde(intervals, ist_days) == (_get_scalar_gvel(planet, ist_days) < 0)
@@ -0,0 +1,128 @@
+"""
+calc_tamil_date against the day-by-day, minute-by-minute walk it replaced:
+the (day, month, year) below are those the walk gave, frozen.  They are
+taken within minutes of a Sankranti, either side of the sunset on its day
+and before the next sunrise, at places north and south, east and west, up
+to 65 degrees of latitude, and at both ends of the Sankranti table
+(1800-2100) and beyond them, where the search is seeded without it.
+"""
+
+import datetime as dt
+
+import pytest
+
+import functions as fn
+
+# diff_from_gst_in_sec, lat_degs, lat_dirn, long_degs, long_dirn
+PLACES = {
+    "CHENNAI": (19800, 13.08, "N", 80.27, "E"),
+    "SYDNEY": (36000, 33.87, "S", 151.21, "E"),
+    "NEW_YORK": (18000, 40.71, "N", 74.01, "W"),
+    "BUENOS_AIRES": (10800, 34.6, "S", 58.38, "W"),
+    "REYKJAVIK": (0, 64.15, "N", 21.94, "W"),
+    "FAIRBANKS": (32400, 64.84, "N", 147.72, "W"),
+}
+
+# place, in_datetime, (tamil day, month, year) of the walk
+CASES = [
+    ("CHENNAI", dt.datetime(2024, 1, 15, 2, 5), (30, 8, 36)),
+    ("CHENNAI", dt.datetime(2024, 1, 15, 2, 11), (30, 9, 36)),
+    ("CHENNAI", dt.datetime(2024, 1, 15, 17, 45), (1, 9, 36)),
+    ("CHENNAI", dt.datetime(2024, 1, 15, 17, 51), (1, 9, 36)),
+    ("CHENNAI", dt.datetime(2024, 1, 16, 3, 8), (1, 9, 36)),
+    ("CHENNAI", dt.datetime(2024, 1, 20, 12, 0), (6, 9, 36)),
+    ("CHENNAI", dt.datetime(2024, 4, 13, 18, 6), (31, 11, 36)),
+    ("CHENNAI", dt.datetime(2024, 4, 13, 18, 12), (31, 11, 36)),
+    ("CHENNAI", dt.datetime(2024, 4, 13, 20, 38), (31, 11, 36)),
+    ("CHENNAI", dt.datetime(2024, 4, 13, 20, 44), (0, 0, 37)),
+    ("CHENNAI", dt.datetime(2024, 4, 14, 3, 41), (31, 0, 37)),
+    ("CHENNAI", dt.datetime(2024, 4, 20, 12, 0), (7, 0, 37)),
+    ("CHENNAI", dt.datetime(1799, 12, 13, 4, 49), (30, 7, 52)),
+    ("CHENNAI", dt.datetime(1799, 12, 13, 4, 55), (30, 8, 52)),
+    ("CHENNAI", dt.datetime(1799, 12, 13, 17, 29), (1, 8, 52)),
+    ("CHENNAI", dt.datetime(1799, 12, 13, 17, 35), (1, 8, 52)),
+    ("CHENNAI", dt.datetime(1799, 12, 14, 3, 52), (1, 8, 52)),
+    ("CHENNAI", dt.datetime(1800, 1, 3, 12, 0), (22, 8, 52)),
+    ("CHENNAI", dt.datetime(2100, 12, 17, 9, 33), (1, 8, 53)),
+    ("CHENNAI", dt.datetime(2100, 12, 17, 9, 39), (1, 8, 53)),
+    ("CHENNAI", dt.datetime(2100, 12, 17, 17, 30), (1, 8, 53)),
+    ("CHENNAI", dt.datetime(2100, 12, 17, 17, 36), (1, 8, 53)),
+    ("CHENNAI", dt.datetime(2100, 12, 18, 3, 36), (1, 8, 53)),
+    ("CHENNAI", dt.datetime(2100, 12, 28, 12, 0), (12, 8, 53)),
+    ("SYDNEY", dt.datetime(2023, 8, 17, 17, 23), (1, 4, 36)),
+    ("SYDNEY", dt.datetime(2023, 8, 17, 17, 24), (1, 4, 36)),
+    ("SYDNEY", dt.datetime(2023, 8, 17, 17, 29), (1, 4, 36)),
+    ("SYDNEY", dt.datetime(2023, 8, 17, 17, 30), (1, 4, 36)),
+    ("SYDNEY", dt.datetime(2023, 8, 18, 3, 26), (1, 4, 36)),
+    ("SYDNEY", dt.datetime(2023, 8, 25, 12, 0), (9, 4, 36)),
+    ("NEW_YORK", dt.datetime(2024, 10, 16, 17, 10), (31, 5, 37)),
+    ("NEW_YORK", dt.datetime(2024, 10, 16, 17, 16), (31, 5, 37)),
+    ("NEW_YORK", dt.datetime(2024, 10, 16, 20, 52), (31, 5, 37)),
+    ("NEW_YORK", dt.datetime(2024, 10, 16, 20, 58), (0, 6, 37)),
+    ("NEW_YORK", dt.datetime(2024, 10, 17, 3, 55), (31, 6, 37)),
+    ("NEW_YORK", dt.datetime(2024, 10, 25, 12, 0), (9, 6, 37)),
+    ("BUENOS_AIRES", dt.datetime(1950, 6, 14, 15, 31), (1, 2, 23)),
+    ("BUENOS_AIRES", dt.datetime(1950, 6, 14, 15, 37), (1, 2, 23)),
+    ("BUENOS_AIRES", dt.datetime(1950, 6, 14, 16, 48), (1, 2, 23)),
+    ("BUENOS_AIRES", dt.datetime(1950, 6, 14, 16, 54), (1, 2, 23)),
+    ("BUENOS_AIRES", dt.datetime(1950, 6, 15, 3, 34), (1, 2, 23)),
+    ("BUENOS_AIRES", dt.datetime(1950, 6, 25, 12, 0), (12, 2, 23)),
+    ("REYKJAVIK", dt.datetime(2000, 12, 15, 8, 44), (29, 7, 13)),
+    ("REYKJAVIK", dt.datetime(2000, 12, 15, 8, 50), (29, 8, 13)),
+    ("REYKJAVIK", dt.datetime(2000, 12, 15, 13, 41), (1, 8, 13)),
+    ("REYKJAVIK", dt.datetime(2000, 12, 15, 13, 47), (1, 8, 13)),
+    ("REYKJAVIK", dt.datetime(2000, 12, 16, 3, 47), (1, 8, 13)),
+    ("REYKJAVIK", dt.datetime(2000, 12, 25, 12, 0), (11, 8, 13)),
+    ("FAIRBANKS", dt.datetime(2024, 7, 15, 16, 52), (1, 3, 37)),
+    ("FAIRBANKS", dt.datetime(2024, 7, 15, 16, 58), (1, 3, 37)),
+    ("FAIRBANKS", dt.datetime(2024, 7, 15, 21, 49), (1, 3, 37)),
+    ("FAIRBANKS", dt.datetime(2024, 7, 15, 21, 55), (1, 3, 37)),
+    ("FAIRBANKS", dt.datetime(2024, 7, 16, 3, 55), (2, 3, 37)),
+    ("FAIRBANKS", dt.datetime(2024, 7, 25, 12, 0), (11, 3, 37)),
+    ("FAIRBANKS", dt.datetime(1800, 2, 9, 11, 47), (1, 10, 52)),
+    ("FAIRBANKS", dt.datetime(1800, 2, 9, 11, 53), (1, 10, 52)),
+    ("FAIRBANKS", dt.datetime(1800, 2, 9, 15, 56), (1, 10, 52)),
+    ("FAIRBANKS", dt.datetime(1800, 2, 9, 16, 2), (1, 10, 52)),
+    ("FAIRBANKS", dt.datetime(1800, 2, 10, 3, 50), (1, 10, 52)),
+    ("FAIRBANKS", dt.datetime(1800, 2, 20, 12, 0), (12, 10, 52)),
+    ("SYDNEY", dt.datetime(2100, 11, 17, 18, 36), (30, 6, 53)),
+    ("SYDNEY", dt.datetime(2100, 11, 17, 18, 42), (30, 6, 53)),
+    ("SYDNEY", dt.datetime(2100, 11, 17, 23, 4), (30, 6, 53)),
+    ("SYDNEY", dt.datetime(2100, 11, 17, 23, 10), (0, 7, 53)),
+    ("SYDNEY", dt.datetime(2100, 11, 18, 3, 7), (30, 7, 53)),
+    ("SYDNEY", dt.datetime(2100, 11, 25, 12, 0), (8, 7, 53)),
+    ("NEW_YORK", dt.datetime(1801, 3, 11, 17, 55), (30, 10, 53)),
+    ("NEW_YORK", dt.datetime(1801, 3, 11, 18, 1), (30, 10, 53)),
+    ("NEW_YORK", dt.datetime(1801, 3, 11, 21, 8), (30, 10, 53)),
+    ("NEW_YORK", dt.datetime(1801, 3, 11, 21, 14), (0, 11, 53)),
+    ("NEW_YORK", dt.datetime(1801, 3, 12, 3, 11), (30, 11, 53)),
+    ("NEW_YORK", dt.datetime(1801, 3, 25, 12, 0), (14, 11, 53)),
+    ("CHENNAI", dt.datetime(1790, 5, 11, 18, 3), (1, 1, 43)),
+    ("CHENNAI", dt.datetime(1790, 5, 11, 18, 9), (1, 1, 43)),
+    ("CHENNAI", dt.datetime(1790, 5, 11, 18, 10), (1, 1, 43)),
+    ("CHENNAI", dt.datetime(1790, 5, 11, 18, 16), (1, 1, 43)),
+    ("CHENNAI", dt.datetime(1790, 5, 12, 3, 6), (1, 1, 43)),
+    ("CHENNAI", dt.datetime(1790, 5, 20, 12, 0), (10, 1, 43)),
+    ("BUENOS_AIRES", dt.datetime(2110, 9, 18, 4, 16), (31, 4, 3)),
+    ("BUENOS_AIRES", dt.datetime(2110, 9, 18, 4, 22), (31, 5, 3)),
+    ("BUENOS_AIRES", dt.datetime(2110, 9, 18, 17, 46), (1, 5, 3)),
+    ("BUENOS_AIRES", dt.datetime(2110, 9, 18, 17, 52), (1, 5, 3)),
+    ("BUENOS_AIRES", dt.datetime(2110, 9, 19, 3, 19), (1, 5, 3)),
+    ("BUENOS_AIRES", dt.datetime(2110, 9, 25, 12, 0), (8, 5, 3)),
+]
+
+
+@pytest.mark.parametrize("place, in_datetime, tamil_date", CASES)
+def test_tamil_date(place, in_datetime, tamil_date):
+    diff_from_gst_in_sec, lat_degs, lat_dirn, long_degs, long_dirn = PLACES[place]
+    input_params = {
+        "name": place,
+        "birthplace": place,
+        "in_datetime": in_datetime,
+        "diff_from_gst_in_sec": diff_from_gst_in_sec,
+        "lat_degs": lat_degs,
+        "lat_dirn": lat_dirn,
+        "long_degs": long_degs,
+        "long_dirn": long_dirn,
+    }
+    assert fn.calc_tamil_date(input_params) == tamil_date
@@ -0,0 +1,62 @@
+"""
+The speeds of velocity.py against differences of the longitudes of
+chart.compute an hour either side, at Chennai and Buenos Aires: the Sun,
+Moon, planets and nodes to rounding, Rahu and Ketu at the same backward
+speed, and the lagna (differenced in the RAMC) against the scalar lagna
+ten minutes either side, which moves in whole seconds of local time.
+"""
+
+import datetime as dt
+
+import pytest
+
+import chart
+import functions as fn
+import velocity as vl
+
+PLACES = [
+    {"diff_from_gst_in_sec": 19800, "lat_degs": 13.08, "lat_dirn": "N",
+     "long_degs": 80.27, "long_dirn": "E"},
+    {"diff_from_gst_in_sec": 10800, "lat_degs": 34.60, "lat_dirn": "S",
+     "long_degs": 58.38, "long_dirn": "W"},
+]
+
+# The lagna steps by up to a few thousandths of a degree each second of
+# local time, so a difference over 20 minutes is off by up to this much
+_LAGNA_TOL_DEGS_PER_DAY = 0.5
+
+
+def _get_chart_speeds(input_params, half_step):
+    """
+    Return the speeds (degrees a day, by name) of the chart's longitudes,
+    differenced half_step (a timedelta) either side
+    """
+    in_datetime = input_params["in_datetime"]
+    before = chart.compute(dict(input_params, in_datetime=in_datetime - half_step))
+    after = chart.compute(dict(input_params, in_datetime=in_datetime + half_step))
+    step_days = 2.0 * half_step / dt.timedelta(days=1)
+    return {
+        name: fn._wrap_diff_degs(after_degs, before_degs) / step_days
+        for name, before_degs, after_degs in zip(
+            chart.PLANET_NAMES_ORDER, before["planet_degs"], after["planet_degs"]
+        )
+    }
+
+
+@pytest.mark.parametrize("place", PLACES)
+@pytest.mark.parametrize(
+    "in_datetime", [dt.datetime(2024, 1, 15, 10, 30), dt.datetime(1990, 7, 4, 16)]
+)
+def test_speeds(place, in_datetime):
+    input_params = dict(place, name="", birthplace="", in_datetime=in_datetime)
+    motion = vl.get_chart_velocities(input_params)
+
+    chart_speeds = _get_chart_speeds(input_params, dt.timedelta(days=vl.DEFAULT_STEP_DAYS))
+    for name, speed in chart_speeds.items():
+        if name != "LAGN":
+            assert motion[name]["speed"] == pytest.approx(speed, abs=1e-6)
+
+    assert motion["RAHU"]["speed"] == motion["KETU"]["speed"] < 0.0
+
+    lagna_speed = _get_chart_speeds(input_params, dt.timedelta(minutes=10))["LAGN"]
+    assert abs(motion["LAGNA"]["speed"] - lagna_speed) < _LAGNA_TOL_DEGS_PER_DAY
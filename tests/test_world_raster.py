@@ -0,0 +1,72 @@
+"""
+world_raster.get_world_raster against the scalar lagna and house cusps at
+random points of a world grid, the polar rows among them, where the Sun
+does not rise or set on the day.
+"""
+
+import datetime as dt
+import random
+
+import numpy as np
+import pytest
+
+import constants as cn
+import functions as fn
+import world_raster as wr
+
+TOL_DEGS = 1e-12
+
+
+def _diff_degs(deg1, deg2):
+    diff = abs(deg1 - deg2) % 360.0
+    return min(diff, 360.0 - diff)
+
+
+def _get_scalar_houses(ist_time, lat, long):
+    """
+    Return the lagna and the 12 house cusps of the scalar path at the place
+    (degrees; north and east positive), for the instant on the IST clock
+    """
+    west = long < 0.0
+    input_params = {
+        "in_datetime": ist_time,
+        # The clock is IST at every place: the sign is undone for the west
+        "diff_from_gst_in_sec": -cn.ist_offset_in_sec if west else cn.ist_offset_in_sec,
+        "lat_degs": abs(lat),
+        "lat_dirn": "S" if lat < 0.0 else "N",
+        "long_degs": abs(long),
+        "long_dirn": "W" if west else "E",
+    }
+    sun_params = fn.get_sun_params(input_params)
+    lagn_params = fn.get_lagn_params(input_params, sun_params)
+    south_hemi = fn.get_south(input_params)
+    dhasa_degs = fn.get_culm_point(lagn_params["ramc"], abs(lat), sun_params["prec"], south_hemi)
+    house_positions = fn.get_house_positions(
+        lagn_params["lagn"], dhasa_degs, abs(lat), lagn_params["ramc"],
+        sun_params["prec"], south_hemi,
+    )
+    return lagn_params["lagn"], house_positions
+
+
+@pytest.mark.parametrize(
+    "ist_time",
+    [dt.datetime(2024, 1, 15, 10, 30), dt.datetime(2024, 6, 21, 3), dt.datetime(2024, 12, 21, 18)],
+)
+def test_scalar_parity(ist_time):
+    lats, longs = wr.get_grid(1.0)
+    raster = wr.get_world_raster(
+        fn.get_days_from_epoch(ist_time), lats, longs, houses=True, bhavas=True
+    )
+    assert not np.isnan(raster["houses"]).any()
+    assert (raster["bhavas"] >= 0).all()
+
+    rng = random.Random(ist_time.month)
+    points = [(rng.randrange(len(lats)), rng.randrange(len(longs))) for _ in range(100)]
+    points += [(0, rng.randrange(len(longs))), (len(lats) - 1, rng.randrange(len(longs)))]
+    for lat_idx, long_idx in points:
+        lagn_degs, house_positions = _get_scalar_houses(
+            ist_time, lats[lat_idx], longs[long_idx]
+        )
+        assert _diff_degs(raster["lagn"][lat_idx, long_idx], lagn_degs) < TOL_DEGS
+        for house_degs, houses in zip(house_positions, raster["houses"]):
+            assert _diff_degs(houses[lat_idx, long_idx], house_degs) < TOL_DEGS
@@ -0,0 +1,157 @@
+"""
+velocity.py — Daily motion (speed) and its rate of change (acceleration)
+of every body of a chart: the lagna, Sun, Moon, the seven planets and
+Rahu/Ketu, at a place.
+
+The speeds are central differences of the model's longitudes.  Each body is
+evaluated at t - h, t and t + h, the three instants of every t stacked into
+one array, so a whole set of instants takes a single call of the batch
+engine:
+
+  speed = (L(t + h) - L(t - h)) / 2h
+  accel = (L(t + h) - 2 L(t) + L(t - h)) / h^2
+
+with the differences taken across 0/360.  Speeds are degrees a day
+(negative while retrograde, and always for Rahu and Ketu) and
+accelerations degrees a day per day.
+
+The chart itself keeps the velocities the reference program reports (the
+Moon's mean 13.18, the Sun's heliocentric motion and the planets'
+geocentric velocity, see chart.py); these are what the longitudes
+themselves do.
+
+The lagna is not differenced in time: the RAMC of the model moves in whole
+seconds of local time (and steps back a degree at local midnight, see
+lagna_times.py), so a difference over minutes is ragged.  The ascendant is
+differenced in the RAMC instead, and scaled by the steady motion of the
+RAMC between midnights.  Where the model itself jumps (the Moon for a few
+minutes at some quadrant boundaries, the branch switches of the inferior
+planets; see chebyshev.py) a difference taken across the jump reports it.
+
+  python velocity.py --datetime 2024-01-15T10:30 --lat 13.08 --long 80.27
+"""
+
+import argparse
+import datetime as dt
+
+import numpy as np
+
+import batch as bt
+import birth_input as bi
+import chebyshev as ch
+import functions as fn
+import lagna_times as lt
+
+BODIES = [
+    "LAGNA", "SUN", "MOON", "MARS", "MERCURY", "JUPITER",
+    "VENUS", "SATURN", "URANUS", "NEPTUNE", "RAHU", "KETU",
+]
+
+# Half the spacing (days) of the differences: short against the Moon's
+# change of speed, long against the rounding of the longitudes
+DEFAULT_STEP_DAYS = 1.0 / 24.0
+# Half the spacing (degrees of RAMC) of the differences of the lagna
+_RAMC_STEP_DEGS = 0.1
+
+
+def _get_differences(values, step):
+    """
+    Return the speed and acceleration from longitudes at -step, 0 and
+    +step (the first axis), per unit of step
+    """
+    back_degs = fn._wrap_diff_degs(values[1], values[0])
+    ahead_degs = fn._wrap_diff_degs(values[2], values[1])
+    speed = (ahead_degs + back_degs) / (2.0 * step)
+    accel = (ahead_degs - back_degs) / (step * step)
+    return speed, accel
+
+
+def _get_lagna_motion(place, ist_days):
+    """
+    Return the lagna (degrees), its speed and its acceleration (arrays)
+    """
+    cols = place["cols"]
+    lagn_degs, ramc_degs = lt.get_lagna(place, ist_days)
+    precession_degs = bt.get_precession_degs(bt.get_years_elapsed(ist_days))
+    offsets = np.array([-1.0, 0.0, 1.0]).reshape((3,) + (1,) * np.ndim(ist_days))
+    values = bt.get_ascendant(
+        ramc_degs + offsets * _RAMC_STEP_DEGS, cols["lat_degs"], precession_degs, cols["south"]
+    )
+    speed, accel = _get_differences(values, _RAMC_STEP_DEGS)
+    return lagn_degs, speed * lt._RAMC_RATE, accel * lt._RAMC_RATE ** 2
+
+
+def get_velocities(place, ist_days, bodies=BODIES, step_days=DEFAULT_STEP_DAYS):
+    """
+    Return dictionary (by body) of the longitude ("long", degrees), speed
+    ("speed", degrees a day) and acceleration ("accel", degrees a day per
+    day) at the place (chebyshev.make_place), each an array of the shape of
+    ist_days (IST days)
+    """
+    ist_days = np.asarray(ist_days, dtype=float)
+    offsets = np.array([-1.0, 0.0, 1.0]).reshape((3,) + (1,) * ist_days.ndim)
+    model_bodies = [name for name in ch.BODIES if name in bodies]
+    if "KETU" in bodies and "RAHU" not in model_bodies:
+        model_bodies.append("RAHU")
+
+    motion = dict()
+    if model_bodies:
+        longitudes = ch.get_model_longitudes(
+            place, ist_days + offsets * step_days, model_bodies
+        )
+        for name, values in longitudes.items():
+            speed, accel = _get_differences(values, step_days)
+            motion[name] = {"long": values[1], "speed": speed, "accel": accel}
+    if "KETU" in bodies:
+        rahu = motion["RAHU"]
+        motion["KETU"] = dict(rahu, long=np.mod(rahu["long"] + 180.0, 360.0))
+    if "LAGNA" in bodies:
+        lagn_degs, speed, accel = _get_lagna_motion(place, ist_days)
+        motion["LAGNA"] = {"long": lagn_degs, "speed": speed, "accel": accel}
+    return {name: motion[name] for name in bodies}
+
+
+def get_chart_velocities(input_params, step_days=DEFAULT_STEP_DAYS):
+    """
+    Return dictionary (by body, BODIES order) of the longitude, speed and
+    acceleration (floats, as get_velocities) at the instant and place of
+    input_params
+    """
+    place = ch.make_place(
+        input_params["lat_degs"],
+        input_params["lat_dirn"],
+        input_params["long_degs"],
+        input_params["long_dirn"],
+    )
+    ist_days = fn.get_time_params(input_params)["ist_days"]
+    motion = get_velocities(place, ist_days, step_days=step_days)
+    return {
+        name: {key: float(value) for key, value in entry.items()}
+        for name, entry in motion.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Daily motion of every body")
+    parser.add_argument("--datetime", required=True, help="YYYY-MM-DDTHH:MM[:SS]")
+    bi.add_place_arguments(parser)
+    parser.add_argument(
+        "--step-hours", type=float, default=DEFAULT_STEP_DAYS * 24.0,
+        help="half spacing of the differences, hours",
+    )
+    args = parser.parse_args()
+
+    input_params = bi.get_birth_input(parser, args, dt.datetime.fromisoformat(args.datetime))
+
+    motion = get_chart_velocities(input_params, args.step_hours / 24.0)
+    print(f"{'Body':<8} {'Longitude':>10} {'Speed':>12} {'Accel':>12}")
+    for name, entry in motion.items():
+        retro = "  R" if entry["speed"] < 0 and name not in ("RAHU", "KETU") else ""
+        print(
+            f"{name:<8} {entry['long']:10.4f} {entry['speed']:12.6f} "
+            f"{entry['accel']:12.6f}{retro}"
+        )
+
+
+if __name__ == "__main__":
+    main()
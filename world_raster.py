@@ -0,0 +1,144 @@
+"""
+world_raster.py — Lagna, house cusps and bhavas over a latitude x longitude
+grid for one instant.
+
+For an instant, get_world_raster computes the chart over a whole grid of
+places with the batch engine: every grid point is one element of the
+arrays.  What does not depend on the place (the time core on the IST
+meridian, the precession, the apses and nodes) is the same scalar for all
+of them.  The longitudes of the Sun, Moon and planets do depend on the
+place in this model (the net correction moves them with the latitude and
+longitude), so the bhavas come from each place's own longitudes, as in its
+chart.
+
+Above the polar circles (tan(lat) * tan(obliquity) > 1) the house cusps
+are trisected between the lagna and the culmination point, as in
+get_house_positions; every point of the grid gets a lagna and 12 cusps.
+Where the Sun does not rise or set on the day, the hour angle is taken at
+the latitude where the Sun grazes the horizon (see get_hour_angle), so the
+net correction, the longitudes and the bhavas are defined there too.
+
+  python world_raster.py --datetime 2024-01-15T10:30 --tz +05:30 --step 1 --output lagna.npy
+"""
+
+import argparse
+import datetime as dt
+
+import numpy as np
+
+import batch as bt
+import birth_input as bi
+import chart
+import constants as cn
+
+# Bodies of the bhava raster, in chart order (LAGN, SUN, ... RAHU, KETU)
+RASTER_BODIES = chart.PLANET_NAMES_ORDER
+
+
+def get_grid(step_degs=1.0):
+    """
+    Return the latitudes and longitudes (degrees; north and east positive)
+    of the centres of a world grid with the given step
+    """
+    lats = np.arange(-90.0 + step_degs / 2.0, 90.0, step_degs)
+    longs = np.arange(-180.0 + step_degs / 2.0, 180.0, step_degs)
+    return lats, longs
+
+
+def get_world_raster(ist_days, lats, longs, houses=False, bhavas=False):
+    """
+    Return the raster (dict) for an instant (IST days) over the grid of
+    latitudes x longitudes (degrees; north and east positive): the lagna
+    (array of shape (len(lats), len(longs))), and optionally the 12 house
+    cusps and the bhava of each of RASTER_BODIES (arrays of shape (12,
+    len(lats), len(longs)))
+    """
+    lat_degs, long_degs = np.meshgrid(
+        np.asarray(lats, dtype=float), np.asarray(longs, dtype=float), indexing="ij"
+    )
+    cols = bt.get_input_arrays(
+        {
+            "in_datetime": cn.epoch_sun_rise,
+            "diff_from_gst_in_sec": cn.ist_offset_in_sec,
+            "lat_degs": np.abs(lat_degs),
+            "lat_dirn": np.where(lat_degs < 0.0, "S", "N"),
+            "long_degs": np.abs(long_degs),
+            "long_dirn": np.where(long_degs < 0.0, "W", "E"),
+        }
+    )
+    # As in get_time_params: local mean time from the longitude, to the second
+    local_offset_days = bt.get_local_offset_days(cols["long_degs"], cols["west"])
+    time_params = bt.make_time_params(
+        np.full(lat_degs.shape, float(ist_days)), 0.0, local_offset_days
+    )
+    sun_params = bt.get_sun_core(cols, time_params)
+
+    lt_corr_degs = bt.get_local_time_correction(sun_params["d_epoch"])
+    ramc_degs = bt.get_ramc(
+        sun_params["mean_long"], sun_params["prec"], lt_corr_degs, cols["south"]
+    )
+    house_cusps = bt.get_house_cusps(
+        ramc_degs, cols["lat_degs"], sun_params["prec"], cols["south"]
+    )
+
+    raster = dict()
+    raster["ist_days"] = float(ist_days)
+    raster["lats"] = lat_degs[:, 0]
+    raster["longs"] = long_degs[0]
+    raster["lagn"] = house_cusps["lagn"]
+    if houses:
+        raster["houses"] = house_cusps["houses"]
+    if bhavas:
+        moon_params = bt.get_moon_params(sun_params)
+        planet_grid = bt.get_planet_grid(sun_params)
+        planet_degs = []
+        for name in RASTER_BODIES:
+            if name == "LAGN":
+                planet_degs.append(house_cusps["lagn"])
+            elif name == "SUN":
+                planet_degs.append(sun_params["true_long"])
+            elif name == "MOON":
+                planet_degs.append(moon_params["moon"])
+            elif name == "RAHU":
+                planet_degs.append(moon_params["rahu"])
+            elif name == "KETU":
+                planet_degs.append(moon_params["ketu"])
+            else:
+                planet_degs.append(planet_grid["true_long"][bt.PLANET_NAMES.index(name)])
+        bhava_positions, _, _ = bt.get_bhava_positions(house_cusps["houses"], planet_degs)
+        raster["bhavas"] = bhava_positions.astype(np.int8)
+    return raster
+
+
+def main():
+    parser = argparse.ArgumentParser(description="World lagna / house raster")
+    parser.add_argument("--datetime", required=True, help="YYYY-MM-DDTHH:MM[:SS]")
+    bi.add_time_zone_argument(parser)
+    parser.add_argument("--step", type=float, default=1.0, help="grid step degrees")
+    parser.add_argument("--output", default="lagna.npy", help=".npy file for the lagna")
+    parser.add_argument("--houses", help=".npy file for the 12 house cusps")
+    parser.add_argument("--bhavas", help=".npy file for the bhava of each body")
+    args = parser.parse_args()
+
+    gst_offset_secs = bi.get_gst_offset_secs(parser, args)
+    civil_days = bt.get_days_from_epoch(np.datetime64(dt.datetime.fromisoformat(args.datetime)))
+    ist_days = civil_days + (cn.ist_offset_in_sec - gst_offset_secs) / cn.seconds_in_day
+
+    lats, longs = get_grid(args.step)
+    raster = get_world_raster(
+        ist_days, lats, longs, houses=bool(args.houses), bhavas=bool(args.bhavas)
+    )
+    np.save(args.output, raster["lagn"])
+    if args.houses:
+        np.save(args.houses, raster["houses"])
+    if args.bhavas:
+        np.save(args.bhavas, raster["bhavas"])
+    print(
+        f"Lagna over {len(lats)} x {len(longs)} places (latitudes "
+        f"{lats[0]:g} to {lats[-1]:g}, longitudes {longs[0]:g} to {longs[-1]:g}) "
+        f"written to {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()